@@ -1,8 +1,16 @@
+import asyncio
+import logging
+from datetime import datetime
+
 from pydantic import HttpUrl
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.jobs.models import JobResponse
 from app.db.models import Job, JobStatus, JobType, User
+from app.scraping.replays import get_scraped_s3_keys
+from app.worker.celery_app import celery_app
+
+logger = logging.getLogger(__name__)
 
 
 async def create_individual_job(
@@ -10,19 +18,43 @@ async def create_individual_job(
 ) -> JobResponse:
     url_strings = [str(url) for url in urls]
 
+    # Already-scraped replays count as processed straight away
+    cached_s3_keys = await get_scraped_s3_keys(db, url_strings)
+    processed_urls = sum(url in cached_s3_keys for url in url_strings)
+    is_fully_cached = processed_urls == len(url_strings)
+
     job = Job(
         job_type=JobType.INDIVIDUAL,
-        status=JobStatus.PENDING,
+        status=JobStatus.COMPLETED if is_fully_cached else JobStatus.PENDING,
         user_id=user.id,
         urls=url_strings,
         total_urls=len(url_strings),
-        processed_urls=0,
+        processed_urls=processed_urls,
+        completed_at=datetime.utcnow() if is_fully_cached else None,
     )
 
     db.add(job)
     await db.commit()
     await db.refresh(job)
 
+    # Cached jobs only need their results; the rest are fanned out to scrapers
+    task_name = "finalize_job_results" if is_fully_cached else "process_individual_job"
+
+    try:
+        # Publishing is a blocking broker round trip
+        await asyncio.to_thread(celery_app.send_task, task_name, args=[str(job.id)])
+    except Exception:
+        if is_fully_cached:
+            # Results are still transformed on demand when first read
+            logger.warning("Failed to queue results of job %s", job.id, exc_info=True)
+        else:
+            # Nothing would ever pick the job up, so it must not stay PENDING
+            logger.exception("Failed to queue job %s", job.id)
+            job.status = JobStatus.FAILED
+            job.error_message = "Failed to queue job, please resubmit"
+            await db.commit()
+            await db.refresh(job)
+
     return JobResponse(
         job_id=job.id,
         status=job.status,
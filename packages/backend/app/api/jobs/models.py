@@ -14,6 +14,7 @@ class JobResponse(BaseModel):
     total_urls: int
     processed_urls: int = 0
     error_message: str | None = None
+    scrape_seconds_saved: float | None = None
     shareable_id: UUID | None = None
     is_public: bool = False
     started_at: datetime | None = None
@@ -34,6 +35,12 @@ class JobResultsResponse(BaseModel):
         arbitrary_types_allowed = True
 
 
+class JobCancelResponse(BaseModel):
+    status: str
+    revoked_tasks: int
+    scrape_seconds_saved: float
+
+
 class JobShareRequest(BaseModel):
     is_public: bool
 
@@ -56,7 +63,8 @@ class JobProgressResponse(BaseModel):
 
 class JobListResponse(BaseModel):
     jobs: list[dict[str, Any]]
-    total: int
+    total: int | None = None
     page: int
     per_page: int
-    total_pages: int
+    total_pages: int | None = None
+    next_cursor: str | None = None
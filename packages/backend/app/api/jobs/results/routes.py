@@ -4,6 +4,7 @@ from uuid import UUID
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.deps import RedisDep
 from app.api.jobs.results.models import PublicJobResultsResponse
 from app.api.jobs.results.services import get_public_results
 from app.db.database import get_db_session
@@ -17,5 +18,6 @@ DBDep = Annotated[AsyncSession, Depends(get_db_session)]
 async def get_shared_results(
     shareable_id: UUID,
     db: DBDep,
+    redis: RedisDep,
 ) -> PublicJobResultsResponse:
-    return await get_public_results(db, shareable_id)
+    return await get_public_results(db, redis, shareable_id)
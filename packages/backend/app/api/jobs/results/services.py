@@ -1,16 +1,17 @@
-from datetime import datetime
 from uuid import UUID
 
 from fastapi import HTTPException, status
+from redis.asyncio import Redis
 from sqlalchemy import and_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.jobs.results.models import PublicJobResultsResponse
 from app.db.models import Job, JobStatus
+from app.transformation.results import get_job_results_payload
 
 
 async def get_public_results(
-    db: AsyncSession, shareable_id: UUID
+    db: AsyncSession, redis: Redis, shareable_id: UUID
 ) -> PublicJobResultsResponse:
     result = await db.execute(
         select(Job).where(and_(Job.shareable_id == shareable_id, Job.is_public))
@@ -29,21 +30,12 @@ async def get_public_results(
             detail="Job is not completed",
         )
 
-    # TODO: Implement actual transformation service integration
+    results = await get_job_results_payload(db, redis, job)
+
     return PublicJobResultsResponse(
         shareable_id=job.shareable_id,
         job_type=job.job_type,
-        summary={
-            "total_games": len(job.urls),
-            "processed_games": job.processed_urls,
-            "placeholder": "This will be replaced with actual analysis results",
-        },
-        detailed_results={
-            "games": [
-                {"url": url, "status": "processed", "data": "placeholder"}
-                for url in job.urls
-            ],
-            "player_stats": {"placeholder": "Player analysis will go here"},
-        },
-        generated_at=datetime.utcnow(),
+        summary=results["summary"],
+        detailed_results=results["detailed_results"],
+        generated_at=results["generated_at"],
     )
@@ -1,10 +1,12 @@
 from typing import Any
 from uuid import UUID
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Header, Query
+from fastapi.responses import StreamingResponse
 
-from app.api.deps import DBDep, UserDep
+from app.api.deps import DBDep, RedisDep, UserDep
 from app.api.jobs.models import (
+    JobCancelResponse,
     JobListResponse,
     JobResponse,
     JobResultsResponse,
@@ -18,6 +20,7 @@ from app.api.jobs.services import (
     get_job_progress,
     get_job_results,
     list_user_jobs,
+    stream_job_progress,
 )
 from app.db.models import JobStatus, JobType
 
@@ -38,8 +41,25 @@ async def get_job_progress_endpoint(
     job_id: UUID,
     current_user: UserDep,
     db: DBDep,
+    redis: RedisDep,
 ) -> dict[str, Any]:
-    return await get_job_progress(db, job_id, current_user)
+    return await get_job_progress(db, redis, job_id, current_user)
+
+
+@router.get("/{job_id}/progress/stream")
+async def stream_job_progress_endpoint(
+    job_id: UUID,
+    current_user: UserDep,
+    db: DBDep,
+    redis: RedisDep,
+    last_event_id: int | None = Header(None),
+) -> StreamingResponse:
+    events = await stream_job_progress(db, redis, job_id, current_user, last_event_id)
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get("/{job_id}/results", response_model=JobResultsResponse)
@@ -47,17 +67,19 @@ async def get_job_results_endpoint(
     job_id: UUID,
     current_user: UserDep,
     db: DBDep,
+    redis: RedisDep,
 ) -> JobResultsResponse:
-    return await get_job_results(db, job_id, current_user)
+    return await get_job_results(db, redis, job_id, current_user)
 
 
-@router.delete("/{job_id}")
+@router.delete("/{job_id}", response_model=JobCancelResponse)
 async def cancel_job_endpoint(
     job_id: UUID,
     current_user: UserDep,
     db: DBDep,
-) -> dict[str, str]:
-    return await cancel_job(db, job_id, current_user)
+    redis: RedisDep,
+) -> JobCancelResponse:
+    return await cancel_job(db, redis, job_id, current_user)
 
 
 @router.post("/{job_id}/share", response_model=JobShareResponse)
@@ -78,5 +100,9 @@ async def list_user_jobs_endpoint(
     per_page: int = Query(20, ge=1, le=100),
     status: JobStatus | None = Query(None),
     job_type: JobType | None = Query(None),
+    cursor: str | None = Query(None),
+    include_total: bool = Query(True),
 ) -> JobListResponse:
-    return await list_user_jobs(db, current_user, page, per_page, status, job_type)
+    return await list_user_jobs(
+        db, current_user, page, per_page, status, job_type, cursor, include_total
+    )
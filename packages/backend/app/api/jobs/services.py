@@ -1,14 +1,28 @@
+import base64
+import binascii
 from datetime import datetime
+from collections.abc import AsyncGenerator
 from typing import Any
 from uuid import UUID
 
 from fastapi import HTTPException, status
-from sqlalchemy import and_, desc, select
+from redis.asyncio import Redis
+from sqlalchemy import and_, desc, func, literal, select, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.jobs.models import JobResponse, JobResultsResponse
-from app.api.jobs.models import JobListResponse, JobShareResponse
+from app.api.jobs.models import JobProgressResponse, JobResponse, JobResultsResponse
+from app.api.jobs.models import JobCancelResponse, JobListResponse, JobShareResponse
+from app.config import settings
 from app.db.models import Job, JobStatus, JobType, User
+from app.transformation.results import get_job_results_payload
+from app.worker.cancellation import cancel_job_tasks, estimate_scrape_seconds
+from app.worker.progress import (
+    clear_job_counters,
+    get_job_counters,
+    job_progress,
+    publish_job_progress,
+    stream_progress_events,
+)
 
 
 async def get_job_by_id(db: AsyncSession, job_id: UUID, user: User) -> JobResponse:
@@ -17,25 +31,37 @@ async def get_job_by_id(db: AsyncSession, job_id: UUID, user: User) -> JobRespon
 
 
 async def get_job_progress(
-    db: AsyncSession, job_id: UUID, user: User
+    db: AsyncSession, redis: Redis, job_id: UUID, user: User
 ) -> dict[str, Any]:
-    from app.api.jobs.models import JobProgressResponse
+    # Running jobs are answered from their Redis counters without a DB round trip
+    progress = await get_job_counters(redis, job_id, user.id)
 
-    job = await _get_user_job(db, job_id, user.id)
-    progress = (job.processed_urls / job.total_urls * 100) if job.total_urls > 0 else 0
+    if progress is None:
+        progress = await _get_user_job_progress(db, job_id, user.id)
 
-    return JobProgressResponse(
-        job_id=job.id,
-        status=job.status,
-        processed=job.processed_urls,
-        total=job.total_urls,
-        progress_percentage=round(progress, 2),
-        error_message=job.error_message,
-    ).model_dump()
+    return progress.model_dump(mode="json")
+
+
+async def stream_job_progress(
+    db: AsyncSession,
+    redis: Redis,
+    job_id: UUID,
+    user: User,
+    last_event_id: int | None = None,
+) -> AsyncGenerator[str, None]:
+    # Ownership is checked once here; the stream itself never touches the DB
+    initial = await get_job_counters(redis, job_id, user.id)
+
+    if initial is None:
+        initial = await _get_user_job_progress(db, job_id, user.id)
+
+    return stream_progress_events(
+        redis, initial, last_event_id, settings.PROGRESS_STREAM_HEARTBEAT_SECONDS
+    )
 
 
 async def get_job_results(
-    db: AsyncSession, job_id: UUID, user: User
+    db: AsyncSession, redis: Redis, job_id: UUID, user: User
 ) -> JobResultsResponse:
     job = await _get_user_job(db, job_id, user.id)
 
@@ -45,28 +71,21 @@ async def get_job_results(
             detail=f"Job is not completed. Current status: {job.status}",
         )
 
-    # TODO: Implement actual transformation service integration
+    results = await get_job_results_payload(db, redis, job)
+
     return JobResultsResponse(
         job_id=job.id,
         job_type=job.job_type,
         status=job.status,
-        summary={
-            "total_games": len(job.urls),
-            "processed_games": job.processed_urls,
-            "placeholder": "This will be replaced with actual analysis results",
-        },
-        detailed_results={
-            "games": [
-                {"url": url, "status": "processed", "data": "placeholder"}
-                for url in job.urls
-            ],
-            "player_stats": {"placeholder": "Player analysis will go here"},
-        },
-        generated_at=datetime.utcnow(),
+        summary=results["summary"],
+        detailed_results=results["detailed_results"],
+        generated_at=results["generated_at"],
     )
 
 
-async def cancel_job(db: AsyncSession, job_id: UUID, user: User) -> dict[str, str]:
+async def cancel_job(
+    db: AsyncSession, redis: Redis, job_id: UUID, user: User
+) -> JobCancelResponse:
     job = await _get_user_job(db, job_id, user.id)
 
     if job.status not in [JobStatus.PENDING, JobStatus.RUNNING]:
@@ -75,11 +94,56 @@ async def cancel_job(db: AsyncSession, job_id: UUID, user: User) -> dict[str, st
             detail=f"Cannot cancel job with status: {job.status}",
         )
 
-    job.status = JobStatus.CANCELLED
-    job.error_message = "Job cancelled by user"
+    # Redis counters are ahead of the periodically flushed processed_urls
+    progress = await get_job_counters(redis, job.id, user.id)
+    processed_urls = progress.processed if progress else job.processed_urls
+    seconds_saved = round(
+        await estimate_scrape_seconds(redis, job.total_urls - processed_urls), 1
+    )
+
+    # Conditional, so a job that completes meanwhile is never overwritten
+    cancelled = await db.scalar(
+        update(Job)
+        .where(
+            Job.id == job.id,
+            Job.status.in_([JobStatus.PENDING, JobStatus.RUNNING]),
+        )
+        .values(
+            status=JobStatus.CANCELLED,
+            error_message="Job cancelled by user",
+            processed_urls=processed_urls,
+            scrape_seconds_saved=seconds_saved,
+        )
+        .returning(Job.id)
+    )
     await db.commit()
 
-    return {"status": "cancelled"}
+    if cancelled is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cannot cancel job, it finished in the meantime",
+        )
+
+    # Without counters, workers stop counting and progress is read from the DB
+    await clear_job_counters(redis, job.id)
+    # Ends open progress streams, which otherwise wait on the running snapshot
+    await publish_job_progress(
+        redis,
+        job_progress(
+            job.id,
+            JobStatus.CANCELLED,
+            processed_urls,
+            job.total_urls,
+            "Job cancelled by user",
+        ),
+    )
+    revoked_tasks = await cancel_job_tasks(redis, job.id)
+
+    return JobCancelResponse(
+        status="cancelled",
+        revoked_tasks=revoked_tasks,
+        scrape_seconds_saved=seconds_saved,
+    )
 
 
 async def list_user_jobs(
@@ -89,34 +153,51 @@ async def list_user_jobs(
     per_page: int = 20,
     status_filter: JobStatus | None = None,
     job_type_filter: JobType | None = None,
+    cursor: str | None = None,
+    include_total: bool = True,
 ) -> JobListResponse:
     if per_page > 100:
         per_page = 100
 
-    offset = (page - 1) * per_page
-
-    query = select(Job).where(Job.user_id == user.id)
+    filters = [Job.user_id == user.id]
 
     if status_filter:
-        query = query.where(Job.status == status_filter)
+        filters.append(Job.status == status_filter)
 
     if job_type_filter:
-        query = query.where(Job.job_type == job_type_filter)
+        filters.append(Job.job_type == job_type_filter)
+
+    query = select(Job).where(*filters)
+
+    # Keyset mode seeks past the last row instead of scanning skipped pages
+    if cursor:
+        cursor_created_at, cursor_id = _decode_cursor(cursor)
+        query = query.where(
+            tuple_(Job.created_at, Job.id)
+            < tuple_(
+                literal(cursor_created_at, Job.created_at.type),
+                literal(cursor_id, Job.id.type),
+            )
+        )
+    else:
+        query = query.offset((page - 1) * per_page)
 
-    count_query = select(Job.id).where(Job.user_id == user.id)
-    if status_filter:
-        count_query = count_query.where(Job.status == status_filter)
-    if job_type_filter:
-        count_query = count_query.where(Job.job_type == job_type_filter)
+    # Fetch one extra row to know whether another page exists
+    query = query.order_by(desc(Job.created_at), desc(Job.id)).limit(per_page + 1)
+    result = await db.execute(query)
+    jobs = list(result.scalars().all())
 
-    total_result = await db.execute(count_query)
-    total = len(total_result.all())
+    has_next = len(jobs) > per_page
+    jobs = jobs[:per_page]
+    next_cursor = _encode_cursor(jobs[-1]) if has_next else None
 
-    query = query.order_by(desc(Job.created_at)).offset(offset).limit(per_page)
-    result = await db.execute(query)
-    jobs = result.scalars().all()
+    total = None
+    total_pages = None
 
-    total_pages = (total + per_page - 1) // per_page
+    if include_total:
+        count_query = select(func.count()).select_from(Job).where(*filters)
+        total = (await db.execute(count_query)).scalar_one()
+        total_pages = (total + per_page - 1) // per_page
 
     return JobListResponse(
         jobs=[_job_to_response(job).model_dump() for job in jobs],
@@ -124,6 +205,7 @@ async def list_user_jobs(
         page=page,
         per_page=per_page,
         total_pages=total_pages,
+        next_cursor=next_cursor,
     )
 
 
@@ -166,6 +248,32 @@ async def _get_user_job(db: AsyncSession, job_id: UUID, user_id: UUID) -> Job:
     return job
 
 
+async def _get_user_job_progress(
+    db: AsyncSession, job_id: UUID, user_id: UUID
+) -> JobProgressResponse:
+    # Select only the progress columns so polling never loads the urls JSON
+    result = await db.execute(
+        select(
+            Job.id,
+            Job.status,
+            Job.processed_urls,
+            Job.total_urls,
+            Job.error_message,
+        ).where(and_(Job.id == job_id, Job.user_id == user_id))
+    )
+    row = result.one_or_none()
+
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found",
+        )
+
+    return job_progress(
+        row.id, row.status, row.processed_urls, row.total_urls, row.error_message
+    )
+
+
 def _job_to_response(job: Job) -> JobResponse:
     return JobResponse(
         job_id=job.id,
@@ -174,6 +282,7 @@ def _job_to_response(job: Job) -> JobResponse:
         total_urls=job.total_urls,
         processed_urls=job.processed_urls,
         error_message=job.error_message,
+        scrape_seconds_saved=job.scrape_seconds_saved,
         shareable_id=job.shareable_id if job.is_public else None,
         is_public=job.is_public,
         started_at=job.started_at,
@@ -181,3 +290,20 @@ def _job_to_response(job: Job) -> JobResponse:
         created_at=job.created_at,
         updated_at=job.updated_at,
     )
+
+
+def _encode_cursor(job: Job) -> str:
+    raw = f"{job.created_at.isoformat()}|{job.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        created_at, job_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), UUID(job_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        ) from e
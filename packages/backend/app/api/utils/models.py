@@ -2,6 +2,70 @@ from typing import Literal
 
 from pydantic import BaseModel, Field
 
+from app.scraping.circuit_breaker import CircuitState
+
 
 class HealthCheckResponse(BaseModel):
     status: Literal["ok"] = Field(default="ok")
+
+
+class CircuitBreakerResponse(BaseModel):
+    state: CircuitState
+    recent_calls: int
+    recent_failures: int
+    retry_after_seconds: float
+
+
+class ScrapingHealthResponse(BaseModel):
+    status: Literal["ok", "degraded"]
+    proxy_circuit: CircuitBreakerResponse
+
+
+class QueueWaitResponse(BaseModel):
+    samples: int
+    p50_seconds: float
+    p95_seconds: float
+
+
+class UserQueueWaitResponse(BaseModel):
+    users: int
+    median_p95_seconds: float
+    worst_p95_seconds: float
+
+
+class ScrapingMetricsResponse(BaseModel):
+    active_proxy_sessions: int
+    max_proxy_sessions: int
+    proxy_occupancy_ratio: float
+    queue_wait_by_job_type: dict[str, QueueWaitResponse] = Field(default_factory=dict)
+    queue_wait_across_users: UserQueueWaitResponse | None = None
+
+
+class DiskCacheMetricsResponse(BaseModel):
+    counters_scope: Literal["process"] = Field(default="process")
+    process_id: int
+    hits: int
+    misses: int
+    hit_rate: float
+    evictions: int
+    evicted_bytes: int
+    used_bytes: int
+    max_bytes: int
+
+
+class StorageMetricsResponse(BaseModel):
+    disk_cache: DiskCacheMetricsResponse | None
+
+
+class CacheMetricsResponse(BaseModel):
+    size: int
+    hits: int
+    misses: int
+    hit_rate: float
+
+
+class AuthMetricsResponse(BaseModel):
+    counters_scope: Literal["process"] = Field(default="process")
+    process_id: int
+    claims_cache: CacheMetricsResponse
+    user_cache: CacheMetricsResponse
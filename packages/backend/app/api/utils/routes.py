@@ -2,7 +2,25 @@ from typing import Any
 
 from fastapi import APIRouter
 
-from .models import HealthCheckResponse
+from app.api.deps import RedisDep
+from app.auth.jwt_handler import jwt_handler
+from app.scraping.circuit_breaker import proxy_breaker
+from app.scraping.limiter import proxy_limiter
+from app.storage.s3 import s3_service
+
+from .models import (
+    AuthMetricsResponse,
+    HealthCheckResponse,
+    ScrapingHealthResponse,
+    ScrapingMetricsResponse,
+    StorageMetricsResponse,
+)
+from .services import (
+    get_auth_metrics,
+    get_scraping_health,
+    get_scraping_metrics,
+    get_storage_metrics,
+)
 
 router = APIRouter()
 
@@ -10,3 +28,23 @@ router = APIRouter()
 @router.get("/health-check", response_model=HealthCheckResponse)
 async def health_check() -> Any:
     return HealthCheckResponse(status="ok")
+
+
+@router.get("/health-check/scraping", response_model=ScrapingHealthResponse)
+async def scraping_health() -> ScrapingHealthResponse:
+    return await get_scraping_health(proxy_breaker)
+
+
+@router.get("/metrics/scraping", response_model=ScrapingMetricsResponse)
+async def scraping_metrics(redis: RedisDep) -> ScrapingMetricsResponse:
+    return await get_scraping_metrics(proxy_limiter, redis)
+
+
+@router.get("/metrics/storage", response_model=StorageMetricsResponse)
+async def storage_metrics() -> StorageMetricsResponse:
+    return await get_storage_metrics(s3_service)
+
+
+@router.get("/metrics/auth", response_model=AuthMetricsResponse)
+async def auth_metrics() -> AuthMetricsResponse:
+    return get_auth_metrics(jwt_handler)
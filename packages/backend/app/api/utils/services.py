@@ -0,0 +1,114 @@
+import asyncio
+import os
+from dataclasses import asdict
+
+from redis.asyncio import Redis
+
+from app.api.utils.models import (
+    AuthMetricsResponse,
+    CacheMetricsResponse,
+    CircuitBreakerResponse,
+    DiskCacheMetricsResponse,
+    QueueWaitResponse,
+    ScrapingHealthResponse,
+    ScrapingMetricsResponse,
+    StorageMetricsResponse,
+    UserQueueWaitResponse,
+)
+from app.auth.dependencies import user_cache
+from app.auth.jwt_handler import JWTHandler
+from app.scraping.circuit_breaker import CircuitBreaker, CircuitState
+from app.scraping.limiter import ProxyLimiter
+from app.storage.s3 import S3Service
+from app.worker.scheduler import WaitStats, get_queue_wait_stats
+
+
+async def get_scraping_metrics(
+    limiter: ProxyLimiter, redis: Redis
+) -> ScrapingMetricsResponse:
+    occupancy = await limiter.occupancy()
+    ratio = (
+        occupancy.active_sessions / occupancy.max_sessions
+        if occupancy.max_sessions > 0
+        else 0
+    )
+    waits_by_job_type, waits_by_user = await get_queue_wait_stats(redis)
+
+    return ScrapingMetricsResponse(
+        active_proxy_sessions=occupancy.active_sessions,
+        max_proxy_sessions=occupancy.max_sessions,
+        proxy_occupancy_ratio=round(ratio, 4),
+        queue_wait_by_job_type={
+            job_type: QueueWaitResponse(**asdict(stats))
+            for job_type, stats in waits_by_job_type.items()
+        },
+        queue_wait_across_users=_spread_across_users(list(waits_by_user.values())),
+    )
+
+
+def _spread_across_users(waits: list[WaitStats]) -> UserQueueWaitResponse | None:
+    # Unauthenticated endpoint, so per-user waits are reported without user IDs
+    if not waits:
+        return None
+
+    p95s = sorted(stats.p95_seconds for stats in waits)
+    return UserQueueWaitResponse(
+        users=len(p95s),
+        median_p95_seconds=p95s[len(p95s) // 2],
+        worst_p95_seconds=p95s[-1],
+    )
+
+
+async def get_scraping_health(breaker: CircuitBreaker) -> ScrapingHealthResponse:
+    circuit = await breaker.status()
+
+    return ScrapingHealthResponse(
+        status="ok" if circuit.state == CircuitState.CLOSED else "degraded",
+        proxy_circuit=CircuitBreakerResponse(
+            state=circuit.state,
+            recent_calls=circuit.recent_calls,
+            recent_failures=circuit.recent_failures,
+            retry_after_seconds=round(circuit.retry_after_seconds, 3),
+        ),
+    )
+
+
+async def get_storage_metrics(s3: S3Service) -> StorageMetricsResponse:
+    # Counters belong to this process; the disk usage is the node's
+    if s3.disk_cache is None:
+        return StorageMetricsResponse(disk_cache=None)
+
+    stats = s3.disk_cache.stats
+    used_bytes = await asyncio.to_thread(s3.disk_cache.disk_usage)
+
+    return StorageMetricsResponse(
+        disk_cache=DiskCacheMetricsResponse(
+            process_id=os.getpid(),
+            hits=stats.hits,
+            misses=stats.misses,
+            hit_rate=round(stats.hit_rate, 4),
+            evictions=stats.evictions,
+            evicted_bytes=stats.evicted_bytes,
+            used_bytes=used_bytes,
+            max_bytes=s3.disk_cache.max_bytes,
+        )
+    )
+
+
+def get_auth_metrics(handler: JWTHandler) -> AuthMetricsResponse:
+    # Like the disk cache, both caches live in the answering process
+    return AuthMetricsResponse(
+        process_id=os.getpid(),
+        claims_cache=_cache_metrics(handler.claims_cache_stats()),
+        user_cache=_cache_metrics(user_cache.stats()),
+    )
+
+
+def _cache_metrics(stats: dict[str, int]) -> CacheMetricsResponse:
+    lookups = stats["hits"] + stats["misses"]
+    return CacheMetricsResponse(
+        size=stats["size"],
+        hits=stats["hits"],
+        misses=stats["misses"],
+        hit_rate=round(stats["hits"] / lookups, 4) if lookups else 0.0,
+    )
@@ -1,16 +1,24 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.auth.cache import TTLCache
 from app.auth.jwt_handler import jwt_handler
 from app.auth.models import AuthError, UserContext
+from app.config import settings
 from app.db.database import get_db_session
 from app.db.models import User
 
 # HTTP Bearer token scheme
 security = HTTPBearer(auto_error=False)
 
+# Clerk user ID -> detached user row, so most requests skip the user query
+user_cache: TTLCache[str, User] = TTLCache(
+    max_size=settings.USER_CACHE_MAX_SIZE, ttl_seconds=settings.USER_CACHE_TTL_SECONDS
+)
+
 
 async def get_user_context(
     credentials: HTTPAuthorizationCredentials | None = Depends(security),
@@ -61,36 +69,48 @@ async def get_current_user(
     user_context: UserContext = Depends(get_user_context),
     db: AsyncSession = Depends(get_db_session),
 ) -> User:
-    """Get or create the current user from the database."""
-    try:
-        # Try to find existing user
+    """Get or create the current user, resolving the row from cache when possible."""
+    cached = user_cache.get(user_context.clerk_user_id)
+
+    if cached is None:
+        try:
+            cached = await _upsert_user(db, user_context.clerk_user_id)
+        except Exception as e:
+            await db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="User lookup failed",
+            ) from e
+
+        # The cached row is shared by later requests, so it belongs to no session
+        db.expunge(cached)
+        user_cache.set(user_context.clerk_user_id, cached)
+
+    user_context.user_id = str(cached.id)
+
+    # Copies the cached columns into this request's session without a query
+    return await db.merge(cached, load=False)
+
+
+async def _upsert_user(db: AsyncSession, clerk_user_id: str) -> User:
+    """Insert the user if missing and return its row, safe under concurrent calls."""
+    user = await db.scalar(
+        insert(User)
+        .values(clerk_user_id=clerk_user_id)
+        .on_conflict_do_nothing(index_elements=[User.clerk_user_id])
+        .returning(User)
+    )
+
+    # A conflicting insert returns no row, so the user already exists
+    if user is None:
         result = await db.execute(
-            select(User).where(User.clerk_user_id == user_context.clerk_user_id)
+            select(User).where(User.clerk_user_id == clerk_user_id)
         )
-        user = result.scalar_one_or_none()
-
-        if user:
-            # Update user context with database user ID
-            user_context.user_id = str(user.id)
-            return user
-
-        # Create new user if doesn't exist
-        new_user = User(clerk_user_id=user_context.clerk_user_id)
-        db.add(new_user)
-        await db.commit()
-        await db.refresh(new_user)
-
-        # Update user context with new user ID
-        user_context.user_id = str(new_user.id)
+        user = result.scalar_one()
 
-        return new_user
+    await db.commit()
 
-    except Exception as e:
-        await db.rollback()
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="User lookup failed",
-        ) from e
+    return user
 
 
 async def get_optional_user_context(
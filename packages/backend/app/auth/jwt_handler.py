@@ -1,13 +1,22 @@
+import asyncio
+import contextlib
+import hashlib
 import json
+import logging
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
 import httpx
-from jose import JWTError, jwt
-from jose.exceptions import ExpiredSignatureError, JWTClaimsError
+from jose import JWTError, jwk, jwt
+from jose.backends.base import Key
+from jose.exceptions import ExpiredSignatureError, JWKError, JWTClaimsError
 
+from app.auth.cache import TTLCache
 from app.config import settings
 
+logger = logging.getLogger(__name__)
+
 
 class JWTHandler:
     """Handles JWT token verification using Clerk JWKS."""
@@ -15,51 +24,82 @@ class JWTHandler:
     def __init__(self) -> None:
         self._jwks_cache: dict[str, Any] | None = None
         self._jwks_cache_expires: datetime | None = None
+        self._jwks_fetched_at: datetime | None = None
         self._cache_duration_seconds = 3600  # 1 hour
+        self._refresh_margin_seconds = 300  # refresh 5 minutes before expiry
+        self._refresh_retry_seconds = 30  # first backoff after a failed fetch
+        self._max_refresh_retry_seconds = 300
+        self._failed_refreshes = 0
+        self._retry_at: datetime | None = None
+        self._min_forced_refresh_seconds = 30  # unknown kid refetch rate limit
+        self._fetch_lock = asyncio.Lock()
+        self._client: httpx.AsyncClient | None = None
+        self._refresh_task: asyncio.Task[None] | None = None
+        self._signing_keys: dict[str, Key] = {}
+        self._signing_keys_source: dict[str, Any] | None = None
+        self._claims_cache: TTLCache[str, dict[str, Any]] = TTLCache(
+            max_size=settings.JWT_CLAIMS_CACHE_MAX_SIZE,
+            ttl_seconds=self._cache_duration_seconds,
+        )
 
-    async def get_jwks(self) -> dict[str, Any]:
-        """Fetch JWKS from Clerk, with caching."""
-        now = datetime.now(timezone.utc)
+    async def start(self) -> None:
+        """Open the shared HTTP client and begin refreshing JWKS in the background."""
+        self._client = httpx.AsyncClient(timeout=10.0)
+
+        if settings.CLERK_JWT_ISSUER:
+            self._refresh_task = asyncio.create_task(self._refresh_periodically())
+
+    async def close(self) -> None:
+        if self._refresh_task:
+            self._refresh_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._refresh_task
+            self._refresh_task = None
 
-        # Return cached JWKS if still valid
-        if (
-            self._jwks_cache
-            and self._jwks_cache_expires
-            and now < self._jwks_cache_expires
-        ):
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+
+    async def get_jwks(self, force_refresh: bool = False) -> dict[str, Any]:
+        """Fetch JWKS from Clerk, with caching and a single in-flight fetch."""
+        if self._jwks_cache and self._can_skip_fetch(force_refresh):
             return self._jwks_cache
 
-        # Fetch fresh JWKS
-        if not settings.CLERK_JWKS_URL:
-            raise ValueError("CLERK_JWKS_URL is not configured")
+        async with self._fetch_lock:
+            # Another caller may have refreshed while this one waited
+            if self._jwks_cache and self._can_skip_fetch(force_refresh):
+                return self._jwks_cache
 
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(settings.CLERK_JWKS_URL, timeout=10.0)
-                response.raise_for_status()
-                jwks_data = response.json()
-
-                # Cache the JWKS
-                self._jwks_cache = jwks_data
-                self._jwks_cache_expires = now + timedelta(
-                    seconds=self._cache_duration_seconds
-                )
+            if self._is_backing_off():
+                raise ValueError("Failed to fetch JWKS: retrying after backoff")
+
+            return await self._refresh_jwks()
 
-                return jwks_data  # type: ignore[no-any-return]
+    async def get_signing_keys(self, force_refresh: bool = False) -> dict[str, Key]:
+        """Return JWKS signing keys by kid, parsed once per fetched JWKS."""
+        jwks = await self.get_jwks(force_refresh=force_refresh)
 
-            except httpx.HTTPError as e:
-                raise ValueError(f"Failed to fetch JWKS: {e}") from e
-            except json.JSONDecodeError as e:
-                raise ValueError(f"Invalid JWKS response: {e}") from e
+        if jwks is not self._signing_keys_source:
+            self._signing_keys = self._parse_signing_keys(jwks)
+            self._signing_keys_source = jwks
+
+        return self._signing_keys
 
     async def verify_token(self, token: str) -> dict[str, Any]:
         """Verify JWT token and return claims."""
         if not token:
             raise ValueError("Token is required")
 
+        # Repeat tokens skip RS256 verification until they expire
+        token_digest = hashlib.sha256(token.encode()).hexdigest()
+        cached_claims = self._claims_cache.get(token_digest)
+
+        if cached_claims is not None:
+            return dict(cached_claims)
+
         try:
-            # Get JWKS for signature verification
-            jwks = await self.get_jwks()
+            # Get parsed keys for signature verification
+            signing_keys = await self.get_signing_keys()
 
             # Decode token header to get key ID
             unverified_header = jwt.get_unverified_header(token)
@@ -68,12 +108,12 @@ class JWTHandler:
             if not kid:
                 raise ValueError("Token missing key ID (kid)")
 
-            # Find the appropriate key
-            key = None
-            for jwk in jwks.get("keys", []):
-                if jwk.get("kid") == kid:
-                    key = jwk
-                    break
+            key = signing_keys.get(kid)
+
+            # Unknown kid may mean Clerk rotated keys; refetch, rate limited
+            if not key:
+                signing_keys = await self.get_signing_keys(force_refresh=True)
+                key = signing_keys.get(kid)
 
             if not key:
                 raise ValueError(f"Key with ID {kid} not found in JWKS")
@@ -93,6 +133,8 @@ class JWTHandler:
                 },
             )
 
+            self._cache_claims(token_digest, claims)
+
             return claims
 
         except ExpiredSignatureError as e:
@@ -104,6 +146,128 @@ class JWTHandler:
         except Exception as e:
             raise ValueError(f"Unexpected error during token verification: {e}") from e
 
+    async def _refresh_jwks(self) -> dict[str, Any]:
+        """Fetch JWKS and update the cache; callers must hold the fetch lock."""
+        if not settings.CLERK_JWKS_URL:
+            raise ValueError("CLERK_JWKS_URL is not configured")
+
+        try:
+            if self._client:
+                jwks_data = await self._request_jwks(self._client)
+            else:
+                async with httpx.AsyncClient() as client:
+                    jwks_data = await self._request_jwks(client)
+        except ValueError:
+            self._back_off()
+
+            # Keep serving the last known keys rather than failing every request
+            if self._jwks_cache:
+                logger.warning("JWKS refresh failed, serving cached keys")
+                return self._jwks_cache
+            raise
+
+        now = datetime.now(timezone.utc)
+        self._jwks_cache = jwks_data
+        self._jwks_fetched_at = now
+        self._jwks_cache_expires = now + timedelta(seconds=self._cache_duration_seconds)
+        self._failed_refreshes = 0
+        self._retry_at = None
+
+        return jwks_data
+
+    def _back_off(self) -> None:
+        """Hold off further fetches after a failure, doubling the wait each time."""
+        delay = min(
+            self._refresh_retry_seconds * 2**self._failed_refreshes,
+            self._max_refresh_retry_seconds,
+        )
+        self._failed_refreshes += 1
+        self._retry_at = datetime.now(timezone.utc) + timedelta(seconds=delay)
+
+    async def _request_jwks(self, client: httpx.AsyncClient) -> dict[str, Any]:
+        try:
+            response = await client.get(settings.CLERK_JWKS_URL, timeout=10.0)
+            response.raise_for_status()
+            return response.json()  # type: ignore[no-any-return]
+
+        except httpx.HTTPError as e:
+            raise ValueError(f"Failed to fetch JWKS: {e}") from e
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JWKS response: {e}") from e
+
+    async def _refresh_periodically(self) -> None:
+        """Refresh JWKS shortly before expiry so requests never wait on Clerk."""
+        while True:
+            await asyncio.sleep(self._seconds_until_refresh())
+
+            try:
+                async with self._fetch_lock:
+                    await self._refresh_jwks()
+            except ValueError as e:
+                logger.warning("Background JWKS refresh failed: %s", e)
+
+    def _seconds_until_refresh(self) -> float:
+        if self._retry_at:
+            refresh_at = self._retry_at
+        elif self._jwks_cache_expires:
+            refresh_at = self._jwks_cache_expires - timedelta(
+                seconds=self._refresh_margin_seconds
+            )
+        else:
+            return 0
+
+        return max((refresh_at - datetime.now(timezone.utc)).total_seconds(), 0)
+
+    def _can_skip_fetch(self, force_refresh: bool) -> bool:
+        # While Clerk is failing, cached keys are served without waiting on it
+        if self._is_backing_off():
+            return True
+
+        return self._was_recently_fetched() if force_refresh else self._is_jwks_fresh()
+
+    def _is_backing_off(self) -> bool:
+        return bool(self._retry_at and datetime.now(timezone.utc) < self._retry_at)
+
+    def _is_jwks_fresh(self) -> bool:
+        return bool(
+            self._jwks_cache_expires
+            and datetime.now(timezone.utc) < self._jwks_cache_expires
+        )
+
+    def _was_recently_fetched(self) -> bool:
+        return bool(
+            self._jwks_fetched_at
+            and datetime.now(timezone.utc) - self._jwks_fetched_at
+            < timedelta(seconds=self._min_forced_refresh_seconds)
+        )
+
+    def claims_cache_stats(self) -> dict[str, int]:
+        return self._claims_cache.stats()
+
+    def _cache_claims(self, token_digest: str, claims: dict[str, Any]) -> None:
+        """Cache verified claims until the token's exp."""
+        expires_in = float(claims["exp"]) - time.time()
+        self._claims_cache.set(token_digest, dict(claims), ttl_seconds=expires_in)
+
+    def _parse_signing_keys(self, jwks: dict[str, Any]) -> dict[str, Key]:
+        """Build key objects from JWKS entries, skipping unusable keys."""
+        signing_keys: dict[str, Key] = {}
+
+        for key_data in jwks.get("keys", []):
+            kid = key_data.get("kid")
+
+            if not kid:
+                continue
+
+            try:
+                signing_keys[kid] = jwk.construct(
+                    key_data, algorithm=key_data.get("alg", "RS256")
+                )
+            except JWKError as e:
+                logger.warning("Skipping unusable JWKS key %s: %s", kid, e)
+
+        return signing_keys
+
     def extract_user_info(self, claims: dict[str, Any]) -> dict[str, Any]:
         """Extract user information from JWT claims."""
         return {
@@ -28,6 +28,10 @@ class Settings(BaseSettings):
         default="", description="e.g., https://your-app.clerk.accounts.dev"
     )
 
+    USER_CACHE_MAX_SIZE: int = Field(default=10_000)
+    USER_CACHE_TTL_SECONDS: int = Field(default=300)
+    JWT_CLAIMS_CACHE_MAX_SIZE: int = Field(default=10_000)
+
     @property
     def CLERK_JWKS_URL(self) -> str:
         return f"{self.CLERK_JWT_ISSUER}/.well-known/jwks.json"
@@ -37,19 +41,70 @@ class Settings(BaseSettings):
     AWS_SECRET_ACCESS_KEY: str = Field(default="")
     AWS_S3_BUCKET: str = Field(default="")
     AWS_S3_REGION: str = Field(default="")
+    AWS_S3_MAX_POOL_CONNECTIONS: int = Field(default=50)
+    AWS_S3_MAX_CONCURRENT_DOWNLOADS: int = Field(default=32)
+    AWS_S3_CONNECT_TIMEOUT_SECONDS: float = Field(default=5.0)
+    AWS_S3_READ_TIMEOUT_SECONDS: float = Field(default=30.0)
+    AWS_S3_GZIP_LEVEL: int = Field(default=6)
+    S3_DISK_CACHE_DIR: str = Field(default="")
+    S3_DISK_CACHE_MAX_BYTES: int = Field(default=2 * 1024**3)
+    # Parquet plays tables next to raw replays
+    PLAYS_CACHE_ENABLED: bool = Field(default=False)
 
     # Redis (Celery broker/backend + caching)
     REDIS_URL: str = Field(default="redis://localhost:6379/0")
+    RESULTS_CACHE_TTL_SECONDS: int = Field(default=3600)
 
     # BrightData
     BRIGHTDATA_USERNAME: str = Field(default="")
     BRIGHTDATA_PASSWORD: str = Field(default="")
     BRIGHTDATA_ENDPOINT: str = Field(default="")
+    BRIGHTDATA_MAX_CONCURRENT_SESSIONS: int = Field(default=5)
+    BRIGHTDATA_REQUESTS_PER_MINUTE: int = Field(default=30)
+    BRIGHTDATA_SLOT_LEASE_SECONDS: float = Field(default=60.0)
+    BRIGHTDATA_SLOT_WAIT_TIMEOUT_SECONDS: float = Field(default=600.0)
+    BRIGHTDATA_BREAKER_WINDOW_SECONDS: float = Field(default=120.0)
+    BRIGHTDATA_BREAKER_MIN_CALLS: int = Field(default=10)
+    BRIGHTDATA_BREAKER_FAILURE_RATIO: float = Field(default=0.5)
+    BRIGHTDATA_BREAKER_COOLDOWN_SECONDS: float = Field(default=60.0)
+    BRIGHTDATA_BREAKER_PROBE_TIMEOUT_SECONDS: float = Field(default=180.0)
+
+    @property
+    def BRIGHTDATA_WS_ENDPOINT(self) -> str:
+        return (
+            f"wss://{self.BRIGHTDATA_USERNAME}:{self.BRIGHTDATA_PASSWORD}"
+            f"@{self.BRIGHTDATA_ENDPOINT}"
+        )
+
+    # Scraping (per worker process browser pool)
+    BROWSER_POOL_MAX_SIZE: int = Field(default=1)
+    BROWSER_MAX_PAGES_PER_SESSION: int = Field(default=50)
+    BROWSER_POOL_IDLE_SECONDS: float = Field(default=60.0)
+    SCRAPE_PAGE_TIMEOUT_MS: int = Field(default=120_000)
+    SCRAPE_SCREENSHOT_DIR: str = Field(default="")
+    SCRAPE_CANCEL_POLL_SECONDS: float = Field(default=2.0)
+    SCRAPE_LEASE_SECONDS: float = Field(default=60.0)
+    SCRAPE_MAX_IN_FLIGHT: int = Field(default=10)
+    SCRAPE_IN_FLIGHT_TIMEOUT_SECONDS: float = Field(default=900.0)
+    SCRAPE_FAIR_QUANTUM: int = Field(default=1)
+    SCRAPE_DISPATCH_INTERVAL_SECONDS: float = Field(default=5.0)
+    SCRAPE_MAX_RETRIES: int = Field(default=3)
+    SCRAPE_RETRY_BASE_SECONDS: float = Field(default=10.0)
+    SCRAPE_RETRY_MAX_SECONDS: float = Field(default=300.0)
+    SCRAPE_DURATION_ESTIMATE_SECONDS: float = Field(default=60.0)
+
+    # Deck type model (joblib artifacts)
+    DECK_TYPE_LABEL_ENCODER_PATH: str = Field(default="")
+    DECK_TYPE_VECTORIZER_PATH: str = Field(default="")
+    DECK_TYPE_MODEL_PATH: str = Field(default="")
 
     # Job Configuration
     MAX_URLS_PER_JOB: int = Field(default=100)
     JOB_TIMEOUT_MINUTES: int = Field(default=60)
     RESULTS_RETENTION_DAYS: int = Field(default=30)
+    PROGRESS_STREAM_HEARTBEAT_SECONDS: float = Field(default=15.0)
+    PROGRESS_FLUSH_INTERVAL_SECONDS: float = Field(default=5.0)
+    PROGRESS_FLUSH_BATCH_SIZE: int = Field(default=500)
 
     @property
     def DATABASE_URL(self) -> str:
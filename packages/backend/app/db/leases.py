@@ -0,0 +1,66 @@
+import asyncio
+import logging
+import uuid
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager, suppress
+
+from redis.asyncio import Redis
+
+logger = logging.getLogger(__name__)
+
+# Deletes or extends the lease only if this caller still owns it
+_RELEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+_RENEW_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("pexpire", KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+
+async def acquire_lease(redis: Redis, key: str, ttl_ms: int) -> str | None:
+    """Take the lease if it is free, returning the token that owns it."""
+    token = uuid.uuid4().hex
+
+    if not await redis.set(key, token, nx=True, px=ttl_ms):
+        return None
+
+    return token
+
+
+@asynccontextmanager
+async def hold_lease(
+    redis: Redis, key: str, token: str, ttl_ms: int
+) -> AsyncIterator[None]:
+    """Renew an acquired lease while the block runs, then release it."""
+    renewer = asyncio.create_task(_renew_lease(redis, key, token, ttl_ms))
+
+    try:
+        yield
+    finally:
+        renewer.cancel()
+
+        with suppress(asyncio.CancelledError):
+            await renewer
+
+        await redis.eval(_RELEASE_SCRIPT, 1, key, token)  # type: ignore[misc]
+
+
+async def _renew_lease(redis: Redis, key: str, token: str, ttl_ms: int) -> None:
+    # A crashed holder stops renewing, so its lease expires and a waiter takes over
+    while True:
+        await asyncio.sleep(ttl_ms / 3000)
+
+        is_renewed = await redis.eval(  # type: ignore[misc]
+            _RENEW_SCRIPT, 1, key, token, str(ttl_ms)
+        )
+
+        if not is_renewed:
+            logger.warning("Lost lease %s", key)
+            return
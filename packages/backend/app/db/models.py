@@ -5,10 +5,12 @@ from typing import Any
 
 from sqlalchemy import (
     TIMESTAMP,
+    BigInteger,
     String,
     Integer,
     Boolean,
     JSON,
+    Float,
     ForeignKey,
     Index,
 )
@@ -83,6 +85,12 @@ class Job(BaseModel):
     # Error handling
     error_message: Mapped[str | None] = mapped_column(String, nullable=True)
 
+    # Estimated scrape time avoided by cancelling the job
+    scrape_seconds_saved: Mapped[float | None] = mapped_column(Float, nullable=True)
+
+    # Materialized results artifact, written once when the job completes
+    results_s3_key: Mapped[str | None] = mapped_column(String, nullable=True)
+
     # Shareable results
     shareable_id: Mapped[uuid.UUID] = mapped_column(
         UUID,
@@ -111,6 +119,7 @@ class Job(BaseModel):
         Index("ix_jobs_user_id_status", "user_id", "status"),
         Index("ix_jobs_status_created_at", "status", "created_at"),
         Index("ix_jobs_user_id_job_type", "user_id", "job_type"),
+        Index("ix_jobs_user_id_created_at", "user_id", "created_at", "id"),
     )
 
 
@@ -118,6 +127,9 @@ class ScrapedData(BaseModel):
     __tablename__ = "scraped_data"
 
     url: Mapped[str] = mapped_column(String, unique=True, index=True, nullable=False)
+    replay_id: Mapped[int] = mapped_column(
+        BigInteger, unique=True, index=True, nullable=False
+    )  # DuelingBook replay ID, the canonical cache key for a URL
     s3_key: Mapped[str] = mapped_column(
         String, nullable=False
     )  # S3 object key for raw scraped JSON
@@ -5,10 +5,13 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.main import v1_router
+from app.auth.jwt_handler import jwt_handler
 from app.config import settings
 from app.db.database import db_engine
 from app.db.models import Base
+from app.db.redis import redis_client
 from app.logging import setup_logging
+from app.storage.s3 import s3_service
 
 setup_logging()
 
@@ -17,7 +20,12 @@ setup_logging()
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     async with db_engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+    await jwt_handler.start()
+    await s3_service.start()
     yield
+    await s3_service.close()
+    await jwt_handler.close()
+    await redis_client.aclose()
     await db_engine.dispose()
 
 
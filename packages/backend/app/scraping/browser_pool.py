@@ -0,0 +1,199 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import AsyncExitStack, asynccontextmanager
+from dataclasses import dataclass
+
+from playwright.async_api import Browser, Page, Playwright, async_playwright
+
+from app.config import settings
+from app.scraping.limiter import ProxyLimiter, proxy_limiter
+
+logger = logging.getLogger(__name__)
+
+# An idle session's lease outlives the idle timeout by this much, so the reaper
+# closes the session before its slot can go to another one
+_IDLE_LEASE_MARGIN_SECONDS = 30.0
+
+
+@dataclass
+class BrowserSession:
+    browser: Browser
+    lease: str | None = None
+    pages_served: int = 0
+    failed: bool = False
+    idle_since: float = 0.0
+
+
+class BrowserPool:
+    """CDP sessions reused across a process's tasks, each holding a proxy slot."""
+
+    def __init__(
+        self,
+        endpoint_url: str,
+        max_size: int,
+        max_pages_per_session: int,
+        idle_timeout_seconds: float,
+        limiter: ProxyLimiter | None = None,
+    ) -> None:
+        self.endpoint_url = endpoint_url
+        self.max_size = max_size
+        self.max_pages_per_session = max_pages_per_session
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self.limiter = limiter
+
+        self._playwright: Playwright | None = None
+        self._idle: deque[BrowserSession] = deque()
+        self._slots = asyncio.Semaphore(max_size)
+        self._start_lock = asyncio.Lock()
+        self.sessions_opened = 0
+
+    async def start(self) -> None:
+        async with self._start_lock:
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+
+    async def close(self) -> None:
+        while self._idle:
+            await self._discard(self._idle.popleft())
+
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+    @asynccontextmanager
+    async def page(self) -> AsyncIterator[Page]:
+        """Lend a fresh page on a pooled browser session."""
+        await self.start()
+
+        async with self._slots, AsyncExitStack() as stack:
+            session = await self._checkout()
+
+            if self.limiter is not None and session.lease is not None:
+                await stack.enter_async_context(self.limiter.hold(session.lease))
+
+                # New sessions took their rate token along with the lease
+                if session.pages_served:
+                    try:
+                        await self.limiter.acquire_request()
+                    except BaseException:
+                        await self._checkin(session)
+                        raise
+
+            try:
+                page = await session.browser.new_page()
+            except Exception:
+                await self._discard(session)
+                raise
+
+            try:
+                yield page
+            except BaseException:
+                session.failed = True
+                raise
+            finally:
+                try:
+                    await page.close()
+                except Exception:
+                    session.failed = True
+
+                session.pages_served += 1
+                await self._checkin(session)
+
+    async def reap_idle(self) -> None:
+        """Close sessions idle past the timeout, freeing their proxy slots."""
+        now = time.monotonic()
+
+        while self._idle and now - self._idle[0].idle_since > self.idle_timeout_seconds:
+            logger.info("Closing idle browser session")
+            await self._discard(self._idle.popleft())
+
+    async def _checkout(self) -> BrowserSession:
+        await self.reap_idle()
+
+        while self._idle:
+            session = self._idle.pop()
+
+            if not session.browser.is_connected():
+                logger.info("Dropping disconnected browser session")
+                await self._discard(session)
+                continue
+
+            if not await self._reclaim_lease(session):
+                logger.info("Dropping browser session whose proxy slot lapsed")
+                await self._discard(session)
+                continue
+
+            return session
+
+        return await self._connect()
+
+    async def _reclaim_lease(self, session: BrowserSession) -> bool:
+        if self.limiter is None or session.lease is None:
+            return True
+
+        return await self.limiter.extend(session.lease, self.limiter.lease_seconds)
+
+    async def _checkin(self, session: BrowserSession) -> None:
+        if session.failed or not session.browser.is_connected():
+            logger.info("Recycling browser session after an error")
+            await self._discard(session)
+        elif session.pages_served >= self.max_pages_per_session:
+            logger.info(
+                "Recycling browser session after %d pages", session.pages_served
+            )
+            await self._discard(session)
+        elif not await self._extend_idle_lease(session):
+            logger.info("Closing browser session whose proxy slot lapsed")
+            await self._discard(session)
+        else:
+            session.idle_since = time.monotonic()
+            self._idle.append(session)
+
+    async def _extend_idle_lease(self, session: BrowserSession) -> bool:
+        # The lease must outlast the idle period, when nothing renews it
+        if self.limiter is None or session.lease is None:
+            return True
+
+        return await self.limiter.extend(
+            session.lease, self.idle_timeout_seconds + _IDLE_LEASE_MARGIN_SECONDS
+        )
+
+    async def _connect(self) -> BrowserSession:
+        if self._playwright is None:
+            raise RuntimeError("Browser pool is not started")
+
+        lease = await self.limiter.acquire() if self.limiter is not None else None
+
+        try:
+            browser = await self._playwright.chromium.connect_over_cdp(
+                endpoint_url=self.endpoint_url
+            )
+        except BaseException:
+            if self.limiter is not None and lease is not None:
+                await self.limiter.release(lease)
+            raise
+
+        self.sessions_opened += 1
+        return BrowserSession(browser=browser, lease=lease)
+
+    async def _discard(self, session: BrowserSession) -> None:
+        try:
+            await session.browser.close()
+        except Exception:
+            logger.warning("Failed to close browser session", exc_info=True)
+
+        # Only released once the session is closed, so slots never undercount
+        if self.limiter is not None and session.lease is not None:
+            await self.limiter.release(session.lease)
+
+
+browser_pool = BrowserPool(
+    endpoint_url=settings.BRIGHTDATA_WS_ENDPOINT,
+    max_size=settings.BROWSER_POOL_MAX_SIZE,
+    max_pages_per_session=settings.BROWSER_MAX_PAGES_PER_SESSION,
+    idle_timeout_seconds=settings.BROWSER_POOL_IDLE_SECONDS,
+    limiter=proxy_limiter,
+)
@@ -0,0 +1,230 @@
+import logging
+import uuid
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from enum import Enum
+
+from playwright.async_api import Error as PlaywrightError
+from redis.asyncio import Redis
+
+from app.config import settings
+from app.db.redis import redis_client
+from app.scraping.extractor import ReplayExtractionError
+
+logger = logging.getLogger(__name__)
+
+# Admits every call while closed. Once open, refuses calls until the cooldown
+# ends, then lets exactly one probe through per probe timeout and remembers its
+# call ID. Returns 0 when the call may proceed, or the milliseconds until the
+# next probe otherwise.
+_ADMIT_SCRIPT = """
+local time = redis.call("TIME")
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local state = redis.call("HGET", KEYS[1], "state")
+
+if not state or state == "closed" then
+    return 0
+end
+
+local until_ms = tonumber(redis.call("HGET", KEYS[1], "until"))
+
+if now < until_ms then
+    return until_ms - now
+end
+
+redis.call(
+    "HSET", KEYS[1], "state", "half_open", "until", now + tonumber(ARGV[1]),
+    "probe", ARGV[2]
+)
+return 0
+"""
+
+# Records one outcome in the sliding window and moves the breaker between
+# states, returning "opened" when this outcome tripped it. Only the probe's
+# outcome decides whether a half-open breaker closes or reopens; calls admitted
+# before the breaker opened may still finish, and are ignored.
+_RECORD_SCRIPT = """
+local time = redis.call("TIME")
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local state = redis.call("HGET", KEYS[1], "state") or "closed"
+local failed = ARGV[1] == "1"
+local window_ms = tonumber(ARGV[3])
+local cooldown_ms = tonumber(ARGV[6])
+
+if state == "half_open" then
+    if redis.call("HGET", KEYS[1], "probe") ~= ARGV[2] then
+        return "half_open"
+    end
+
+    if failed then
+        redis.call("HSET", KEYS[1], "state", "open", "until", now + cooldown_ms)
+        redis.call("HDEL", KEYS[1], "probe")
+        return "opened"
+    end
+
+    redis.call("DEL", KEYS[1], KEYS[2], KEYS[3])
+    return "closed"
+end
+
+if state == "open" then
+    return "open"
+end
+
+redis.call("ZREMRANGEBYSCORE", KEYS[2], "-inf", now - window_ms)
+redis.call("ZREMRANGEBYSCORE", KEYS[3], "-inf", now - window_ms)
+redis.call("ZADD", KEYS[2], now, ARGV[2])
+redis.call("PEXPIRE", KEYS[2], window_ms)
+
+if failed then
+    redis.call("ZADD", KEYS[3], now, ARGV[2])
+    redis.call("PEXPIRE", KEYS[3], window_ms)
+end
+
+local calls = redis.call("ZCARD", KEYS[2])
+local failures = redis.call("ZCARD", KEYS[3])
+
+if calls >= tonumber(ARGV[4]) and failures / calls >= tonumber(ARGV[5]) then
+    redis.call("HSET", KEYS[1], "state", "open", "until", now + cooldown_ms)
+    redis.call("DEL", KEYS[2], KEYS[3])
+    return "opened"
+end
+
+return "closed"
+"""
+
+# Failures of the proxied browser session; cancellations and local errors are
+# not the endpoint's fault and are not recorded
+ENDPOINT_ERRORS = (ReplayExtractionError, PlaywrightError, TimeoutError)
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    def __init__(self, endpoint: str, retry_after_seconds: float) -> None:
+        super().__init__(
+            f"Circuit for {endpoint} is open, retry in {retry_after_seconds:.1f}s"
+        )
+        self.retry_after_seconds = retry_after_seconds
+
+
+@dataclass
+class CircuitStatus:
+    endpoint: str
+    state: CircuitState
+    recent_calls: int
+    recent_failures: int
+    retry_after_seconds: float
+
+
+class CircuitBreaker:
+    """Cluster-wide circuit breaker for one scraping endpoint, kept in Redis."""
+
+    def __init__(
+        self,
+        redis: Redis,
+        endpoint: str,
+        window_seconds: float,
+        min_calls: int,
+        failure_ratio: float,
+        cooldown_seconds: float,
+        probe_timeout_seconds: float,
+    ) -> None:
+        self.redis = redis
+        self.endpoint = endpoint
+        self.window_seconds = window_seconds
+        self.min_calls = min_calls
+        self.failure_ratio = failure_ratio
+        self.cooldown_seconds = cooldown_seconds
+        self.probe_timeout_seconds = probe_timeout_seconds
+
+    @asynccontextmanager
+    async def call(self) -> AsyncIterator[None]:
+        """Run one call through the breaker, raising CircuitOpenError if refused."""
+        call_id = uuid.uuid4().hex
+        wait_ms = await self.redis.eval(  # type: ignore[misc]
+            _ADMIT_SCRIPT,
+            1,
+            self._state_key,
+            str(int(self.probe_timeout_seconds * 1000)),
+            call_id,
+        )
+
+        if wait_ms > 0:
+            raise CircuitOpenError(self.endpoint, wait_ms / 1000)
+
+        try:
+            yield
+        except ENDPOINT_ERRORS:
+            await self._record(call_id, failed=True)
+            raise
+
+        await self._record(call_id, failed=False)
+
+    async def status(self) -> CircuitStatus:
+        seconds, microseconds = await self.redis.time()
+        now_ms = seconds * 1000 + microseconds // 1000
+        window_start = now_ms - int(self.window_seconds * 1000)
+
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.hmget(self._state_key, ["state", "until"])
+            pipe.zcount(self._calls_key, window_start, "+inf")
+            pipe.zcount(self._failures_key, window_start, "+inf")
+            (state, until_ms), calls, failures = await pipe.execute()
+
+        return CircuitStatus(
+            endpoint=self.endpoint,
+            state=CircuitState(state or CircuitState.CLOSED),
+            recent_calls=calls,
+            recent_failures=failures,
+            retry_after_seconds=(
+                max(int(until_ms) - now_ms, 0) / 1000 if until_ms else 0.0
+            ),
+        )
+
+    async def _record(self, call_id: str, failed: bool) -> None:
+        state = await self.redis.eval(  # type: ignore[misc]
+            _RECORD_SCRIPT,
+            3,
+            self._state_key,
+            self._calls_key,
+            self._failures_key,
+            "1" if failed else "0",
+            call_id,
+            str(int(self.window_seconds * 1000)),
+            str(self.min_calls),
+            str(self.failure_ratio),
+            str(int(self.cooldown_seconds * 1000)),
+        )
+
+        if state == "opened":
+            logger.warning(
+                "Opened circuit for %s for %ss", self.endpoint, self.cooldown_seconds
+            )
+
+    @property
+    def _state_key(self) -> str:
+        return f"circuit:{self.endpoint}:state"
+
+    @property
+    def _calls_key(self) -> str:
+        return f"circuit:{self.endpoint}:calls"
+
+    @property
+    def _failures_key(self) -> str:
+        return f"circuit:{self.endpoint}:failures"
+
+
+proxy_breaker = CircuitBreaker(
+    redis=redis_client,
+    endpoint=settings.BRIGHTDATA_ENDPOINT or "brightdata",
+    window_seconds=settings.BRIGHTDATA_BREAKER_WINDOW_SECONDS,
+    min_calls=settings.BRIGHTDATA_BREAKER_MIN_CALLS,
+    failure_ratio=settings.BRIGHTDATA_BREAKER_FAILURE_RATIO,
+    cooldown_seconds=settings.BRIGHTDATA_BREAKER_COOLDOWN_SECONDS,
+    probe_timeout_seconds=settings.BRIGHTDATA_BREAKER_PROBE_TIMEOUT_SECONDS,
+)
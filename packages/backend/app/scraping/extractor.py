@@ -0,0 +1,210 @@
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from playwright.async_api import ConsoleMessage, Page, Request, Response, Route
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from app.config import settings
+from app.scraping.browser_pool import BrowserPool, browser_pool
+from app.scraping.replays import get_replay_id
+
+logger = logging.getLogger(__name__)
+
+# Nothing rendered is needed, only the replay JSON the page logs or fetches
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font", "stylesheet"})
+DATA_RESOURCE_TYPES = frozenset({"xhr", "fetch"})
+
+
+class ReplayExtractionError(Exception):
+    pass
+
+
+class ScrapeCancelledError(Exception):
+    pass
+
+
+@dataclass
+class ScrapeMetrics:
+    bytes_received: int = 0
+    requests_blocked: int = 0
+    time_to_json_seconds: float = 0.0
+
+
+@dataclass
+class ReplayScrape:
+    data: dict[str, Any]
+    metrics: ScrapeMetrics
+
+
+class ReplayExtractor:
+    """Extracts replay JSON from DuelingBook replays using pooled browser pages."""
+
+    def __init__(self, pool: BrowserPool) -> None:
+        self.pool = pool
+
+    async def extract_replay(
+        self, replay_url: str, cancelled: asyncio.Event | None = None
+    ) -> ReplayScrape:
+        """Scrape one replay, aborting between steps once cancelled is set."""
+        cancelled = cancelled or asyncio.Event()
+
+        async with self.pool.page() as page:
+            metrics = ScrapeMetrics()
+            replay_json = _capture_replay_json(page, metrics)
+            await page.route("**/*", lambda route: _block_resources(route, metrics))
+
+            try:
+                _raise_if_cancelled(cancelled, replay_url)
+                logger.info("Navigating to replay URL: %s", replay_url)
+                started = time.monotonic()
+
+                # Stop at the first response; the JSON usually lands before the DOM
+                await page.goto(
+                    url=replay_url,
+                    timeout=settings.SCRAPE_PAGE_TIMEOUT_MS,
+                    wait_until="commit",
+                )
+                _raise_if_cancelled(cancelled, replay_url)
+
+                data = await _wait_for_replay_json(replay_json, cancelled)
+                metrics.time_to_json_seconds = time.monotonic() - started
+
+            except ScrapeCancelledError:
+                logger.info("Scrape cancelled for URL: %s", replay_url)
+                raise
+
+            # Ours is the builtin, raised while waiting; goto raises Playwright's
+            except (TimeoutError, PlaywrightTimeoutError) as e:
+                logger.error("Timed out waiting for replay JSON: %s", replay_url)
+                await _take_screenshot(page, replay_url)
+                raise ReplayExtractionError(
+                    f"Replay JSON not captured for {replay_url}"
+                ) from e
+
+            except Exception:
+                logger.exception("Error extracting replay JSON for URL: %s", replay_url)
+                await _take_screenshot(page, replay_url)
+                raise
+
+            finally:
+                replay_json.cancel()
+
+            return ReplayScrape(data=data, metrics=metrics)
+
+
+async def _wait_for_replay_json(
+    replay_json: asyncio.Future[dict[str, Any]], cancelled: asyncio.Event
+) -> dict[str, Any]:
+    cancel_waiter = asyncio.ensure_future(cancelled.wait())
+    waiters: set[asyncio.Future[Any]] = {replay_json, cancel_waiter}
+
+    try:
+        await asyncio.wait(
+            waiters,
+            timeout=settings.SCRAPE_PAGE_TIMEOUT_MS / 1000,
+            return_when=asyncio.FIRST_COMPLETED,
+        )
+    finally:
+        cancel_waiter.cancel()
+
+    if replay_json.done():
+        return replay_json.result()
+
+    if cancelled.is_set():
+        raise ScrapeCancelledError("Scrape cancelled while waiting for replay JSON")
+
+    raise TimeoutError
+
+
+def _raise_if_cancelled(cancelled: asyncio.Event, replay_url: str) -> None:
+    if cancelled.is_set():
+        raise ScrapeCancelledError(f"Scrape cancelled for {replay_url}")
+
+
+def _capture_replay_json(
+    page: Page, metrics: ScrapeMetrics
+) -> asyncio.Future[dict[str, Any]]:
+    """Resolve with the first unconcealed replay JSON seen in the console or network."""
+    replay_json: asyncio.Future[dict[str, Any]] = (
+        asyncio.get_running_loop().create_future()
+    )
+
+    def resolve(text: str) -> None:
+        data = _parse_replay_json(text)
+
+        if data is not None and not replay_json.done():
+            replay_json.set_result(data)
+
+    def on_console(message: ConsoleMessage) -> None:
+        resolve(message.text)
+
+    async def on_request_finished(request: Request) -> None:
+        # Counts chunked responses too, which carry no content-length
+        try:
+            sizes = await request.sizes()
+        except Exception:
+            return
+
+        metrics.bytes_received += sizes["responseBodySize"]
+
+    async def on_response(response: Response) -> None:
+        if replay_json.done():
+            return
+
+        if response.request.resource_type not in DATA_RESOURCE_TYPES:
+            return
+
+        try:
+            resolve(await response.text())
+        except Exception:
+            # Bodies of redirects and aborted requests are unavailable
+            return
+
+    page.on("console", on_console)
+    page.on("response", on_response)
+    page.on("requestfinished", on_request_finished)
+    return replay_json
+
+
+async def _block_resources(route: Route, metrics: ScrapeMetrics) -> None:
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        metrics.requests_blocked += 1
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+def _parse_replay_json(text: str) -> dict[str, Any] | None:
+    # Cheap check first, most console lines and responses are not the replay
+    if '"conceal"' not in text:
+        return None
+
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        return None
+
+    if isinstance(data, dict) and data.get("conceal") is False:
+        return data
+
+    return None
+
+
+async def _take_screenshot(page: Page, replay_url: str) -> None:
+    if not settings.SCRAPE_SCREENSHOT_DIR:
+        return
+
+    path = f"{settings.SCRAPE_SCREENSHOT_DIR}/{get_replay_id(replay_url)}.png"
+
+    try:
+        await page.screenshot(path=path)
+        logger.info("Screenshot saved to: %s", path)
+    except Exception:
+        logger.warning("Failed to take screenshot for %s", replay_url, exc_info=True)
+
+
+replay_extractor = ReplayExtractor(browser_pool)
@@ -0,0 +1,197 @@
+import asyncio
+import logging
+import uuid
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager, suppress
+from dataclasses import dataclass
+
+from redis.asyncio import Redis
+
+from app.config import settings
+from app.db.redis import redis_client
+
+logger = logging.getLogger(__name__)
+
+# Grants a lease only when a slot and a rate token are both free, using Redis
+# time so workers with skewed clocks agree. An empty lease token takes only a
+# rate token, for a session that already holds its lease. Returns 0 on success,
+# -1 when every slot is taken, or the milliseconds until the next rate token.
+_ACQUIRE_SCRIPT = """
+local time = redis.call("TIME")
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local wants_lease = ARGV[1] ~= ""
+
+if wants_lease then
+    redis.call("ZREMRANGEBYSCORE", KEYS[1], "-inf", now)
+
+    if redis.call("ZCARD", KEYS[1]) >= tonumber(ARGV[2]) then
+        return -1
+    end
+end
+
+local capacity = tonumber(ARGV[4])
+local rate = tonumber(ARGV[5])
+local bucket = redis.call("HMGET", KEYS[2], "tokens", "ts")
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + (now - ts) * rate)
+
+if tokens < 1 then
+    redis.call("HSET", KEYS[2], "tokens", tokens, "ts", now)
+    return math.ceil((1 - tokens) / rate)
+end
+
+redis.call("HSET", KEYS[2], "tokens", tokens - 1, "ts", now)
+redis.call("PEXPIRE", KEYS[2], math.ceil(capacity / rate) + 1000)
+
+if wants_lease then
+    redis.call("ZADD", KEYS[1], now + tonumber(ARGV[3]), ARGV[1])
+end
+
+return 0
+"""
+
+# Extends a lease only if it has not already expired and been reclaimed
+_RENEW_SCRIPT = """
+if not redis.call("ZSCORE", KEYS[1], ARGV[1]) then
+    return 0
+end
+
+local time = redis.call("TIME")
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+redis.call("ZADD", KEYS[1], now + tonumber(ARGV[2]), ARGV[1])
+return 1
+"""
+
+_LEASES_KEY = "brightdata:leases"
+_BUCKET_KEY = "brightdata:bucket"
+_SLOT_POLL_SECONDS = 0.5
+
+
+class ProxyCapacityError(Exception):
+    pass
+
+
+@dataclass
+class ProxyOccupancy:
+    active_sessions: int
+    max_sessions: int
+
+
+class ProxyLimiter:
+    """Cluster-wide cap on concurrent BrightData sessions and their request rate."""
+
+    def __init__(
+        self,
+        redis: Redis,
+        max_sessions: int,
+        requests_per_minute: int,
+        lease_seconds: float,
+        wait_timeout_seconds: float,
+    ) -> None:
+        self.redis = redis
+        self.max_sessions = max_sessions
+        self.requests_per_minute = requests_per_minute
+        self.lease_seconds = lease_seconds
+        self.wait_timeout_seconds = wait_timeout_seconds
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold one proxy slot, renewing its lease until the block exits."""
+        token = await self.acquire()
+
+        try:
+            async with self.hold(token):
+                yield
+        finally:
+            await self.release(token)
+
+    async def acquire(self) -> str:
+        """Take a session lease and a rate token, returning the lease token."""
+        token = uuid.uuid4().hex
+        await self._acquire(token)
+        return token
+
+    async def acquire_request(self) -> None:
+        """Take a rate token for a request on a session that already holds a lease."""
+        await self._acquire("")
+
+    @asynccontextmanager
+    async def hold(self, token: str) -> AsyncIterator[None]:
+        """Keep renewing a lease until the block exits."""
+        renewer = asyncio.create_task(self._renew(token))
+
+        try:
+            yield
+        finally:
+            renewer.cancel()
+
+            with suppress(asyncio.CancelledError):
+                await renewer
+
+    async def extend(self, token: str, seconds: float) -> bool:
+        """Push a lease's expiry to seconds from now, False if it already lapsed."""
+        is_extended = await self.redis.eval(  # type: ignore[misc]
+            _RENEW_SCRIPT, 1, _LEASES_KEY, token, str(int(seconds * 1000))
+        )
+        return bool(is_extended)
+
+    async def release(self, token: str) -> None:
+        await self.redis.zrem(_LEASES_KEY, token)
+
+    async def occupancy(self) -> ProxyOccupancy:
+        seconds, microseconds = await self.redis.time()
+        now_ms = seconds * 1000 + microseconds // 1000
+        active = await self.redis.zcount(_LEASES_KEY, now_ms, "+inf")
+        return ProxyOccupancy(active_sessions=active, max_sessions=self.max_sessions)
+
+    async def _acquire(self, token: str) -> None:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.wait_timeout_seconds
+
+        # An idle cluster may fill every slot at once, but no faster afterwards
+        capacity = self.max_sessions
+        refill_per_ms = self.requests_per_minute / 60_000
+
+        while True:
+            wait_ms = await self.redis.eval(  # type: ignore[misc]
+                _ACQUIRE_SCRIPT,
+                2,
+                _LEASES_KEY,
+                _BUCKET_KEY,
+                token,
+                str(self.max_sessions),
+                str(int(self.lease_seconds * 1000)),
+                str(capacity),
+                str(refill_per_ms),
+            )
+
+            if wait_ms == 0:
+                return
+
+            delay = _SLOT_POLL_SECONDS if wait_ms < 0 else wait_ms / 1000
+
+            if loop.time() + delay > deadline:
+                raise ProxyCapacityError(
+                    f"No proxy slot free within {self.wait_timeout_seconds}s"
+                )
+
+            await asyncio.sleep(delay)
+
+    async def _renew(self, token: str) -> None:
+        # Renew well before expiry; a crashed worker simply stops renewing
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+
+            if not await self.extend(token, self.lease_seconds):
+                logger.warning("Proxy slot lease %s expired while in use", token)
+                return
+
+
+proxy_limiter = ProxyLimiter(
+    redis=redis_client,
+    max_sessions=settings.BRIGHTDATA_MAX_CONCURRENT_SESSIONS,
+    requests_per_minute=settings.BRIGHTDATA_REQUESTS_PER_MINUTE,
+    lease_seconds=settings.BRIGHTDATA_SLOT_LEASE_SECONDS,
+    wait_timeout_seconds=settings.BRIGHTDATA_SLOT_WAIT_TIMEOUT_SECONDS,
+)
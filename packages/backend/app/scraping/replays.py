@@ -0,0 +1,58 @@
+from urllib.parse import parse_qs, urlparse
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import ScrapedData
+
+
+def get_replay_id(replay_url: str) -> int | None:
+    """Extracts the replay ID from the replay URL query parameters."""
+    params = parse_qs(urlparse(replay_url).query)
+
+    try:
+        return int(params["id"][0])
+    except (KeyError, ValueError):
+        return None
+
+
+def canonical_replay_url(replay_id: int) -> str:
+    return f"https://www.duelingbook.com/replay?id={replay_id}"
+
+
+def replay_s3_key(replay_id: int) -> str:
+    return f"replays/{replay_id}.json"
+
+
+async def get_scraped_s3_keys(db: AsyncSession, urls: list[str]) -> dict[str, str]:
+    """Map each already-scraped URL to its S3 key with a single query."""
+    replay_ids = {
+        url: replay_id for url in urls if (replay_id := get_replay_id(url)) is not None
+    }
+
+    if not replay_ids:
+        return {}
+
+    result = await db.execute(
+        select(ScrapedData.replay_id, ScrapedData.s3_key).where(
+            ScrapedData.replay_id.in_(set(replay_ids.values()))
+        )
+    )
+    s3_keys = dict(result.tuples().all())
+
+    return {
+        url: s3_keys[replay_id]
+        for url, replay_id in replay_ids.items()
+        if replay_id in s3_keys
+    }
+
+
+async def record_scraped_replay(db: AsyncSession, replay_id: int, s3_key: str) -> None:
+    """Record a stored replay, leaving any existing entry for the same ID in place."""
+    await db.execute(
+        insert(ScrapedData)
+        .values(url=canonical_replay_url(replay_id), replay_id=replay_id, s3_key=s3_key)
+        .on_conflict_do_nothing(index_elements=[ScrapedData.replay_id])
+    )
+    await db.commit()
@@ -0,0 +1,16 @@
+import random
+
+from app.config import settings
+from app.scraping.circuit_breaker import ENDPOINT_ERRORS
+from app.scraping.limiter import ProxyCapacityError
+
+RETRYABLE_ERRORS = (*ENDPOINT_ERRORS, ProxyCapacityError)
+
+
+def retry_delay_seconds(attempt: int) -> float:
+    """Full-jitter exponential backoff, so retrying workers do not move in step."""
+    ceiling = min(
+        settings.SCRAPE_RETRY_MAX_SECONDS,
+        settings.SCRAPE_RETRY_BASE_SECONDS * 2**attempt,
+    )
+    return random.uniform(0, ceiling)
@@ -0,0 +1,97 @@
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+
+from redis.asyncio import Redis
+from redis.asyncio.client import PubSub
+
+from app.config import settings
+from app.db.leases import acquire_lease, hold_lease
+from app.scraping.extractor import ScrapeCancelledError
+
+logger = logging.getLogger(__name__)
+
+_RESULT_TTL_SECONDS = 600
+_WAIT_POLL_SECONDS = 5.0
+
+
+def _lease_key(replay_id: int) -> str:
+    return f"replay_scrape:{replay_id}:lease"
+
+
+def _result_key(replay_id: int) -> str:
+    return f"replay_scrape:{replay_id}:result"
+
+
+def _done_channel(replay_id: int) -> str:
+    return f"replay_scrape:{replay_id}:done"
+
+
+async def scrape_replay_once(
+    redis: Redis,
+    replay_id: int,
+    scrape: Callable[[], Awaitable[str]],
+    cancelled: asyncio.Event,
+) -> str:
+    """Return the replay's S3 key, letting only one task across jobs scrape it."""
+    pubsub = redis.pubsub()
+    # Subscribe before checking the result so a publish cannot fall in between
+    await pubsub.subscribe(_done_channel(replay_id))
+
+    try:
+        while True:
+            shared_s3_key = await redis.get(_result_key(replay_id))
+
+            if shared_s3_key:
+                return str(shared_s3_key)
+
+            lease_ms = int(settings.SCRAPE_LEASE_SECONDS * 1000)
+            token = await acquire_lease(redis, _lease_key(replay_id), lease_ms)
+
+            if token is not None:
+                return await _scrape_with_lease(redis, replay_id, token, scrape)
+
+            if cancelled.is_set():
+                raise ScrapeCancelledError(f"Cancelled waiting for replay {replay_id}")
+
+            s3_key = await _wait_for_result(pubsub)
+
+            # An empty result means the scraper failed; take over the lease
+            if s3_key:
+                logger.info("Shared in-flight scrape of replay %s", replay_id)
+                return s3_key
+    finally:
+        await pubsub.unsubscribe()
+        await pubsub.aclose()  # type: ignore[no-untyped-call]
+
+
+async def _scrape_with_lease(
+    redis: Redis, replay_id: int, token: str, scrape: Callable[[], Awaitable[str]]
+) -> str:
+    lease_ms = int(settings.SCRAPE_LEASE_SECONDS * 1000)
+    s3_key = ""
+
+    try:
+        # Released before publishing, so a waiter woken by a failure finds
+        # the lease free and takes over instead of waiting another poll
+        async with hold_lease(redis, _lease_key(replay_id), token, lease_ms):
+            s3_key = await scrape()
+
+            await redis.set(_result_key(replay_id), s3_key, ex=_RESULT_TTL_SECONDS)
+
+        return s3_key
+    finally:
+        # Waiters wake up either way; on failure one of them takes over
+        await redis.publish(_done_channel(replay_id), s3_key)
+
+
+async def _wait_for_result(pubsub: PubSub) -> str | None:
+    message = await pubsub.get_message(
+        ignore_subscribe_messages=True, timeout=_WAIT_POLL_SECONDS
+    )
+
+    if message is None:
+        return None
+
+    data: str = message["data"]
+    return data
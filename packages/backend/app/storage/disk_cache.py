@@ -0,0 +1,165 @@
+import fcntl
+import hashlib
+import logging
+import os
+import tempfile
+import time
+from contextlib import suppress
+from dataclasses import dataclass
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Eviction frees down to this share of the budget, so it does not run on every put
+_EVICT_TO_RATIO = 0.9
+_TEMP_PREFIX = ".tmp-"
+# Temp files this old were left by a process that died mid-write
+_STALE_TEMP_SECONDS = 60 * 60
+
+
+@dataclass
+class DiskCacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    evicted_bytes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class DiskCache:
+    """Byte-budgeted LRU cache of immutable objects, shared by a node's processes."""
+
+    def __init__(self, directory: str, max_bytes: int) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.stats = DiskCacheStats()
+        # Holds the node-wide size of the cache, read and written under its lock
+        self._usage_path = self.directory / ".usage.lock"
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._remove_stale_temp_files()
+        # Starting from a scan drops drift left by a process that died mid-put
+        self._add_usage(None)
+
+    def get(self, key: str) -> bytes | None:
+        path = self._path(key)
+
+        try:
+            body = path.read_bytes()
+        except FileNotFoundError:
+            # Never cached, or evicted by another process in the meantime
+            self.stats.misses += 1
+            return None
+
+        # Evicted right after the read, but the body is already in hand
+        with suppress(FileNotFoundError):
+            os.utime(path)
+
+        self.stats.hits += 1
+        return body
+
+    def put(self, key: str, body: bytes) -> None:
+        if len(body) > self.max_bytes:
+            return
+
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=_TEMP_PREFIX)
+
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(body)
+
+            try:
+                replaced = path.stat().st_size
+            except FileNotFoundError:
+                replaced = 0
+
+            os.replace(temp_path, path)
+        except BaseException:
+            Path(temp_path).unlink(missing_ok=True)
+            raise
+
+        self._add_usage(len(body) - replaced)
+
+    def disk_usage(self) -> int:
+        return sum(size for _, _, size in self._entries())
+
+    def _add_usage(self, delta: int | None) -> None:
+        # Every process adds its writes to one shared total, so N writers cannot
+        # each fill the budget. None rescans the directory instead.
+        fd = os.open(self._usage_path, os.O_RDWR | os.O_CREAT)
+
+        with os.fdopen(fd, "r+") as usage_file:
+            fcntl.flock(usage_file, fcntl.LOCK_EX)
+            recorded = usage_file.read()
+
+            if delta is None or not recorded:
+                usage = self.disk_usage()
+            else:
+                usage = int(recorded) + delta
+
+            if usage > self.max_bytes:
+                usage = self._evict()
+
+            usage_file.seek(0)
+            usage_file.truncate()
+            usage_file.write(str(usage))
+
+    def _evict(self) -> int:
+        # Runs under the usage lock, so one process at a time evicts
+        self._remove_stale_temp_files()
+        entries = sorted(self._entries(), key=lambda entry: entry[1])
+        total = sum(size for _, _, size in entries)
+        target = int(self.max_bytes * _EVICT_TO_RATIO)
+
+        for path, _, size in entries:
+            if total <= target:
+                break
+
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                continue
+
+            total -= size
+            self.stats.evictions += 1
+            self.stats.evicted_bytes += size
+
+        logger.debug("Evicted disk cache down to %d bytes", total)
+        return total
+
+    def _remove_stale_temp_files(self) -> None:
+        # Recent temp files may still be written by another process
+        cutoff = time.time() - _STALE_TEMP_SECONDS
+
+        for path in self.directory.glob(f"*/{_TEMP_PREFIX}*"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+            except FileNotFoundError:
+                continue
+
+    def _entries(self) -> list[tuple[Path, float, int]]:
+        entries = []
+
+        for path in self.directory.glob("*/*"):
+            if path.name.startswith(_TEMP_PREFIX):
+                continue
+
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+
+            entries.append((path, stat.st_mtime, stat.st_size))
+
+        return entries
+
+    def _path(self, key: str) -> Path:
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        return self.directory / digest[:2] / digest
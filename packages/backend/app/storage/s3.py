@@ -0,0 +1,174 @@
+import asyncio
+import gzip
+import json
+from collections.abc import AsyncIterator
+from contextlib import AsyncExitStack
+from typing import Any
+
+import aioboto3
+from aiobotocore.config import AioConfig
+from botocore.exceptions import ClientError
+
+from app.config import settings
+from app.storage.disk_cache import DiskCache
+
+# Also written as user metadata, which survives proxies that drop Content-Encoding
+_ENCODING_METADATA_KEY = "encoding"
+# Disk cache entries are the stored bytes behind a one-byte encoding flag. The
+# key prefix keeps entries written before the flag, which were decoded, unread.
+_DISK_CACHE_PREFIX = "raw:"
+_GZIP_FLAG = b"g"
+_PLAIN_FLAG = b"p"
+
+
+class S3Service:
+    """Reads and writes raw replay JSON objects in the configured bucket."""
+
+    def __init__(self) -> None:
+        self._session = aioboto3.Session(
+            aws_access_key_id=settings.AWS_ACCESS_KEY_ID or None,
+            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY or None,
+            region_name=settings.AWS_S3_REGION or None,
+        )
+        self._config = AioConfig(
+            max_pool_connections=settings.AWS_S3_MAX_POOL_CONNECTIONS,
+            connect_timeout=settings.AWS_S3_CONNECT_TIMEOUT_SECONDS,
+            read_timeout=settings.AWS_S3_READ_TIMEOUT_SECONDS,
+            retries={"max_attempts": 3, "mode": "adaptive"},
+        )
+        self._exit_stack: AsyncExitStack | None = None
+        self._client: Any = None
+        self._start_lock = asyncio.Lock()
+        # Objects are never overwritten once written, so cached copies stay valid
+        self.disk_cache = (
+            DiskCache(settings.S3_DISK_CACHE_DIR, settings.S3_DISK_CACHE_MAX_BYTES)
+            if settings.S3_DISK_CACHE_DIR
+            else None
+        )
+
+    async def start(self) -> None:
+        """Open the shared client; its connection pool is reused by every call."""
+        async with self._start_lock:
+            if self._client is not None:
+                return
+
+            exit_stack = AsyncExitStack()
+            self._client = await exit_stack.enter_async_context(
+                self._session.client("s3", config=self._config)
+            )
+            self._exit_stack = exit_stack
+
+    async def close(self) -> None:
+        if self._exit_stack is not None:
+            await self._exit_stack.aclose()
+
+        self._exit_stack = None
+        self._client = None
+
+    async def get_json(self, key: str) -> dict[str, Any]:
+        data: dict[str, Any] = json.loads(await self._read(key))
+        return data
+
+    async def get_bytes(self, key: str) -> bytes | None:
+        """Return an object's decoded body, or None if there is no such object."""
+        try:
+            return await self._read(key)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("NoSuchKey", "404"):
+                return None
+            raise
+
+    async def get_many(self, keys: list[str]) -> AsyncIterator[tuple[str, bytes]]:
+        """Download objects concurrently, yielding each raw body as it arrives."""
+        # A slot is held from the start of a download until the consumer asks
+        # for the next body, so a slow consumer stalls downloads instead of
+        # letting finished bodies pile up in memory
+        slots = asyncio.Semaphore(settings.AWS_S3_MAX_CONCURRENT_DOWNLOADS)
+
+        async def fetch(key: str) -> tuple[str, bytes]:
+            await slots.acquire()
+            return key, await self._read(key)
+
+        tasks = [asyncio.create_task(fetch(key)) for key in keys]
+
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+                slots.release()
+        finally:
+            # A consumer that stops early or fails leaves no downloads running
+            for task in tasks:
+                task.cancel()
+
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def put_json(
+        self, key: str, data: dict[str, Any], compress: bool = False
+    ) -> None:
+        body = json.dumps(data).encode()
+        extra_args: dict[str, Any] = {}
+
+        if compress:
+            body = gzip.compress(body, compresslevel=settings.AWS_S3_GZIP_LEVEL)
+            extra_args["ContentEncoding"] = "gzip"
+            extra_args["Metadata"] = {_ENCODING_METADATA_KEY: "gzip"}
+
+        client = await self._get_client()
+        await client.put_object(
+            Bucket=settings.AWS_S3_BUCKET,
+            Key=key,
+            Body=body,
+            ContentType="application/json",
+            **extra_args,
+        )
+
+    async def put_bytes(self, key: str, body: bytes, content_type: str) -> None:
+        client = await self._get_client()
+        await client.put_object(
+            Bucket=settings.AWS_S3_BUCKET, Key=key, Body=body, ContentType=content_type
+        )
+
+    async def _read(self, key: str) -> bytes:
+        body, is_gzipped = await self._read_stored(key)
+
+        # Objects written before compression was enabled are read as they are
+        return gzip.decompress(body) if is_gzipped else body
+
+    async def _read_stored(self, key: str) -> tuple[bytes, bool]:
+        # Compressed objects stay compressed on disk and are decoded per read
+        cache_key = _DISK_CACHE_PREFIX + key
+
+        if self.disk_cache is not None:
+            cached = await asyncio.to_thread(self.disk_cache.get, cache_key)
+
+            if cached is not None:
+                return cached[1:], cached[:1] == _GZIP_FLAG
+
+        client = await self._get_client()
+        response = await client.get_object(Bucket=settings.AWS_S3_BUCKET, Key=key)
+        body: bytes = await response["Body"].read()
+        is_gzipped = _is_gzipped(response)
+
+        if self.disk_cache is not None:
+            flag = _GZIP_FLAG if is_gzipped else _PLAIN_FLAG
+            await asyncio.to_thread(self.disk_cache.put, cache_key, flag + body)
+
+        return body, is_gzipped
+
+    async def _get_client(self) -> Any:
+        # Workers have no lifespan, so the first call opens the client
+        if self._client is None:
+            await self.start()
+
+        return self._client
+
+
+def _is_gzipped(response: dict[str, Any]) -> bool:
+    metadata = response.get("Metadata") or {}
+    return (
+        response.get("ContentEncoding") == "gzip"
+        or metadata.get(_ENCODING_METADATA_KEY) == "gzip"
+    )
+
+
+s3_service = S3Service()
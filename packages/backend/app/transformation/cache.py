@@ -0,0 +1,61 @@
+import asyncio
+import hashlib
+import json
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from redis.asyncio import Redis
+
+from app.config import settings
+from app.db.leases import acquire_lease, hold_lease
+
+_LOCK_TTL_MS = 120_000
+_POLL_INTERVAL_SECONDS = 0.1
+
+
+def results_cache_key(s3_keys: list[str], transformer_version: str) -> str:
+    """Key results by their inputs so identical URL sets share one entry."""
+    digest = hashlib.sha256(
+        "\n".join([transformer_version, *sorted(set(s3_keys))]).encode()
+    ).hexdigest()
+    return f"results:{digest}"
+
+
+async def get_or_compute(
+    redis: Redis,
+    key: str,
+    compute: Callable[[], Awaitable[dict[str, Any]]],
+) -> dict[str, Any]:
+    """Return the cached value, letting only one caller compute a cold key."""
+    cached = await redis.get(key)
+
+    if cached is not None:
+        return _loads(cached)
+
+    lock_key = f"{key}:lock"
+
+    # A holder that dies stops renewing, so its lock expires and a waiter takes it
+    while (token := await acquire_lease(redis, lock_key, _LOCK_TTL_MS)) is None:
+        await asyncio.sleep(_POLL_INTERVAL_SECONDS)
+
+        cached = await redis.get(key)
+
+        if cached is not None:
+            return _loads(cached)
+
+    # Renewed, so waiters keep waiting however long the transform takes
+    async with hold_lease(redis, lock_key, token, _LOCK_TTL_MS):
+        # The previous holder may have filled the key just before releasing
+        cached = await redis.get(key)
+
+        if cached is not None:
+            return _loads(cached)
+
+        value = await compute()
+        await redis.set(key, json.dumps(value), ex=settings.RESULTS_CACHE_TTL_SECONDS)
+        return value
+
+
+def _loads(payload: str) -> dict[str, Any]:
+    value: dict[str, Any] = json.loads(payload)
+    return value
@@ -0,0 +1,73 @@
+import logging
+from typing import Any
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class DeckTypeModelError(Exception):
+    pass
+
+
+class DeckTypeClassifier:
+    """Predicts deck types for many card lists with one model call."""
+
+    def __init__(self, label_encoder: Any, vectorizer: Any, model: Any) -> None:
+        self.label_encoder = label_encoder
+        self.vectorizer = vectorizer
+        self.model = model
+
+    def predict_many(
+        self, card_lists: list[list[dict[str, Any]]]
+    ) -> list[tuple[str | None, float | None]]:
+        """Return (deck_type, confidence) for each card list, in order."""
+        if not card_lists:
+            return []
+
+        # Repeat card_name by card_amount, then concat by "|" separator
+        cards_strs = [
+            "|".join(
+                card["card_name"]
+                for card in cards
+                for _ in range(int(card["card_amount"]))
+            )
+            for cards in card_lists
+        ]
+
+        # Labels come from the probabilities, so predict() is never needed
+        probabilities = self.model.predict_proba(self.vectorizer.transform(cards_strs))
+        predictions = self.model.classes_[probabilities.argmax(axis=1)]
+        deck_types = self.label_encoder.inverse_transform(predictions)
+        confidences = probabilities.max(axis=1)
+
+        return [
+            (str(deck_type), round(float(confidence), 4))
+            for deck_type, confidence in zip(deck_types, confidences)
+        ]
+
+
+def load_deck_type_classifier() -> DeckTypeClassifier | None:
+    """Load the deck type model artifacts, or None when they aren't configured."""
+    paths = (
+        settings.DECK_TYPE_LABEL_ENCODER_PATH,
+        settings.DECK_TYPE_VECTORIZER_PATH,
+        settings.DECK_TYPE_MODEL_PATH,
+    )
+
+    if not all(paths):
+        logger.info("Deck type model not configured, skipping deck predictions")
+        return None
+
+    # Optional: only deployments that configure the model install its stack
+    try:
+        import joblib
+
+        label_encoder, vectorizer, model = (joblib.load(path) for path in paths)
+    except ImportError as e:
+        raise DeckTypeModelError(
+            f"DECK_TYPE_* paths are set but {e.name or 'a dependency'} is not "
+            "installed; install joblib and scikit-learn or unset the paths"
+        ) from e
+
+    return DeckTypeClassifier(label_encoder, vectorizer, model)
@@ -0,0 +1,352 @@
+import json
+import logging
+import re
+from typing import Any
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+CARD_NAME_PATTERN = r'"([^"]*)"'
+DECK_ADD_PHRASES = ("Drew", "from Deck", "from top of deck")
+DECK_RETURN_PHRASES = ("to top of deck", "to bottom of deck")
+DEFEAT_LOGS = ["Admitted defeat", "Lost Duel"]
+
+_json_decoder = json.JSONDecoder()
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+# Bump whenever create_plays_df's output changes, so cached plays tables are
+# re-parsed from the raw replay instead of reused
+PARSER_VERSION = "1"
+
+
+def parse_replay(replay_data: dict[str, Any]) -> pd.DataFrame | None:
+    """Parse replay data and return a DataFrame of game results."""
+    plays_df = create_replay_plays_df(replay_data)
+
+    if plays_df is None:
+        return None
+
+    return parse_plays_df(plays_df)
+
+
+def create_replay_plays_df(replay_data: dict[str, Any]) -> pd.DataFrame | None:
+    """Flatten a replay into its plays table, keeping its date and players in attrs."""
+    if not validate_replay_data(replay_data):
+        return None
+
+    return _with_replay_attrs(create_plays_df(replay_data), replay_data)
+
+
+def stream_replay_plays_df(body: bytes | str) -> pd.DataFrame | None:
+    """Build create_replay_plays_df's table from raw JSON, one play at a time."""
+    text = body.decode() if isinstance(body, bytes) else body
+    pos = _skip_whitespace(text, 0)
+
+    if not text.startswith("{", pos):
+        # Not a replay object; let the regular path log why it is rejected
+        return create_replay_plays_df(json.loads(text))
+
+    fields: dict[str, Any] = {}
+    columns: _PlayColumns | None = None
+    pos = _skip_whitespace(text, pos + 1)
+    more = not text.startswith("}", pos)
+
+    while more:
+        key, pos = _json_decoder.raw_decode(text, pos)
+
+        if not isinstance(key, str):
+            raise json.JSONDecodeError("Expecting property name", text, pos)
+
+        pos = _skip_whitespace(text, _expect(text, pos, ":"))
+
+        if key == "plays":
+            # A repeated key replaces the earlier value, as it does in json.loads
+            columns = _PlayColumns()
+            pos = _stream_plays(text, pos, columns)
+        elif key in ("date", "player1", "player2"):
+            fields[key], pos = _json_decoder.raw_decode(text, pos)
+        else:
+            _, pos = _json_decoder.raw_decode(text, pos)
+
+        pos = _skip_whitespace(text, pos)
+        more = text.startswith(",", pos)
+
+        if more:
+            pos = _skip_whitespace(text, pos + 1)
+
+    pos = _skip_whitespace(text, _expect(text, pos, "}"))
+
+    if pos != len(text):
+        raise json.JSONDecodeError("Extra data", text, pos)
+
+    if columns is None:
+        logger.warning("replay_data does not contain plays key")
+        return None
+
+    return _with_replay_attrs(_finish_plays_df(columns.to_frame()), fields)
+
+
+def parse_plays_df(plays_df: pd.DataFrame) -> pd.DataFrame:
+    """Build the games table from a plays table made by create_replay_plays_df."""
+    played_at = pd.to_datetime(plays_df.attrs["played_at"])
+    player1 = plays_df.attrs["player1"]
+    player2 = plays_df.attrs["player2"]
+
+    return create_games_df(played_at, player1, player2, add_play_features(plays_df))
+
+
+def validate_replay_data(replay_data: Any) -> bool:
+    if not isinstance(replay_data, dict):
+        logger.warning("replay_data is not a dict")
+        return False
+
+    if "plays" not in replay_data:
+        logger.warning("replay_data does not contain plays key")
+        return False
+
+    return True
+
+
+def create_plays_df(replay_data: dict[str, Any]) -> pd.DataFrame:
+    """Flatten the replay's plays log into one row per log entry."""
+    plays = []
+
+    for play in replay_data["plays"]:
+        base = {
+            "seconds": play.get("seconds"),
+            "play": play.get("play"),
+            "owner": play.get("owner"),
+        }
+
+        logs = play.get("log")
+
+        if isinstance(logs, list):
+            for log in logs:
+                plays.append({**base, **log})
+        elif isinstance(logs, dict):
+            plays.append({**base, **logs})
+
+    return _finish_plays_df(pd.json_normalize(plays))
+
+
+class _PlayColumns:
+    """Column buffers laid out as pd.json_normalize lays out the same rows."""
+
+    def __init__(self) -> None:
+        self.columns: dict[str, list[Any]] = {}
+        self.rows = 0
+
+    def add_play(self, play: dict[str, Any]) -> None:
+        base = {
+            "seconds": play.get("seconds"),
+            "play": play.get("play"),
+            "owner": play.get("owner"),
+        }
+
+        logs = play.get("log")
+
+        if isinstance(logs, list):
+            for log in logs:
+                self._add_row({**base, **log})
+        elif isinstance(logs, dict):
+            self._add_row({**base, **logs})
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.columns)
+
+    def _add_row(self, row: dict[str, Any]) -> None:
+        for name, value in _flatten(row):
+            if name not in self.columns:
+                # Earlier rows lack this key, which json_normalize fills with NaN
+                self.columns[name] = [float("nan")] * self.rows
+
+            self.columns[name].append(value)
+
+        self.rows += 1
+
+        for column in self.columns.values():
+            if len(column) < self.rows:
+                column.append(float("nan"))
+
+
+def _flatten(row: dict[str, Any], prefix: str = "") -> list[tuple[str, Any]]:
+    """Nested dicts become dotted columns, matching pd.json_normalize."""
+    flat = []
+
+    for key, value in row.items():
+        name = f"{prefix}{key}"
+
+        if isinstance(value, dict):
+            flat.extend(_flatten(value, f"{name}."))
+        else:
+            flat.append((name, value))
+
+    return flat
+
+
+def _stream_plays(text: str, pos: int, columns: _PlayColumns) -> int:
+    """Feed the plays array starting at pos into columns, returning its end."""
+    if not text.startswith("[", pos):
+        plays, pos = _json_decoder.raw_decode(text, pos)
+
+        for play in plays:
+            columns.add_play(play)
+
+        return pos
+
+    pos = _skip_whitespace(text, pos + 1)
+
+    if text.startswith("]", pos):
+        return pos + 1
+
+    while True:
+        play, pos = _json_decoder.raw_decode(text, pos)
+        columns.add_play(play)
+        pos = _skip_whitespace(text, pos)
+
+        if not text.startswith(",", pos):
+            return _expect(text, pos, "]")
+
+        pos = _skip_whitespace(text, pos + 1)
+
+
+def _skip_whitespace(text: str, pos: int) -> int:
+    match = _WHITESPACE.match(text, pos)
+    assert match is not None
+    return match.end()
+
+
+def _expect(text: str, pos: int, char: str) -> int:
+    if not text.startswith(char, pos):
+        raise json.JSONDecodeError(f"Expecting '{char}'", text, pos)
+
+    return pos + 1
+
+
+def _finish_plays_df(plays_df: pd.DataFrame) -> pd.DataFrame:
+    return plays_df.assign(username=lambda df: df["owner"].fillna(df["username"])).drop(
+        columns="owner"
+    )
+
+
+def _with_replay_attrs(
+    plays_df: pd.DataFrame, replay_data: dict[str, Any]
+) -> pd.DataFrame:
+    plays_df.attrs = {
+        "played_at": replay_data.get("date"),
+        "player1": replay_data["player1"]["username"],
+        "player2": replay_data["player2"]["username"],
+    }
+    return plays_df
+
+
+def add_play_features(plays_df: pd.DataFrame) -> pd.DataFrame:
+    """Add card_name, deck_change and game_number with column-wide operations."""
+    private_log = _log_text(plays_df, "private_log")
+    public_log = _log_text(plays_df, "public_log")
+
+    # First quoted name wins, private log before public, never for chat messages
+    card_name = (
+        private_log.str.extract(CARD_NAME_PATTERN, expand=False)
+        .fillna(public_log.str.extract(CARD_NAME_PATTERN, expand=False))
+        .mask(plays_df["play"] == "Duel message")
+    )
+
+    is_added = _contains_any(private_log, DECK_ADD_PHRASES) | _contains_any(
+        public_log, DECK_ADD_PHRASES
+    )
+    is_returned = _contains_any(private_log, DECK_RETURN_PHRASES) | _contains_any(
+        public_log, DECK_RETURN_PHRASES
+    )
+
+    return plays_df.assign(
+        card_name=card_name,
+        deck_change=is_added.astype(int) - (is_returned & ~is_added).astype(int),
+        game_number=lambda df: df.public_log.str.contains("Chose to go").cumsum(),
+    )
+
+
+def create_cards_df(plays_df: pd.DataFrame) -> pd.DataFrame:
+    """Create cards_df with cumulative deck changes into a DataFrame."""
+    return (
+        plays_df.dropna(subset="card_name")
+        .assign(
+            cum_deck_change=lambda df: df.groupby(
+                ["game_number", "username", "card_name"]
+            )["deck_change"].cumsum()
+        )
+        .groupby(["game_number", "username", "card_name"])
+        .agg(card_amount=("cum_deck_change", "max"))
+        .reset_index()
+        .query("card_amount > 0")
+    )
+
+
+def create_games_df(
+    played_at: pd.Timestamp,
+    player1: str,
+    player2: str,
+    plays_df: pd.DataFrame,
+) -> pd.DataFrame:
+    """Build one row per game from grouped lookups instead of per-game queries."""
+    games_base = {"played_at": played_at, "player1": player1, "player2": player2}
+    cards_df = create_cards_df(plays_df)
+
+    player_cards = {
+        key: group[["card_name", "card_amount"]].to_dict("records")
+        for key, group in cards_df.groupby(["game_number", "username"])
+    }
+    went_first = _first_username_by_game(plays_df, ["Chose to go first"])
+    went_second = _first_username_by_game(plays_df, ["Chose to go second"])
+    losers = _first_username_by_game(plays_df, DEFEAT_LOGS)
+
+    games_data = []
+
+    game_count = plays_df["game_number"].max()
+
+    for game in range(1, 0 if pd.isna(game_count) else int(game_count) + 1):
+        first_player = went_first.get(game)
+
+        if first_player is None and game in went_second:
+            first_player = player1 if went_second[game] == player2 else player2
+
+        games_data.append(
+            {
+                **games_base,
+                "game_number": game,
+                "game_winner": _get_game_winner(player1, player2, losers.get(game)),
+                "went_first": first_player,
+                "player1_cards": player_cards.get((game, player1), []),
+                "player2_cards": player_cards.get((game, player2), []),
+            }
+        )
+
+    return pd.DataFrame(games_data)
+
+
+def _log_text(plays_df: pd.DataFrame, column: str) -> pd.Series:
+    if column not in plays_df:
+        return pd.Series("", index=plays_df.index)
+
+    return plays_df[column].astype(str)
+
+
+def _contains_any(log_text: pd.Series, phrases: tuple[str, ...]) -> pd.Series:
+    return log_text.str.contains("|".join(map(re.escape, phrases)), regex=True)
+
+
+def _first_username_by_game(plays_df: pd.DataFrame, logs: list[str]) -> dict[Any, str]:
+    matches = plays_df.loc[plays_df["public_log"].isin(logs)]
+    usernames: dict[Any, str] = (
+        matches.groupby("game_number")["username"].first().to_dict()
+    )
+    return usernames
+
+
+def _get_game_winner(player1: str, player2: str, game_loser: str | None) -> str | None:
+    # If there's no game loser, then there's a draw
+    if game_loser is None:
+        return None
+
+    return player1 if game_loser == player2 else player2
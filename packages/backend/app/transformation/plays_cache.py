@@ -0,0 +1,79 @@
+import asyncio
+import io
+import logging
+
+import pandas as pd
+
+from app.config import settings
+from app.storage.s3 import s3_service
+from app.transformation.parser import PARSER_VERSION, stream_replay_plays_df
+
+logger = logging.getLogger(__name__)
+
+PARQUET_CONTENT_TYPE = "application/vnd.apache.parquet"
+
+
+def plays_cache_key(s3_key: str, parser_version: str = PARSER_VERSION) -> str:
+    """Key of a replay's plays table, next to its raw JSON and tagged by parser."""
+    return f"{s3_key.removesuffix('.json')}.plays-v{parser_version}.parquet"
+
+
+async def load_replay_plays(s3_keys: list[str]) -> list[pd.DataFrame | None]:
+    """Return each replay's plays table, in order, parsing raw JSON only once."""
+    if not settings.PLAYS_CACHE_ENABLED:
+        plays_dfs = {}
+
+        # Each body is parsed and dropped as it arrives, while the rest download
+        async for key, body in s3_service.get_many(s3_keys):
+            plays_dfs[key] = await asyncio.to_thread(stream_replay_plays_df, body)
+
+        return [plays_dfs[key] for key in s3_keys]
+
+    downloads = asyncio.Semaphore(settings.AWS_S3_MAX_CONCURRENT_DOWNLOADS)
+
+    async def load(s3_key: str) -> pd.DataFrame | None:
+        async with downloads:
+            return await _load_or_parse(s3_key)
+
+    return list(await asyncio.gather(*(load(key) for key in s3_keys)))
+
+
+async def _load_or_parse(s3_key: str) -> pd.DataFrame | None:
+    cache_key = plays_cache_key(s3_key)
+    cached = await s3_service.get_bytes(cache_key)
+
+    if cached is not None:
+        return await asyncio.to_thread(_from_parquet, cached)
+
+    # First parse under this parser version; older versions' tables are ignored
+    replay = await s3_service.get_bytes(s3_key)
+
+    if replay is None:
+        logger.warning("Raw replay %s is missing", s3_key)
+        return None
+
+    plays_df = await asyncio.to_thread(stream_replay_plays_df, replay)
+
+    if plays_df is None:
+        return None
+
+    try:
+        body = await asyncio.to_thread(_to_parquet, plays_df)
+    except (TypeError, ValueError):
+        # Columns mixing lists and scalars have no Parquet type; parse each time
+        logger.warning("Plays of %s are not storable as Parquet", s3_key)
+        return plays_df
+
+    await s3_service.put_bytes(cache_key, body, PARQUET_CONTENT_TYPE)
+    return plays_df
+
+
+def _to_parquet(plays_df: pd.DataFrame) -> bytes:
+    buffer = io.BytesIO()
+    # attrs, holding the replay's date and players, are kept in the file metadata
+    plays_df.to_parquet(buffer, index=False, compression="zstd")
+    return buffer.getvalue()
+
+
+def _from_parquet(body: bytes) -> pd.DataFrame:
+    return pd.read_parquet(io.BytesIO(body))
@@ -0,0 +1,57 @@
+import asyncio
+from datetime import datetime
+from typing import Any
+
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import Job
+from app.scraping.replays import get_scraped_s3_keys
+from app.storage.s3 import s3_service
+from app.transformation.cache import get_or_compute, results_cache_key
+from app.transformation.plays_cache import load_replay_plays
+from app.transformation.service import TRANSFORMER_VERSION, transformation_service
+
+
+async def get_job_results_payload(
+    db: AsyncSession, redis: Redis, job: Job
+) -> dict[str, Any]:
+    """Return summary, detailed results and generation time for a job."""
+    if job.results_s3_key:
+        return await s3_service.get_json(job.results_s3_key)
+
+    # Reads that beat the artifact share the finalize task's transformation
+    return await _get_or_build_results(redis, await _get_job_s3_keys(db, job))
+
+
+async def materialize_job_results(db: AsyncSession, redis: Redis, job: Job) -> str:
+    """Transform a finished job once and store the compressed result artifact."""
+    s3_keys = await _get_job_s3_keys(db, job)
+    results = await _get_or_build_results(redis, s3_keys)
+    results_s3_key = f"results/{job.id}.json.gz"
+
+    await s3_service.put_json(results_s3_key, results, compress=True)
+
+    job.results_s3_key = results_s3_key
+    await db.commit()
+
+    return results_s3_key
+
+
+async def _get_or_build_results(redis: Redis, s3_keys: list[str]) -> dict[str, Any]:
+    # Under the results cache lock, so a job is transformed once however it is read
+    return await get_or_compute(
+        redis,
+        results_cache_key(s3_keys, TRANSFORMER_VERSION),
+        lambda: _build_results(s3_keys),
+    )
+
+
+async def _build_results(s3_keys: list[str]) -> dict[str, Any]:
+    plays_dfs = await load_replay_plays(s3_keys)
+    results = await asyncio.to_thread(transformation_service.transform_plays, plays_dfs)
+    return {**results, "generated_at": datetime.utcnow().isoformat()}
+
+
+async def _get_job_s3_keys(db: AsyncSession, job: Job) -> list[str]:
+    return sorted(set((await get_scraped_s3_keys(db, job.urls)).values()))
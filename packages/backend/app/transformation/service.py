@@ -0,0 +1,115 @@
+import logging
+from typing import Any
+
+import pandas as pd
+
+from app.transformation.deck_types import DeckTypeClassifier, load_deck_type_classifier
+from app.transformation.parser import create_replay_plays_df, parse_plays_df
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the results payload changes so cached results are not reused
+TRANSFORMER_VERSION = "2"
+
+
+class TransformationService:
+    """Turns a job's raw replay JSONs into the results payload."""
+
+    def __init__(self, deck_type_classifier: DeckTypeClassifier | None = None) -> None:
+        self.deck_type_classifier = deck_type_classifier
+
+    def transform_individual_results(
+        self, replays: list[dict[str, Any]]
+    ) -> dict[str, Any]:
+        return self.transform_plays(
+            [create_replay_plays_df(replay) for replay in replays]
+        )
+
+    def transform_plays(self, plays_dfs: list[pd.DataFrame | None]) -> dict[str, Any]:
+        """Build the results payload from each replay's plays table, None if invalid."""
+        games_dfs = []
+
+        for plays_df in plays_dfs:
+            if plays_df is None:
+                logger.error("Replay failed to parse, skipping it")
+                continue
+
+            games_dfs.append(parse_plays_df(plays_df))
+
+        games = self._add_deck_types(
+            pd.concat(games_dfs, ignore_index=True) if games_dfs else pd.DataFrame()
+        )
+
+        return {
+            "summary": {
+                "total_replays": len(plays_dfs),
+                "parsed_replays": len(games_dfs),
+                "total_games": len(games),
+                "players": _summarize_players(games),
+            },
+            "detailed_results": {"games": _games_to_records(games)},
+        }
+
+    def _add_deck_types(self, games: pd.DataFrame) -> pd.DataFrame:
+        """Predict every player-game deck type in the job with one model call."""
+        if games.empty or not self.deck_type_classifier:
+            return games
+
+        # Rows are all player1 card lists followed by all player2 card lists
+        card_lists = games["player1_cards"].tolist() + games["player2_cards"].tolist()
+        deck_types, confidences = zip(
+            *self.deck_type_classifier.predict_many(card_lists)
+        )
+        game_count = len(games)
+
+        return games.assign(
+            player1_deck_type=deck_types[:game_count],
+            player1_deck_type_confidence=confidences[:game_count],
+            player2_deck_type=deck_types[game_count:],
+            player2_deck_type_confidence=confidences[game_count:],
+        )
+
+
+def _summarize_players(games: pd.DataFrame) -> dict[str, dict[str, int]]:
+    """Count games, wins, losses and draws per player across all games."""
+    if games.empty:
+        return {}
+
+    appearances = pd.concat(
+        [
+            games[[seat, "game_winner"]].rename(columns={seat: "player"})
+            for seat in ("player1", "player2")
+        ],
+        ignore_index=True,
+    )
+    is_draw = appearances["game_winner"].isna()
+    is_win = appearances["player"] == appearances["game_winner"]
+
+    records = (
+        appearances.assign(
+            games=1,
+            wins=is_win.astype(int),
+            losses=(~is_win & ~is_draw).astype(int),
+            draws=is_draw.astype(int),
+        )
+        .groupby("player")[["games", "wins", "losses", "draws"]]
+        .sum()
+    )
+
+    return {
+        player: {stat: int(value) for stat, value in row.items()}
+        for player, row in records.iterrows()
+    }
+
+
+def _games_to_records(games: pd.DataFrame) -> list[dict[str, Any]]:
+    if games.empty:
+        return []
+
+    records: list[dict[str, Any]] = games.assign(
+        played_at=games["played_at"].map(lambda value: value.isoformat())
+    ).to_dict("records")
+    return records
+
+
+transformation_service = TransformationService(load_deck_type_classifier())
@@ -0,0 +1,116 @@
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager, suppress
+from uuid import UUID
+
+from redis.asyncio import Redis
+
+from app.config import settings
+from app.worker.celery_app import celery_app
+from app.worker.scheduler import release_unstarted
+
+_STATE_TTL_SECONDS = 60 * 60 * 24
+_DURATION_KEY = "scrape:duration_ewma"
+_DURATION_SMOOTHING = 0.1
+
+# Folds one scrape duration into the shared moving average
+_RECORD_DURATION_SCRIPT = """
+local current = tonumber(redis.call("GET", KEYS[1]))
+local sample = tonumber(ARGV[1])
+
+if current then
+    sample = current + tonumber(ARGV[2]) * (sample - current)
+end
+
+redis.call("SET", KEYS[1], sample)
+"""
+
+
+def _cancel_key(job_id: UUID) -> str:
+    return f"job_cancel:{job_id}"
+
+
+def _tasks_key(job_id: UUID) -> str:
+    return f"job_cancel:{job_id}:tasks"
+
+
+async def register_job_tasks(redis: Redis, job_id: UUID, task_ids: list[str]) -> bool:
+    """Record a job's task IDs before dispatch; False if it was cancelled already."""
+    key = _tasks_key(job_id)
+
+    async with redis.pipeline(transaction=True) as pipe:
+        pipe.sadd(key, *task_ids)
+        pipe.expire(key, _STATE_TTL_SECONDS)
+        await pipe.execute()
+
+    # Checked after registering, so a concurrent cancel either sees the IDs or
+    # the orchestrator sees the flag
+    return not await is_job_cancelled(redis, job_id)
+
+
+async def cancel_job_tasks(redis: Redis, job_id: UUID) -> int:
+    """Flag the job as cancelled and revoke its dispatched scrape tasks."""
+    await redis.set(_cancel_key(job_id), "1", ex=_STATE_TTL_SECONDS)
+    task_ids = list(await redis.smembers(_tasks_key(job_id)))  # type: ignore[misc]
+
+    if task_ids:
+        # Revoking is a blocking broker call
+        await asyncio.to_thread(celery_app.control.revoke, task_ids)
+        # Revoked tasks never run, so their dispatch slots are freed here.
+        # Scrapes that already started free their own when they exit.
+        await release_unstarted(redis, task_ids)
+
+    return len(task_ids)
+
+
+async def is_job_cancelled(redis: Redis, job_id: UUID) -> bool:
+    return bool(await redis.exists(_cancel_key(job_id)))
+
+
+@asynccontextmanager
+async def watch_job_cancellation(
+    redis: Redis, job_id: UUID | None
+) -> AsyncIterator[asyncio.Event]:
+    """Yield an event that is set once the job's cancel flag appears."""
+    cancelled = asyncio.Event()
+
+    if job_id is None:
+        yield cancelled
+        return
+
+    async def poll() -> None:
+        while not await is_job_cancelled(redis, job_id):
+            await asyncio.sleep(settings.SCRAPE_CANCEL_POLL_SECONDS)
+
+        cancelled.set()
+
+    watcher = asyncio.create_task(poll())
+
+    try:
+        yield cancelled
+    finally:
+        watcher.cancel()
+
+        with suppress(asyncio.CancelledError):
+            await watcher
+
+
+async def record_scrape_duration(redis: Redis, seconds: float) -> None:
+    await redis.eval(  # type: ignore[misc]
+        _RECORD_DURATION_SCRIPT,
+        1,
+        _DURATION_KEY,
+        str(seconds),
+        str(_DURATION_SMOOTHING),
+    )
+
+
+async def estimate_scrape_seconds(redis: Redis, remaining_urls: int) -> float:
+    """Estimate how long the remaining URLs would have taken to scrape."""
+    average = await redis.get(_DURATION_KEY)
+    seconds_per_url = (
+        float(average)
+        if average is not None
+        else settings.SCRAPE_DURATION_ESTIMATE_SECONDS
+    )
+    return max(remaining_urls, 0) * seconds_per_url
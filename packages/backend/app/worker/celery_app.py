@@ -0,0 +1,124 @@
+import asyncio
+import logging
+import threading
+from collections.abc import Coroutine
+from typing import Any, TypeVar
+
+from celery import Celery
+from celery.signals import (
+    task_postrun,
+    task_prerun,
+    worker_process_init,
+    worker_process_shutdown,
+)
+
+from app.config import settings
+from app.logging import setup_logging
+from app.scraping.browser_pool import browser_pool
+from app.storage.s3 import s3_service
+
+T = TypeVar("T")
+
+setup_logging()
+logger = logging.getLogger(__name__)
+
+celery_app = Celery(
+    "duel_insights",
+    broker=settings.CELERY_BROKER_URL,
+    backend=settings.CELERY_RESULT_BACKEND,
+    include=["app.worker.tasks"],
+)
+
+celery_app.conf.update(
+    task_serializer="json",
+    accept_content=["json"],
+    result_serializer="json",
+    result_expires=3600,
+    task_acks_late=True,
+    worker_prefetch_multiplier=1,
+    timezone="UTC",
+    beat_schedule={
+        "flush-job-progress": {
+            "task": "flush_job_progress",
+            "schedule": settings.PROGRESS_FLUSH_INTERVAL_SECONDS,
+        },
+        "dispatch-scrapes": {
+            "task": "dispatch_scrapes",
+            "schedule": settings.SCRAPE_DISPATCH_INTERVAL_SECONDS,
+        },
+    },
+)
+
+_loop: asyncio.AbstractEventLoop | None = None
+# Held while any thread drives the loop, so the reaper never runs it concurrently
+_loop_lock = threading.Lock()
+_reaper: threading.Timer | None = None
+_REAPER_DELAY_SECONDS = 1.0
+
+
+def run_async(coro: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine on the worker process's long-lived event loop."""
+    with _loop_lock:
+        return _run_on_loop(coro)
+
+
+def _run_on_loop(coro: Coroutine[Any, Any, T]) -> T:
+    global _loop
+
+    # One loop per process keeps pooled async clients valid across tasks
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_loop)
+
+    return _loop.run_until_complete(coro)
+
+
+@worker_process_init.connect
+def start_browser_pool(**kwargs: Any) -> None:
+    run_async(browser_pool.start())
+
+
+@task_prerun.connect
+def reap_idle_browser_sessions(**kwargs: Any) -> None:
+    _cancel_reaper()
+    run_async(browser_pool.reap_idle())
+
+
+@task_postrun.connect
+def schedule_idle_browser_reaper(**kwargs: Any) -> None:
+    # The loop only runs during tasks, so an idle worker closes its sessions
+    # from a timer, before their proxy leases lapse
+    global _reaper
+
+    _cancel_reaper()
+    _reaper = threading.Timer(
+        browser_pool.idle_timeout_seconds + _REAPER_DELAY_SECONDS,
+        _reap_idle_in_background,
+    )
+    _reaper.daemon = True
+    _reaper.start()
+
+
+def _reap_idle_in_background() -> None:
+    # A task driving the loop reaps on its own and re-arms the timer when done
+    if not _loop_lock.acquire(blocking=False):
+        return
+
+    try:
+        _run_on_loop(browser_pool.reap_idle())
+    except Exception:
+        logger.warning("Failed to reap idle browser sessions", exc_info=True)
+    finally:
+        _loop_lock.release()
+
+
+def _cancel_reaper() -> None:
+    if _reaper is not None:
+        _reaper.cancel()
+
+
+@worker_process_shutdown.connect
+def close_worker_clients(**kwargs: Any) -> None:
+    _cancel_reaper()
+    run_async(browser_pool.close())
+    run_async(s3_service.close())
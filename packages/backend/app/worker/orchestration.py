@@ -0,0 +1,123 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import cast
+from uuid import UUID
+
+from sqlalchemy import Table, bindparam, case, literal, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import Job, JobStatus, JobType
+from app.scraping.replays import get_scraped_s3_keys
+from app.worker.progress import CounterUpdate, job_progress
+
+
+@dataclass
+class StartedJob:
+    user_id: UUID
+    job_type: JobType
+    total_urls: int
+    processed_urls: int
+    pending_urls: list[str]
+
+
+async def start_job(db: AsyncSession, job_id: UUID) -> StartedJob | None:
+    """Move a pending job to running and return the URLs that still need scraping."""
+    # Only one orchestrator can claim the job, so its URLs are fanned out once
+    result = await db.execute(
+        update(Job)
+        .where(Job.id == job_id, Job.status == JobStatus.PENDING)
+        .values(status=JobStatus.RUNNING, started_at=datetime.utcnow())
+        .returning(Job.user_id, Job.job_type, Job.urls)
+    )
+    row = result.one_or_none()
+
+    if row is None:
+        await db.commit()
+        return None
+
+    cached_s3_keys = await get_scraped_s3_keys(db, row.urls)
+    pending_urls = [url for url in row.urls if url not in cached_s3_keys]
+    processed_urls = len(row.urls) - len(pending_urls)
+
+    await db.execute(
+        update(Job).where(Job.id == job_id).values(processed_urls=processed_urls)
+    )
+    await db.commit()
+
+    return StartedJob(
+        user_id=row.user_id,
+        job_type=row.job_type,
+        total_urls=len(row.urls),
+        processed_urls=processed_urls,
+        pending_urls=pending_urls,
+    )
+
+
+async def complete_job(db: AsyncSession, job_id: UUID, processed_urls: int) -> bool:
+    """Write the final count and mark a running job completed."""
+    result = await db.execute(
+        update(Job)
+        .where(Job.id == job_id, Job.status == JobStatus.RUNNING)
+        .values(
+            status=JobStatus.COMPLETED,
+            processed_urls=processed_urls,
+            completed_at=datetime.utcnow(),
+        )
+        .returning(Job.id)
+    )
+    is_completed = result.scalar_one_or_none() is not None
+    await db.commit()
+    return is_completed
+
+
+async def count_processed_urls(
+    db: AsyncSession, job_id: UUID, count: int
+) -> CounterUpdate | None:
+    """Count URLs in Postgres, completing the job at its total, when Redis has none."""
+    is_done = Job.processed_urls + count >= Job.total_urls
+    # Bound with the column's enum type so it is stored like any other status
+    completed = literal(JobStatus.COMPLETED, type_=Job.status.type)
+    result = await db.execute(
+        update(Job)
+        .where(Job.id == job_id, Job.status == JobStatus.RUNNING)
+        .values(
+            processed_urls=Job.processed_urls + count,
+            status=case((is_done, completed), else_=Job.status),
+            completed_at=case((is_done, datetime.utcnow()), else_=Job.completed_at),
+        )
+        .returning(Job.processed_urls, Job.total_urls, Job.status)
+    )
+    row = result.one_or_none()
+    await db.commit()
+
+    if row is None:
+        return None
+
+    # Only the update that moved the job out of RUNNING sees it completed
+    return CounterUpdate(
+        progress=job_progress(job_id, row.status, row.processed_urls, row.total_urls),
+        is_completer=row.status == JobStatus.COMPLETED,
+    )
+
+
+async def flush_processed_urls(db: AsyncSession, counts: dict[UUID, int]) -> None:
+    """Write many jobs' coalesced counters in one executemany round trip."""
+    if not counts:
+        return
+
+    jobs = cast(Table, Job.__table__)
+    # Counts only move forward, and finished or cancelled jobs are left alone
+    await db.execute(
+        update(jobs)
+        .where(
+            jobs.c.id == bindparam("job_id"),
+            jobs.c.status == JobStatus.RUNNING,
+            jobs.c.processed_urls < bindparam("processed"),
+        )
+        .values(processed_urls=bindparam("processed")),
+        [
+            {"job_id": job_id, "processed": processed}
+            for job_id, processed in counts.items()
+        ],
+    )
+    await db.commit()
@@ -0,0 +1,269 @@
+import json
+from collections.abc import AsyncGenerator
+from dataclasses import dataclass
+from uuid import UUID
+
+from redis.asyncio import Redis
+
+from app.api.jobs.models import JobProgressResponse
+from app.db.models import JobStatus
+
+TERMINAL_STATUSES = {JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED}
+
+_SNAPSHOT_TTL_SECONDS = 60 * 60 * 24
+_DIRTY_JOBS_KEY = "job_progress:dirty"
+
+# Counts processed URLs of a running job and completes it once the total is
+# reached, so exactly one caller sees is_completer = 1. Returns 0 when the
+# counters are gone, expired or lost, and nil when the job is not running.
+_INCREMENT_SCRIPT = """
+local current = redis.call("HGET", KEYS[1], "status")
+
+if not current then
+    return 0
+end
+
+if current ~= ARGV[2] then
+    return nil
+end
+
+local processed = redis.call("HINCRBY", KEYS[1], "processed", ARGV[1])
+local total = tonumber(redis.call("HGET", KEYS[1], "total"))
+local status = ARGV[2]
+local is_completer = 0
+
+if processed >= total then
+    status = ARGV[3]
+    is_completer = 1
+    redis.call("HSET", KEYS[1], "status", status)
+end
+
+redis.call("EXPIRE", KEYS[1], ARGV[4])
+redis.call("SADD", KEYS[2], ARGV[5])
+return {processed, total, status, is_completer}
+"""
+
+
+class JobCountersMissingError(Exception):
+    pass
+
+
+@dataclass
+class CounterUpdate:
+    progress: JobProgressResponse
+    is_completer: bool
+
+
+def progress_channel(job_id: UUID) -> str:
+    return f"job_progress:{job_id}:events"
+
+
+def _snapshot_key(job_id: UUID) -> str:
+    return f"job_progress:{job_id}:snapshot"
+
+
+def _sequence_key(job_id: UUID) -> str:
+    return f"job_progress:{job_id}:seq"
+
+
+def _counters_key(job_id: UUID) -> str:
+    return f"job_progress:{job_id}:counters"
+
+
+def job_progress(
+    job_id: UUID,
+    status: JobStatus,
+    processed: int,
+    total: int,
+    error_message: str | None = None,
+) -> JobProgressResponse:
+    percentage = min(processed / total * 100, 100) if total > 0 else 0
+
+    return JobProgressResponse(
+        job_id=job_id,
+        status=status,
+        processed=processed,
+        total=total,
+        progress_percentage=round(percentage, 2),
+        error_message=error_message,
+    )
+
+
+async def init_job_counters(
+    redis: Redis, job_id: UUID, user_id: UUID, processed: int, total: int
+) -> None:
+    key = _counters_key(job_id)
+
+    async with redis.pipeline(transaction=True) as pipe:
+        pipe.hset(
+            key,
+            mapping={
+                "user_id": str(user_id),
+                "status": JobStatus.RUNNING.value,
+                "processed": processed,
+                "total": total,
+            },
+        )
+        pipe.expire(key, _SNAPSHOT_TTL_SECONDS)
+        await pipe.execute()
+
+
+async def increment_job_counters(
+    redis: Redis, job_id: UUID, count: int = 1
+) -> CounterUpdate | None:
+    """Count processed URLs with HINCRBY; None once the job is no longer running."""
+    result = await redis.eval(  # type: ignore[misc]
+        _INCREMENT_SCRIPT,
+        2,
+        _counters_key(job_id),
+        _DIRTY_JOBS_KEY,
+        str(count),
+        JobStatus.RUNNING.value,
+        JobStatus.COMPLETED.value,
+        str(_SNAPSHOT_TTL_SECONDS),
+        str(job_id),
+    )
+
+    if result is None:
+        return None
+
+    if result == 0:
+        raise JobCountersMissingError(f"No progress counters for job {job_id}")
+
+    processed, total, status, is_completer = result
+    return CounterUpdate(
+        progress=job_progress(job_id, JobStatus(status), processed, total),
+        is_completer=bool(is_completer),
+    )
+
+
+async def get_job_counters(
+    redis: Redis, job_id: UUID, user_id: UUID
+) -> JobProgressResponse | None:
+    counters = await redis.hgetall(_counters_key(job_id))  # type: ignore[misc]
+
+    if not counters or counters.get("user_id") != str(user_id):
+        return None
+
+    return job_progress(
+        job_id,
+        JobStatus(counters["status"]),
+        int(counters["processed"]),
+        int(counters["total"]),
+    )
+
+
+async def clear_job_counters(redis: Redis, job_id: UUID) -> None:
+    await redis.delete(_counters_key(job_id))
+
+
+async def pop_dirty_job_counts(redis: Redis, batch_size: int) -> dict[UUID, int]:
+    """Take up to batch_size jobs with unflushed counters and read their counts."""
+    # Popping first means increments made after this read mark the job again
+    job_ids = await redis.spop(_DIRTY_JOBS_KEY, batch_size)  # type: ignore[misc]
+
+    if not job_ids:
+        return {}
+
+    async with redis.pipeline(transaction=False) as pipe:
+        for job_id in job_ids:
+            pipe.hget(_counters_key(UUID(job_id)), "processed")
+        counts = await pipe.execute()
+
+    return {
+        UUID(job_id): int(processed)
+        for job_id, processed in zip(job_ids, counts, strict=True)
+        if processed is not None
+    }
+
+
+async def publish_job_progress(redis: Redis, progress: JobProgressResponse) -> int:
+    """Store the latest progress snapshot and notify stream subscribers."""
+    seq = int(await redis.incr(_sequence_key(progress.job_id)))
+    payload = json.dumps({"seq": seq, "progress": progress.model_dump(mode="json")})
+
+    async with redis.pipeline(transaction=True) as pipe:
+        pipe.set(_snapshot_key(progress.job_id), payload, ex=_SNAPSHOT_TTL_SECONDS)
+        pipe.expire(_sequence_key(progress.job_id), _SNAPSHOT_TTL_SECONDS)
+        pipe.publish(progress_channel(progress.job_id), payload)
+        await pipe.execute()
+
+    return seq
+
+
+async def get_progress_snapshot(
+    redis: Redis, job_id: UUID
+) -> tuple[int, JobProgressResponse] | None:
+    payload = await redis.get(_snapshot_key(job_id))
+
+    if payload is None:
+        return None
+
+    return _parse_payload(payload)
+
+
+async def stream_progress_events(
+    redis: Redis,
+    initial: JobProgressResponse,
+    last_event_id: int | None = None,
+    heartbeat_seconds: float = 15.0,
+) -> AsyncGenerator[str, None]:
+    """Yield SSE frames for a job until it reaches a terminal status."""
+    pubsub = redis.pubsub()
+    # Subscribe before reading the snapshot so no update falls in between
+    await pubsub.subscribe(progress_channel(initial.job_id))
+
+    try:
+        yield f"retry: {int(heartbeat_seconds * 1000)}\n\n"
+
+        snapshot = await get_progress_snapshot(redis, initial.job_id)
+        seq, progress = snapshot if snapshot else (0, initial)
+        last_sent = last_event_id or 0
+        # A finished job's row beats a running snapshot that nothing will update
+        is_stale = (
+            progress.status not in TERMINAL_STATUSES
+            and initial.status in TERMINAL_STATUSES
+        )
+
+        if is_stale:
+            progress = initial
+
+        if last_event_id is None or seq > last_event_id or is_stale:
+            yield _format_event(seq, progress)
+            last_sent = max(last_sent, seq)
+
+        if progress.status in TERMINAL_STATUSES:
+            return
+
+        while True:
+            message = await pubsub.get_message(
+                ignore_subscribe_messages=True, timeout=heartbeat_seconds
+            )
+
+            if message is None:
+                yield ": heartbeat\n\n"
+                continue
+
+            seq, progress = _parse_payload(message["data"])
+
+            # Skip updates the client already saw before reconnecting
+            if seq <= last_sent:
+                continue
+
+            yield _format_event(seq, progress)
+            last_sent = seq
+
+            if progress.status in TERMINAL_STATUSES:
+                return
+    finally:
+        await pubsub.unsubscribe()
+        await pubsub.aclose()  # type: ignore[no-untyped-call]
+
+
+def _parse_payload(payload: str) -> tuple[int, JobProgressResponse]:
+    data = json.loads(payload)
+    return int(data["seq"]), JobProgressResponse.model_validate(data["progress"])
+
+
+def _format_event(seq: int, progress: JobProgressResponse) -> str:
+    return f"id: {seq}\nevent: progress\ndata: {progress.model_dump_json()}\n\n"
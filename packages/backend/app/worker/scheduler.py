@@ -0,0 +1,307 @@
+import json
+import time
+from dataclasses import dataclass
+from uuid import UUID
+
+from redis.asyncio import Redis
+
+from app.db.models import JobType
+
+# Interactive jobs are always served before bulk ones
+PRIORITY_ORDER = (JobType.INDIVIDUAL, JobType.GFWL)
+
+_IN_FLIGHT_KEY = "scrape_queue:in_flight"
+_STARTED_KEY = "scrape_queue:started"
+_WAIT_USERS_KEY = "scrape_queue:waits:users"
+_WAIT_SAMPLES = 1000
+_USER_WAIT_SAMPLES = 200
+_WAIT_USERS_TRACKED = 100
+_USER_WAIT_TTL_SECONDS = 60 * 60
+_ENQUEUE_BATCH_SIZE = 500
+
+# Appends a user's items to their sub-queue and puts the user on the ring
+_ENQUEUE_SCRIPT = """
+local queue = ARGV[1] .. ":user:" .. ARGV[2]
+redis.call("RPUSH", queue, unpack(ARGV, 3))
+
+if redis.call("SADD", ARGV[1] .. ":members", ARGV[2]) == 1 then
+    redis.call("RPUSH", ARGV[1] .. ":ring", ARGV[2])
+end
+
+return redis.call("LLEN", queue)
+"""
+
+# Deficit round-robin over each job type's users, highest priority type first.
+# Every visited user may take `quantum` items before the ring moves on, and
+# nothing is popped beyond the free in-flight capacity.
+_POP_SCRIPT = """
+local max_in_flight = tonumber(ARGV[1])
+local now = tonumber(ARGV[2])
+local in_flight_ttl = tonumber(ARGV[3])
+local quantum = tonumber(ARGV[4])
+
+redis.call("ZREMRANGEBYSCORE", KEYS[1], "-inf", now)
+local capacity = max_in_flight - redis.call("ZCARD", KEYS[1])
+local items = {}
+
+local function pop_from(prefix)
+    local ring = prefix .. ":ring"
+
+    while true do
+        local user = redis.call("LINDEX", ring, 0)
+
+        if not user then
+            return nil
+        end
+
+        local queue = prefix .. ":user:" .. user
+        local deficits = prefix .. ":deficits"
+        local deficit = tonumber(redis.call("HGET", deficits, user) or "0")
+
+        if deficit <= 0 then
+            deficit = quantum
+        end
+
+        local item = redis.call("LPOP", queue)
+
+        if item then
+            deficit = deficit - 1
+        end
+
+        if redis.call("LLEN", queue) == 0 then
+            redis.call("LPOP", ring)
+            redis.call("SREM", prefix .. ":members", user)
+            redis.call("HDEL", deficits, user)
+        elseif deficit <= 0 then
+            redis.call("LMOVE", ring, ring, "LEFT", "RIGHT")
+            redis.call("HDEL", deficits, user)
+        else
+            redis.call("HSET", deficits, user, deficit)
+        end
+
+        if item then
+            return item
+        end
+    end
+end
+
+for i = 5, #ARGV do
+    while capacity > 0 do
+        local item = pop_from(ARGV[i])
+
+        if not item then
+            break
+        end
+
+        local task_id = cjson.decode(item)["task_id"]
+        redis.call("ZADD", KEYS[1], now + in_flight_ttl, task_id)
+        table.insert(items, item)
+        capacity = capacity - 1
+    end
+end
+
+return items
+"""
+
+
+# Records that a dispatched scrape is running, scored by its in-flight expiry
+_MARK_STARTED_SCRIPT = """
+redis.call("ZREMRANGEBYSCORE", KEYS[1], "-inf", ARGV[1])
+redis.call("ZADD", KEYS[1], tonumber(ARGV[1]) + tonumber(ARGV[2]), ARGV[3])
+"""
+
+# Frees the in-flight slots of scrapes that have not started. Running scrapes
+# keep theirs until they exit, so fairness limits hold right after a cancel.
+_RELEASE_UNSTARTED_SCRIPT = """
+local released = 0
+
+for i = 1, #ARGV do
+    if not redis.call("ZSCORE", KEYS[2], ARGV[i]) then
+        released = released + redis.call("ZREM", KEYS[1], ARGV[i])
+    end
+end
+
+return released
+"""
+
+
+@dataclass
+class ScrapeItem:
+    task_id: str
+    replay_url: str
+    job_id: UUID
+    user_id: UUID
+    job_type: JobType
+    enqueued_at: float
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "task_id": self.task_id,
+                "replay_url": self.replay_url,
+                "job_id": str(self.job_id),
+                "user_id": str(self.user_id),
+                "job_type": self.job_type.value,
+                "enqueued_at": self.enqueued_at,
+            }
+        )
+
+    @classmethod
+    def from_json(cls, payload: str) -> "ScrapeItem":
+        data = json.loads(payload)
+        return cls(
+            task_id=data["task_id"],
+            replay_url=data["replay_url"],
+            job_id=UUID(data["job_id"]),
+            user_id=UUID(data["user_id"]),
+            job_type=JobType(data["job_type"]),
+            enqueued_at=data["enqueued_at"],
+        )
+
+
+@dataclass
+class WaitStats:
+    samples: int
+    p50_seconds: float
+    p95_seconds: float
+
+
+def _queue_prefix(job_type: JobType) -> str:
+    return f"scrape_queue:{job_type.value}"
+
+
+def _job_type_waits_key(job_type: JobType) -> str:
+    return f"scrape_queue:waits:{job_type.value}"
+
+
+def _user_waits_key(user_id: str) -> str:
+    return f"scrape_queue:waits:user:{user_id}"
+
+
+async def enqueue_scrapes(redis: Redis, items: list[ScrapeItem]) -> None:
+    """Append a job's scrapes to its user's sub-queue for fair dispatch."""
+    if not items:
+        return
+
+    first = items[0]
+
+    # Batched to stay within Lua's argument limits on large GFWL jobs
+    for start in range(0, len(items), _ENQUEUE_BATCH_SIZE):
+        await redis.eval(  # type: ignore[misc]
+            _ENQUEUE_SCRIPT,
+            0,
+            _queue_prefix(first.job_type),
+            str(first.user_id),
+            *(item.to_json() for item in items[start : start + _ENQUEUE_BATCH_SIZE]),
+        )
+
+
+async def pop_fair_scrapes(
+    redis: Redis, max_in_flight: int, in_flight_ttl_seconds: float, quantum: int
+) -> list[ScrapeItem]:
+    """Take as many queued scrapes as there is free in-flight capacity."""
+    payloads = await redis.eval(  # type: ignore[misc]
+        _POP_SCRIPT,
+        1,
+        _IN_FLIGHT_KEY,
+        str(max_in_flight),
+        str(time.time()),
+        str(in_flight_ttl_seconds),
+        str(quantum),
+        *(_queue_prefix(job_type) for job_type in PRIORITY_ORDER),
+    )
+    return [ScrapeItem.from_json(payload) for payload in payloads]
+
+
+async def mark_scrape_started(
+    redis: Redis, task_id: str, in_flight_ttl_seconds: float
+) -> None:
+    await redis.eval(  # type: ignore[misc]
+        _MARK_STARTED_SCRIPT,
+        1,
+        _STARTED_KEY,
+        str(time.time()),
+        str(in_flight_ttl_seconds),
+        task_id,
+    )
+
+
+async def release_in_flight(redis: Redis, task_ids: list[str]) -> None:
+    if task_ids:
+        await redis.zrem(_IN_FLIGHT_KEY, *task_ids)
+        await redis.zrem(_STARTED_KEY, *task_ids)
+
+
+async def release_unstarted(redis: Redis, task_ids: list[str]) -> int:
+    """Free the in-flight slots of scrapes that no worker has started yet."""
+    if not task_ids:
+        return 0
+
+    released: int = await redis.eval(  # type: ignore[misc]
+        _RELEASE_UNSTARTED_SCRIPT, 2, _IN_FLIGHT_KEY, _STARTED_KEY, *task_ids
+    )
+    return released
+
+
+async def record_queue_waits(redis: Redis, items: list[ScrapeItem]) -> None:
+    """Keep recent queue wait samples per job type and per user."""
+    now = time.time()
+
+    async with redis.pipeline(transaction=False) as pipe:
+        for item in items:
+            wait = f"{max(now - item.enqueued_at, 0):.3f}"
+            job_type_key = _job_type_waits_key(item.job_type)
+            user_key = _user_waits_key(str(item.user_id))
+
+            pipe.lpush(job_type_key, wait)
+            pipe.ltrim(job_type_key, 0, _WAIT_SAMPLES - 1)
+            pipe.lpush(user_key, wait)
+            pipe.ltrim(user_key, 0, _USER_WAIT_SAMPLES - 1)
+            pipe.expire(user_key, _USER_WAIT_TTL_SECONDS)
+            pipe.zadd(_WAIT_USERS_KEY, {str(item.user_id): now})
+
+        pipe.zremrangebyrank(_WAIT_USERS_KEY, 0, -_WAIT_USERS_TRACKED - 1)
+        await pipe.execute()
+
+
+async def get_queue_wait_stats(
+    redis: Redis,
+) -> tuple[dict[str, WaitStats], dict[str, WaitStats]]:
+    """Return recent wait percentiles by job type and by recently served user."""
+    user_ids = await redis.zrevrange(_WAIT_USERS_KEY, 0, _WAIT_USERS_TRACKED - 1)
+
+    async with redis.pipeline(transaction=False) as pipe:
+        for job_type in PRIORITY_ORDER:
+            pipe.lrange(_job_type_waits_key(job_type), 0, -1)
+        for user_id in user_ids:
+            pipe.lrange(_user_waits_key(user_id), 0, -1)
+        samples = await pipe.execute()
+
+    job_type_samples = samples[: len(PRIORITY_ORDER)]
+    user_samples = samples[len(PRIORITY_ORDER) :]
+
+    by_job_type = {
+        job_type.value: _wait_stats(waits)
+        for job_type, waits in zip(PRIORITY_ORDER, job_type_samples, strict=True)
+        if waits
+    }
+    by_user = {
+        user_id: _wait_stats(waits)
+        for user_id, waits in zip(user_ids, user_samples, strict=True)
+        if waits
+    }
+    return by_job_type, by_user
+
+
+def _wait_stats(waits: list[str]) -> WaitStats:
+    values = sorted(float(wait) for wait in waits)
+    return WaitStats(
+        samples=len(values),
+        p50_seconds=_percentile(values, 0.5),
+        p95_seconds=_percentile(values, 0.95),
+    )
+
+
+def _percentile(values: list[float], quantile: float) -> float:
+    index = min(int(quantile * len(values)), len(values) - 1)
+    return round(values[index], 3)
@@ -0,0 +1,346 @@
+import asyncio
+import logging
+import time
+from uuid import UUID, uuid4
+
+from celery import Task
+
+from app.config import settings
+from app.db.database import get_db_session
+from app.db.models import Job
+from app.db.redis import redis_client
+from app.scraping.circuit_breaker import CircuitOpenError, CircuitState, proxy_breaker
+from app.scraping.extractor import ScrapeCancelledError, replay_extractor
+from app.scraping.replays import (
+    canonical_replay_url,
+    get_replay_id,
+    get_scraped_s3_keys,
+    record_scraped_replay,
+    replay_s3_key,
+)
+from app.scraping.retry import RETRYABLE_ERRORS, retry_delay_seconds
+from app.scraping.single_flight import scrape_replay_once
+from app.storage.s3 import s3_service
+from app.transformation.results import materialize_job_results
+from app.worker.cancellation import (
+    is_job_cancelled,
+    record_scrape_duration,
+    register_job_tasks,
+    watch_job_cancellation,
+)
+from app.worker.celery_app import celery_app, run_async
+from app.worker.orchestration import (
+    complete_job,
+    count_processed_urls,
+    flush_processed_urls,
+    start_job,
+)
+from app.worker.progress import (
+    JobCountersMissingError,
+    increment_job_counters,
+    init_job_counters,
+    pop_dirty_job_counts,
+    publish_job_progress,
+)
+from app.worker.scheduler import (
+    ScrapeItem,
+    enqueue_scrapes,
+    mark_scrape_started,
+    pop_fair_scrapes,
+    record_queue_waits,
+    release_in_flight,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(name="process_individual_job")
+def process_individual_job(job_id: str) -> None:
+    """Queue one scrape per URL of the job that is not cached yet."""
+    run_async(_process_individual_job(UUID(job_id)))
+
+
+async def _process_individual_job(job_id: UUID) -> None:
+    async with get_db_session() as db:
+        started = await start_job(db, job_id)
+
+    if started is None:
+        logger.info("Job %s is no longer pending, skipping", job_id)
+        return
+
+    await init_job_counters(
+        redis_client,
+        job_id,
+        started.user_id,
+        started.processed_urls,
+        started.total_urls,
+    )
+
+    # Every URL was scraped in the meantime, so the job can finish right away
+    if not started.pending_urls:
+        await _record_job_progress(job_id, count=0)
+        return
+
+    # Task IDs are known before dispatch so cancelling can revoke them
+    enqueued_at = time.time()
+    scrapes = [
+        ScrapeItem(
+            task_id=str(uuid4()),
+            replay_url=url,
+            job_id=job_id,
+            user_id=started.user_id,
+            job_type=started.job_type,
+            enqueued_at=enqueued_at,
+        )
+        for url in started.pending_urls
+    ]
+
+    if not await register_job_tasks(
+        redis_client, job_id, [scrape.task_id for scrape in scrapes]
+    ):
+        logger.info("Job %s was cancelled before its scrapes were queued", job_id)
+        return
+
+    # Scrapes wait in the user's sub-queue until the fair dispatcher picks them
+    await enqueue_scrapes(redis_client, scrapes)
+    logger.info("Queued %d scrapes for job %s", len(scrapes), job_id)
+    await _dispatch_scrapes()
+
+
+@celery_app.task(name="dispatch_scrapes")
+def dispatch_scrapes() -> None:
+    """Hand queued scrapes to the workers, fairly across users."""
+    run_async(_dispatch_scrapes())
+
+
+async def _dispatch_scrapes() -> None:
+    max_in_flight = settings.SCRAPE_MAX_IN_FLIGHT
+    circuit = await proxy_breaker.status()
+
+    if circuit.state != CircuitState.CLOSED:
+        # Queued work waits out an open circuit instead of failing against it
+        if circuit.retry_after_seconds > 0:
+            logger.info("Scrape dispatch paused, circuit %s", circuit.state.value)
+            return
+
+        # Only a single probe goes out until the endpoint recovers
+        max_in_flight = 1
+
+    items = await pop_fair_scrapes(
+        redis_client,
+        max_in_flight,
+        settings.SCRAPE_IN_FLIGHT_TIMEOUT_SECONDS,
+        settings.SCRAPE_FAIR_QUANTUM,
+    )
+
+    if not items:
+        return
+
+    cancelled_jobs = {
+        job_id
+        for job_id in {item.job_id for item in items}
+        if await is_job_cancelled(redis_client, job_id)
+    }
+    # Cancelled jobs' scrapes are dropped here instead of occupying a worker
+    await release_in_flight(
+        redis_client,
+        [item.task_id for item in items if item.job_id in cancelled_jobs],
+    )
+    dispatched = [item for item in items if item.job_id not in cancelled_jobs]
+    await record_queue_waits(redis_client, dispatched)
+
+    for item in dispatched:
+        scrape_single_url.apply_async(
+            (item.replay_url, str(item.job_id)), task_id=item.task_id
+        )
+
+    logger.debug("Dispatched %d scrapes", len(dispatched))
+
+
+@celery_app.task(name="scrape_single_url", bind=True, max_retries=None)
+def scrape_single_url(
+    self: Task, replay_url: str, job_id: str | None = None, attempt: int = 0
+) -> str | None:
+    """Scrape one replay into S3 and return its key, or None if cancelled."""
+    job_uuid = UUID(job_id) if job_id else None
+    is_retrying = False
+
+    try:
+        return run_async(_scrape_single_url(replay_url, job_uuid, self.request.id))
+    except CircuitOpenError as e:
+        # Waiting out an open circuit does not use up an attempt
+        is_retrying = True
+        raise self.retry(
+            kwargs={"attempt": attempt}, countdown=e.retry_after_seconds, exc=e
+        ) from e
+    except RETRYABLE_ERRORS as e:
+        if attempt >= settings.SCRAPE_MAX_RETRIES:
+            raise
+
+        is_retrying = True
+        raise self.retry(
+            kwargs={"attempt": attempt + 1},
+            countdown=retry_delay_seconds(attempt),
+            exc=e,
+        ) from e
+    finally:
+        # A failed URL still counts, otherwise its job could never complete.
+        # Retries keep their dispatch slot until the last attempt.
+        if job_uuid and not is_retrying:
+            run_async(_record_job_progress(job_uuid))
+            run_async(_finish_dispatched_scrape(self.request.id))
+
+
+async def _finish_dispatched_scrape(task_id: str) -> None:
+    # Frees the slot and refills it without waiting for the next beat tick
+    await release_in_flight(redis_client, [task_id])
+    await _dispatch_scrapes()
+
+
+async def _scrape_single_url(
+    replay_url: str, job_id: UUID | None = None, task_id: str | None = None
+) -> str | None:
+    replay_id = get_replay_id(replay_url)
+
+    if replay_id is None:
+        raise ValueError(f"Invalid replay URL: {replay_url}")
+
+    # Marked before the cancel check: a cancel either leaves this task's slot
+    # for it to free on exit, or freed it already and set the flag first
+    if job_id and task_id:
+        await mark_scrape_started(
+            redis_client, task_id, settings.SCRAPE_IN_FLIGHT_TIMEOUT_SECONDS
+        )
+
+    # Revoking is best effort, so tasks that still start check the flag too
+    if job_id and await is_job_cancelled(redis_client, job_id):
+        logger.info("Skipping %s, job %s was cancelled", replay_url, job_id)
+        return None
+
+    async with get_db_session() as db:
+        cached = await get_scraped_s3_keys(db, [replay_url])
+
+    if replay_url in cached:
+        return cached[replay_url]
+
+    # Concurrent jobs submitting the same replay share a single scrape
+    async with watch_job_cancellation(redis_client, job_id) as cancelled:
+        try:
+            return await scrape_replay_once(
+                redis_client,
+                replay_id,
+                lambda: _scrape_replay(replay_id, cancelled),
+                cancelled,
+            )
+        except ScrapeCancelledError:
+            logger.info("Aborted %s, job %s was cancelled", replay_url, job_id)
+            return None
+
+
+async def _scrape_replay(replay_id: int, cancelled: asyncio.Event) -> str:
+    # No DB session is held while the browser works through the replay
+    # The browser pool holds a proxy slot for each session it keeps open
+    async with proxy_breaker.call():
+        started = time.monotonic()
+        scrape = await replay_extractor.extract_replay(
+            canonical_replay_url(replay_id), cancelled
+        )
+
+    await record_scrape_duration(redis_client, time.monotonic() - started)
+    s3_key = replay_s3_key(replay_id)
+    # Replays are kept forever and mostly repeated log text, so store them gzipped
+    await s3_service.put_json(s3_key, scrape.data, compress=True)
+
+    async with get_db_session() as db:
+        await record_scraped_replay(db, replay_id, s3_key)
+
+    logger.info(
+        "Scraped replay %s to %s: %d bytes, %d requests blocked, %.2fs to JSON",
+        replay_id,
+        s3_key,
+        scrape.metrics.bytes_received,
+        scrape.metrics.requests_blocked,
+        scrape.metrics.time_to_json_seconds,
+    )
+    return s3_key
+
+
+async def _record_job_progress(job_id: UUID, count: int = 1) -> None:
+    # Counted in Redis; Postgres only sees the periodic flush and completion
+    try:
+        update = await increment_job_counters(redis_client, job_id, count)
+    except JobCountersMissingError:
+        # Cancelling clears the counters on purpose; the job is no longer counted
+        if not await is_job_cancelled(redis_client, job_id):
+            await _record_job_progress_in_db(job_id, count)
+        return
+
+    # The job was cancelled or already completed by another task
+    if update is None:
+        return
+
+    await publish_job_progress(redis_client, update.progress)
+
+    if not update.is_completer:
+        return
+
+    async with get_db_session() as db:
+        is_completed = await complete_job(db, job_id, update.progress.processed)
+
+    if is_completed:
+        logger.info("Job %s scraped all %d URLs", job_id, update.progress.total)
+        finalize_job_results.delay(str(job_id))
+
+
+async def _record_job_progress_in_db(job_id: UUID, count: int) -> None:
+    # Expired after a day without progress, or lost; the flushed count is exact
+    logger.warning("Counting job %s in Postgres, its counters are gone", job_id)
+
+    async with get_db_session() as db:
+        update = await count_processed_urls(db, job_id, count)
+
+    if update is None:
+        return
+
+    await publish_job_progress(redis_client, update.progress)
+
+    if update.is_completer:
+        logger.info("Job %s scraped all %d URLs", job_id, update.progress.total)
+        finalize_job_results.delay(str(job_id))
+
+
+@celery_app.task(name="flush_job_progress")
+def flush_job_progress() -> None:
+    """Copy coalesced Redis progress counters to Job.processed_urls."""
+    run_async(_flush_job_progress())
+
+
+async def _flush_job_progress() -> None:
+    while counts := await pop_dirty_job_counts(
+        redis_client, settings.PROGRESS_FLUSH_BATCH_SIZE
+    ):
+        async with get_db_session() as db:
+            await flush_processed_urls(db, counts)
+
+        logger.debug("Flushed progress counters for %d jobs", len(counts))
+
+
+@celery_app.task(name="finalize_job_results")
+def finalize_job_results(job_id: str) -> None:
+    """Completion stage: write the job's results artifact once."""
+    run_async(_finalize_job_results(UUID(job_id)))
+
+
+async def _finalize_job_results(job_id: UUID) -> None:
+    async with get_db_session() as db:
+        job = await db.get(Job, job_id)
+
+        if not job:
+            logger.warning("Job %s not found, skipping results", job_id)
+            return
+
+        if job.results_s3_key:
+            return
+
+        results_s3_key = await materialize_job_results(db, redis_client, job)
+        logger.info("Materialized results for job %s at %s", job_id, results_s3_key)
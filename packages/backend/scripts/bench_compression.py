@@ -0,0 +1,91 @@
+"""Compare compression ratio and decode time of raw replay JSON encodings.
+
+Reports, per replay size, what S3Service would store and how long a results
+worker spends turning the stored bytes back into a replay dict.
+
+Usage: uv run python scripts/bench_compression.py [--games 3] [--plays 500 2000 8000]
+"""
+
+import argparse
+import gzip
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from bench_transformation import make_replay  # noqa: E402
+
+Codec = tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]
+
+
+def codecs() -> dict[str, Codec]:
+    available: dict[str, Codec] = {
+        "none": (lambda body: body, lambda body: body),
+        **{
+            f"gzip-{level}": (
+                lambda body, level=level: gzip.compress(body, compresslevel=level),
+                gzip.decompress,
+            )
+            for level in (1, 6, 9)
+        },
+    }
+
+    # zstd is not a dependency; it is compared when the package is installed
+    try:
+        import zstandard  # type: ignore[import-not-found]
+    except ImportError:
+        return available
+
+    for level in (3, 10, 19):
+        available[f"zstd-{level}"] = (
+            zstandard.ZstdCompressor(level=level).compress,
+            zstandard.ZstdDecompressor().decompress,
+        )
+
+    return available
+
+
+def best_time(fn: Callable[[], Any]) -> float:
+    timings = []
+
+    for _ in range(5):
+        started_at = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started_at)
+
+    return min(timings)
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--games", type=int, default=3)
+    arg_parser.add_argument("--plays", type=int, nargs="+", default=[500, 2000, 8000])
+    args = arg_parser.parse_args()
+
+    print(
+        f"{'plays/game':>10} {'codec':>8} {'stored':>10} {'ratio':>6}"
+        f" {'encode':>9} {'decode+parse':>13}"
+    )
+
+    for plays_per_game in args.plays:
+        raw = json.dumps(make_replay(args.games, plays_per_game)).encode()
+
+        for name, (compress, decompress) in codecs().items():
+            stored = compress(raw)
+            assert decompress(stored) == raw
+
+            encode = best_time(lambda: compress(raw))
+            decode = best_time(lambda: json.loads(decompress(stored)))
+
+            print(
+                f"{plays_per_game:>10} {name:>8} {len(stored) / 1024:>7.0f} KiB"
+                f" {len(raw) / len(stored):>5.1f}x {encode * 1000:>6.1f} ms"
+                f" {decode * 1000:>10.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
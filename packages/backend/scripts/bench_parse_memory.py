@@ -0,0 +1,116 @@
+"""Compare peak memory of building a replay's plays table from its raw JSON.
+
+"loads" is the old path: json.loads the whole replay, then create_replay_plays_df.
+"stream" is stream_replay_plays_df, which decodes one play at a time. Each run
+happens in a fresh process, and peak RSS is counted from just before parsing.
+Linux only, as it reads and resets the peak through /proc.
+
+Usage: uv run python scripts/bench_parse_memory.py [--games 3] [--plays 2000 8000 32000]
+"""
+
+import argparse
+import gc
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bench_transformation import make_replay  # noqa: E402
+
+from app.transformation.parser import (  # noqa: E402
+    create_replay_plays_df,
+    stream_replay_plays_df,
+)
+
+VARIANTS = ("loads", "stream")
+
+
+def proc_status_kib(field: str) -> int:
+    for line in Path("/proc/self/status").read_text().splitlines():
+        if line.startswith(f"{field}:"):
+            return int(line.split()[1])
+
+    raise KeyError(field)
+
+
+def reset_peak_rss() -> None:
+    # Linux only: forget the high-water mark left by imports and the file read
+    Path("/proc/self/clear_refs").write_text("5")
+
+
+def measure(variant: str, path: str) -> dict[str, Any]:
+    """Parse one replay file in this process and report what it cost."""
+    body = Path(path).read_bytes()
+    gc.collect()
+    reset_peak_rss()
+    baseline = proc_status_kib("VmRSS")
+
+    started_at = time.perf_counter()
+
+    if variant == "loads":
+        plays_df = create_replay_plays_df(json.loads(body))
+    else:
+        plays_df = stream_replay_plays_df(body)
+
+    elapsed = time.perf_counter() - started_at
+
+    assert plays_df is not None
+    return {
+        "rows": len(plays_df),
+        "peak_kib": proc_status_kib("VmHWM") - baseline,
+        "seconds": elapsed,
+    }
+
+
+def run(variant: str, path: str) -> dict[str, Any]:
+    output = subprocess.run(
+        [sys.executable, __file__, "--measure", variant, path],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    result: dict[str, Any] = json.loads(output)
+    return result
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--games", type=int, default=3)
+    arg_parser.add_argument("--plays", type=int, nargs="+", default=[2000, 8000, 32000])
+    arg_parser.add_argument("--measure", nargs=2, metavar=("VARIANT", "PATH"))
+    args = arg_parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure(*args.measure)))
+        return
+
+    print(
+        f"{'plays/game':>10} {'raw':>9} {'rows':>7} {'variant':>7}"
+        f" {'peak RSS':>10} {'time':>9}"
+    )
+
+    for plays_per_game in args.plays:
+        body = json.dumps(make_replay(args.games, plays_per_game)).encode()
+
+        with tempfile.NamedTemporaryFile(suffix=".json") as file:
+            file.write(body)
+            file.flush()
+
+            for variant in VARIANTS:
+                result = run(variant, file.name)
+                print(
+                    f"{plays_per_game:>10} {len(body) / 2**20:>5.1f} MiB"
+                    f" {result['rows']:>7} {variant:>7}"
+                    f" {result['peak_kib'] / 1024:>6.1f} MiB"
+                    f" {result['seconds'] * 1000:>6.0f} ms"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+"""Measure scrape throughput against a local DuelingBook stand-in, no proxy needed.
+
+Serves replay pages that console.log a synthetic replay JSON after a delay, and
+scrapes them with the real ReplayExtractor and BrowserPool through a local
+Chromium reached over CDP, the same way workers reach BrightData.
+
+Usage: uv run python scripts/bench_scraping.py [--concurrency 1 2 4 8] [--urls 40]
+    [--delay-ms 500] [--slow-rate 0.1] [--slow-delay-ms 5000] [--fail-rate 0.05]
+
+Needs a Chromium installed with `uv run playwright install chromium`.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+from playwright.async_api import Error as PlaywrightError
+from playwright.async_api import async_playwright
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.config import settings  # noqa: E402
+from app.scraping.browser_pool import BrowserPool  # noqa: E402
+from app.scraping.extractor import ReplayExtractionError, ReplayExtractor  # noqa: E402
+from bench_transformation import make_replay  # noqa: E402
+
+PAGE_TEMPLATE = """<!doctype html>
+<html>
+  <head><link rel="stylesheet" href="/static/site.css"></head>
+  <body>
+    <img src="/static/card.png">
+    <script>
+      setTimeout(function () {{ console.log({replay_json}); }}, {delay_ms});
+    </script>
+  </body>
+</html>
+"""
+
+# Served in place of the replay when a request is picked to fail; it never
+# logs anything, like a DuelingBook page that errored behind the proxy
+FAILED_PAGE = b"<!doctype html><html><body>Service Unavailable</body></html>"
+
+
+@dataclass
+class StandInConfig:
+    replay_json: str
+    delay_ms: int
+    slow_rate: float
+    slow_delay_ms: int
+    fail_rate: float
+
+
+@dataclass
+class LevelResult:
+    concurrency: int
+    elapsed_seconds: float
+    latencies: list[float] = field(default_factory=list)
+    failures: int = 0
+    peak_rss_bytes: int = 0
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    config: StandInConfig
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+
+        if url.path != "/replay":
+            self._respond(404, b"")
+            return
+
+        # Seeded by replay ID, so every run injects faults into the same URLs
+        replay_id = parse_qs(url.query).get("id", ["0"])[0]
+        rng = random.Random(replay_id)
+
+        if rng.random() < self.config.fail_rate:
+            self._respond(503, FAILED_PAGE)
+            return
+
+        delay_ms = (
+            self.config.slow_delay_ms
+            if rng.random() < self.config.slow_rate
+            else self.config.delay_ms
+        )
+        page = PAGE_TEMPLATE.format(
+            replay_json=self.config.replay_json, delay_ms=delay_ms
+        )
+        self._respond(200, page.encode())
+
+    def log_message(self, format: str, *args: object) -> None:
+        return
+
+    def _respond(self, status: int, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_stand_in(config: StandInConfig) -> ThreadingHTTPServer:
+    handler = type("ConfiguredHandler", (StandInHandler,), {"config": config})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def start_chromium(executable: str, port: int, user_data_dir: str) -> subprocess.Popen:
+    process = subprocess.Popen(
+        [
+            executable,
+            "--headless=new",
+            f"--remote-debugging-port={port}",
+            f"--user-data-dir={user_data_dir}",
+            "--no-first-run",
+            "--no-default-browser-check",
+            "about:blank",
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+    for _ in range(100):
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/json/version", timeout=1)
+            return process
+        except OSError:
+            time.sleep(0.1)
+
+    process.kill()
+    raise RuntimeError("Chromium did not open its DevTools port")
+
+
+def process_tree_rss(root_pid: int) -> int:
+    """Sum the resident memory of a process and its descendants, from /proc."""
+    children: dict[int, list[int]] = {}
+    rss_pages: dict[int, int] = {}
+
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+
+        try:
+            stat = Path(f"/proc/{entry}/stat").read_text()
+            statm = Path(f"/proc/{entry}/statm").read_text()
+        except OSError:
+            continue
+
+        # The command name may contain spaces, so fields are read after it
+        ppid = int(stat.rsplit(")", 1)[1].split()[1])
+        children.setdefault(ppid, []).append(int(entry))
+        rss_pages[int(entry)] = int(statm.split()[1])
+
+    total = 0
+    pending = [root_pid]
+
+    while pending:
+        pid = pending.pop()
+        total += rss_pages.get(pid, 0)
+        pending.extend(children.get(pid, []))
+
+    return total * os.sysconf("SC_PAGE_SIZE")
+
+
+async def sample_peak_rss(pid: int, result: LevelResult) -> None:
+    while True:
+        result.peak_rss_bytes = max(result.peak_rss_bytes, process_tree_rss(pid))
+        await asyncio.sleep(0.2)
+
+
+async def run_level(
+    endpoint_url: str, base_url: str, chromium_pid: int, concurrency: int, urls: int
+) -> LevelResult:
+    pool = BrowserPool(
+        endpoint_url=endpoint_url,
+        max_size=concurrency,
+        max_pages_per_session=settings.BROWSER_MAX_PAGES_PER_SESSION,
+        idle_timeout_seconds=settings.BROWSER_POOL_IDLE_SECONDS,
+    )
+    extractor = ReplayExtractor(pool)
+    result = LevelResult(concurrency=concurrency, elapsed_seconds=0)
+
+    async def scrape(replay_id: int) -> None:
+        started_at = time.perf_counter()
+
+        try:
+            await extractor.extract_replay(f"{base_url}/replay?id={replay_id}")
+        except (ReplayExtractionError, PlaywrightError):
+            result.failures += 1
+            return
+
+        result.latencies.append(time.perf_counter() - started_at)
+
+    sampler = asyncio.create_task(sample_peak_rss(chromium_pid, result))
+    started_at = time.perf_counter()
+
+    try:
+        # The pool's own slots cap how many pages are open at once
+        await asyncio.gather(*(scrape(replay_id) for replay_id in range(1, urls + 1)))
+    finally:
+        result.elapsed_seconds = time.perf_counter() - started_at
+        sampler.cancel()
+        await pool.close()
+
+    return result
+
+
+def percentile(values: list[float], quantile: float) -> float:
+    if not values:
+        return float("nan")
+
+    ordered = sorted(values)
+    return ordered[min(int(quantile * len(ordered)), len(ordered) - 1)]
+
+
+async def bench(args: argparse.Namespace) -> None:
+    replay_json = json.dumps(make_replay(args.games, args.plays))
+    config = StandInConfig(
+        # A JS string literal of the JSON, escaped so it cannot close the script
+        replay_json=json.dumps(replay_json).replace("</", "<\\/"),
+        delay_ms=args.delay_ms,
+        slow_rate=args.slow_rate,
+        slow_delay_ms=args.slow_delay_ms,
+        fail_rate=args.fail_rate,
+    )
+    server = start_stand_in(config)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    settings.SCRAPE_PAGE_TIMEOUT_MS = args.page_timeout_ms
+
+    async with async_playwright() as playwright:
+        executable = playwright.chromium.executable_path
+
+    print(
+        f"replay JSON {len(replay_json) / 1024:.0f} KiB, "
+        f"{args.urls} URLs per level, page timeout {args.page_timeout_ms} ms"
+    )
+    print(
+        f"{'concurrency':>11} {'urls/min':>9} {'p50':>7} {'p95':>7}"
+        f" {'failed':>7} {'peak RSS':>9} {'RSS/browser':>12}"
+    )
+
+    try:
+        for concurrency in args.concurrency:
+            # A fresh Chromium per level keeps memory readings independent
+            with tempfile.TemporaryDirectory() as user_data_dir:
+                chromium = start_chromium(executable, args.cdp_port, user_data_dir)
+
+                try:
+                    result = await run_level(
+                        f"http://127.0.0.1:{args.cdp_port}",
+                        base_url,
+                        chromium.pid,
+                        concurrency,
+                        args.urls,
+                    )
+                finally:
+                    chromium.terminate()
+                    chromium.wait()
+
+            urls_per_minute = len(result.latencies) / result.elapsed_seconds * 60
+            peak_mib = result.peak_rss_bytes / 2**20
+
+            print(
+                f"{concurrency:>11} {urls_per_minute:>9.1f}"
+                f" {percentile(result.latencies, 0.5):>6.2f}s"
+                f" {percentile(result.latencies, 0.95):>6.2f}s"
+                f" {result.failures:>7} {peak_mib:>6.0f} MiB"
+                f" {peak_mib / concurrency:>8.0f} MiB"
+            )
+    finally:
+        server.shutdown()
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8])
+    arg_parser.add_argument("--urls", type=int, default=40)
+    arg_parser.add_argument("--delay-ms", type=int, default=500)
+    arg_parser.add_argument("--slow-rate", type=float, default=0.1)
+    arg_parser.add_argument("--slow-delay-ms", type=int, default=5000)
+    arg_parser.add_argument("--fail-rate", type=float, default=0.05)
+    arg_parser.add_argument("--page-timeout-ms", type=int, default=10_000)
+    arg_parser.add_argument("--games", type=int, default=3)
+    arg_parser.add_argument("--plays", type=int, default=2000)
+    arg_parser.add_argument("--cdp-port", type=int, default=9333)
+    args = arg_parser.parse_args()
+
+    # Timeouts of injected failures are expected; keep the table readable
+    logging.getLogger("app").setLevel(logging.CRITICAL)
+    asyncio.run(bench(args))
+
+
+if __name__ == "__main__":
+    main()
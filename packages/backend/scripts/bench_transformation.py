@@ -0,0 +1,232 @@
+"""Compare the vectorized replay parser against the row-wise reference parser.
+
+Usage: uv run python scripts/bench_transformation.py [--games 3] [--plays 4000]
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.transformation.parser import create_plays_df, parse_replay  # noqa: E402
+
+CARD_NAMES = [f"Card {i}" for i in range(60)]
+PLAYERS = ("alice", "bob")
+
+
+def make_replay(games: int, plays_per_game: int, seed: int = 7) -> dict[str, Any]:
+    """Build a synthetic Best-of-N replay shaped like DuelingBook's replay JSON."""
+    rng = random.Random(seed)
+    plays: list[dict[str, Any]] = []
+
+    for game in range(games):
+        first, second = PLAYERS if game % 2 == 0 else PLAYERS[::-1]
+        plays.append(
+            {
+                "seconds": 0,
+                "play": "Go first",
+                "owner": None,
+                "log": {"username": first, "public_log": "Chose to go first"},
+            }
+        )
+
+        for second_count in range(plays_per_game):
+            username = rng.choice(PLAYERS)
+            card = rng.choice(CARD_NAMES)
+            kind = rng.random()
+
+            if kind < 0.3:
+                log = {
+                    "username": username,
+                    "public_log": "Drew card",
+                    "private_log": f'Drew "{card}"',
+                }
+            elif kind < 0.4:
+                log = {
+                    "username": username,
+                    "public_log": f'Returned "{card}" to bottom of deck',
+                }
+            elif kind < 0.45:
+                plays.append(
+                    {
+                        "seconds": second_count,
+                        "play": "Duel message",
+                        "owner": username,
+                        "log": {"username": username, "public_log": f'"{card}" gg'},
+                    }
+                )
+                continue
+            else:
+                log = {
+                    "username": username,
+                    "public_log": f'Activated "{card}"',
+                    "private_log": None,
+                }
+
+            plays.append(
+                {
+                    "seconds": second_count,
+                    "play": "Card action",
+                    "owner": username,
+                    "log": [log],
+                }
+            )
+
+        plays.append(
+            {
+                "seconds": plays_per_game,
+                "play": "Admit defeat",
+                "owner": second,
+                "log": {"username": second, "public_log": "Admitted defeat"},
+            }
+        )
+
+    return {
+        "date": "2025-01-01 12:00:00",
+        "conceal": False,
+        "player1": {"username": PLAYERS[0]},
+        "player2": {"username": PLAYERS[1]},
+        "plays": plays,
+    }
+
+
+def reference_parse_replay(replay_data: dict[str, Any]) -> pd.DataFrame:
+    """Row-wise parser from docs/inspo/parser.md, without deck type inference."""
+    plays_df = create_plays_df(replay_data).assign(
+        card_name=lambda df: df.apply(_reference_card_name, axis=1),
+        deck_change=lambda df: df.apply(_reference_deck_change, axis=1),
+        game_number=lambda df: df.public_log.str.contains("Chose to go").cumsum(),
+    )
+    played_at = pd.to_datetime(replay_data.get("date"))
+    player1 = replay_data["player1"]["username"]
+    player2 = replay_data["player2"]["username"]
+
+    cards_df = (
+        plays_df.dropna(subset="card_name")
+        .assign(
+            cum_deck_change=lambda df: df.groupby(
+                ["game_number", "username", "card_name"]
+            )["deck_change"].cumsum()
+        )
+        .groupby(["game_number", "username", "card_name"])
+        .agg(card_amount=("cum_deck_change", "max"))
+        .reset_index()
+        .query("card_amount > 0")
+    )
+
+    games_data = []
+
+    for game in range(1, max(plays_df["game_number"]) + 1):
+        game_df = plays_df.query("game_number == @game")
+        player1_cards_df = cards_df.query(
+            "game_number == @game & username == @player1"
+        )[["card_name", "card_amount"]]
+        player2_cards_df = cards_df.query(
+            "game_number == @game & username == @player2"
+        )[["card_name", "card_amount"]]
+        game_loser = game_df.query("public_log in ['Admitted defeat', 'Lost Duel']")[
+            "username"
+        ]
+
+        games_data.append(
+            {
+                "played_at": played_at,
+                "player1": player1,
+                "player2": player2,
+                "game_number": game,
+                "game_winner": None
+                if game_loser.empty
+                else (player1 if game_loser.item() == player2 else player2),
+                "went_first": game_df.query("public_log == 'Chose to go first'")[
+                    "username"
+                ].item(),
+                "player1_cards": player1_cards_df.to_dict("records"),
+                "player2_cards": player2_cards_df.to_dict("records"),
+            }
+        )
+
+    return pd.DataFrame(games_data)
+
+
+def _reference_card_name(row: pd.Series) -> str | None:
+    if row.play == "Duel message":
+        return None
+
+    for log in (row.private_log, row.public_log):
+        if not log:
+            continue
+
+        matches = re.findall(r'"([^"]*)"', str(log))
+        if matches:
+            return matches[0]
+
+    return None
+
+
+def _reference_deck_change(row: pd.Series) -> int:
+    logs = [str(row.private_log), str(row.public_log)]
+
+    if any(
+        phrase in log
+        for log in logs
+        for phrase in ("Drew", "from Deck", "from top of deck")
+    ):
+        return 1
+
+    if any(
+        phrase in log
+        for log in logs
+        for phrase in ("to top of deck", "to bottom of deck")
+    ):
+        return -1
+
+    return 0
+
+
+def best_time(parse: Callable[[dict[str, Any]], Any], replay: dict[str, Any]) -> float:
+    timings = []
+
+    for _ in range(3):
+        started_at = time.perf_counter()
+        parse(replay)
+        timings.append(time.perf_counter() - started_at)
+
+    return min(timings)
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--games", type=int, default=3)
+    arg_parser.add_argument("--plays", type=int, nargs="+", default=[500, 2000, 8000])
+    args = arg_parser.parse_args()
+
+    print(
+        f"{'plays/game':>10} {'rows':>7} {'reference':>10} {'vectorized':>11} {'speedup':>8}"
+    )
+
+    for plays_per_game in args.plays:
+        replay = make_replay(args.games, plays_per_game)
+
+        pd.testing.assert_frame_equal(
+            reference_parse_replay(replay), parse_replay(replay)
+        )
+
+        reference = best_time(reference_parse_replay, replay)
+        vectorized = best_time(parse_replay, replay)
+        rows = len(create_plays_df(replay))
+
+        print(
+            f"{plays_per_game:>10} {rows:>7} {reference:>9.3f}s {vectorized:>10.3f}s"
+            f" {reference / vectorized:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
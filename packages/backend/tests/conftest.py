@@ -1,3 +1,6 @@
+from collections.abc import Iterator
+from unittest.mock import AsyncMock, MagicMock, patch
+
 import pytest
 from httpx import AsyncClient, ASGITransport
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
@@ -10,16 +13,31 @@ from pathlib import Path
 # Add the parent directory to sys.path for importlib mode
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from app.auth.dependencies import user_cache
 from app.config import Settings
 from app.db.database import get_db_session
 from app.db.models import Base
 from app.main import app
+from app.worker.celery_app import celery_app
 
 
 # Note: With pytest-asyncio in auto mode, we don't need a custom event_loop fixture
 # The default event loop management is handled automatically
 
 
+@pytest.fixture(autouse=True)
+def clear_auth_caches() -> None:
+    """Reset in-process auth caches so tests don't share resolved users."""
+    user_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def mock_send_task() -> Iterator[MagicMock]:
+    """Keep tests from publishing Celery tasks to a real broker."""
+    with patch.object(celery_app, "send_task") as send_task:
+        yield send_task
+
+
 @pytest.fixture
 def test_settings() -> Settings:
     """Test settings with in-memory database."""
@@ -35,6 +53,28 @@ def test_settings() -> Settings:
     )
 
 
+@pytest.fixture
+def mock_redis() -> MagicMock:
+    """Redis client mock with an empty cache, no counters and free locks."""
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(return_value=[])
+    pipeline = MagicMock()
+    pipeline.__aenter__ = AsyncMock(return_value=pipe)
+    pipeline.__aexit__ = AsyncMock(return_value=None)
+
+    redis = MagicMock()
+    redis.pipeline.return_value = pipeline
+    redis.incr = AsyncMock(return_value=1)
+    redis.get = AsyncMock(return_value=None)
+    redis.hgetall = AsyncMock(return_value={})
+    redis.delete = AsyncMock(return_value=0)
+    redis.smembers = AsyncMock(return_value=set())
+    redis.zrem = AsyncMock()
+    redis.set = AsyncMock(return_value=True)
+    redis.eval = AsyncMock(return_value=1)
+    return redis
+
+
 @pytest.fixture
 async def test_db_session(
     test_settings: Settings,
@@ -51,7 +91,7 @@ async def test_db_session(
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
-    async with AsyncSession(engine) as session:
+    async with AsyncSession(engine, expire_on_commit=False) as session:
         yield session
 
     await engine.dispose()
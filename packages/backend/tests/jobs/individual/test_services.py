@@ -1,3 +1,5 @@
+from unittest.mock import MagicMock
+
 import pytest
 from pydantic import HttpUrl
 from sqlalchemy import select
@@ -5,7 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.jobs.individual.services import create_individual_job
 from app.api.jobs.models import JobResponse
-from app.db.models import Job, JobStatus, JobType, User
+from app.db.models import Job, JobStatus, JobType, ScrapedData, User
 
 
 class TestIndividualServices:
@@ -39,3 +41,70 @@ class TestIndividualServices:
         )
         job = db_result.scalar_one()
         assert job.urls == ["https://example.com/game1", "https://example.com/game2"]
+
+    async def test_create_individual_job_counts_cached_urls(
+        self, sample_user: User, test_db_session: AsyncSession
+    ) -> None:
+        test_db_session.add(
+            ScrapedData(
+                url="https://www.duelingbook.com/replay?id=123",
+                replay_id=123,
+                s3_key="replays/123.json",
+            )
+        )
+        await test_db_session.commit()
+
+        partial = await create_individual_job(
+            test_db_session,
+            [
+                HttpUrl("https://duelingbook.com/replay?id=123&foo=bar"),
+                HttpUrl("https://duelingbook.com/replay?id=456"),
+            ],
+            sample_user,
+        )
+        cached = await create_individual_job(
+            test_db_session,
+            [HttpUrl("https://duelingbook.com/replay?id=123")],
+            sample_user,
+        )
+
+        assert partial.status == JobStatus.PENDING
+        assert partial.processed_urls == 1
+        assert cached.status == JobStatus.COMPLETED
+        assert cached.processed_urls == 1
+        assert cached.completed_at is not None
+
+    async def test_create_individual_job_queues_work(
+        self,
+        sample_user: User,
+        test_db_session: AsyncSession,
+        mock_send_task: MagicMock,
+    ) -> None:
+        result = await create_individual_job(
+            test_db_session,
+            [HttpUrl("https://duelingbook.com/replay?id=9")],
+            sample_user,
+        )
+
+        mock_send_task.assert_called_once_with(
+            "process_individual_job", args=[str(result.job_id)]
+        )
+
+    async def test_create_individual_job_fails_when_queueing_fails(
+        self,
+        sample_user: User,
+        test_db_session: AsyncSession,
+        mock_send_task: MagicMock,
+    ) -> None:
+        mock_send_task.side_effect = ConnectionError("broker down")
+
+        result = await create_individual_job(
+            test_db_session,
+            [HttpUrl("https://duelingbook.com/replay?id=9")],
+            sample_user,
+        )
+
+        assert result.status == JobStatus.FAILED
+        job = await test_db_session.get(Job, result.job_id)
+        assert job is not None
+        assert job.status == JobStatus.FAILED
@@ -1,3 +1,5 @@
+from unittest.mock import MagicMock
+
 import pytest
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -31,9 +33,11 @@ class TestResultsServices:
         return job
 
     async def test_get_public_results_success(
-        self, public_job: Job, test_db_session: AsyncSession
+        self, public_job: Job, test_db_session: AsyncSession, mock_redis: MagicMock
     ) -> None:
-        result = await get_public_results(test_db_session, public_job.shareable_id)
+        result = await get_public_results(
+            test_db_session, mock_redis, public_job.shareable_id
+        )
 
         assert result.shareable_id == public_job.shareable_id
         assert result.job_type == public_job.job_type
@@ -41,7 +45,10 @@ class TestResultsServices:
         assert result.detailed_results is not None
 
     async def test_get_public_results_not_public(
-        self, test_db_session: AsyncSession, sample_user: User
+        self,
+        test_db_session: AsyncSession,
+        sample_user: User,
+        mock_redis: MagicMock,
     ) -> None:
         private_job = Job(
             job_type=JobType.INDIVIDUAL,
@@ -56,12 +63,17 @@ class TestResultsServices:
         await test_db_session.refresh(private_job)
 
         with pytest.raises(HTTPException) as exc_info:
-            await get_public_results(test_db_session, private_job.shareable_id)
+            await get_public_results(
+                test_db_session, mock_redis, private_job.shareable_id
+            )
 
         assert exc_info.value.status_code == status.HTTP_404_NOT_FOUND
 
     async def test_get_public_results_not_completed(
-        self, test_db_session: AsyncSession, sample_user: User
+        self,
+        test_db_session: AsyncSession,
+        sample_user: User,
+        mock_redis: MagicMock,
     ) -> None:
         incomplete_job = Job(
             job_type=JobType.INDIVIDUAL,
@@ -76,6 +88,8 @@ class TestResultsServices:
         await test_db_session.refresh(incomplete_job)
 
         with pytest.raises(HTTPException) as exc_info:
-            await get_public_results(test_db_session, incomplete_job.shareable_id)
+            await get_public_results(
+                test_db_session, mock_redis, incomplete_job.shareable_id
+            )
 
         assert exc_info.value.status_code == status.HTTP_400_BAD_REQUEST
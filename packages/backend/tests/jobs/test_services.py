@@ -1,7 +1,10 @@
+import json
 import uuid
+from unittest.mock import MagicMock, patch
 
 import pytest
 from fastapi import HTTPException, status
+from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.jobs.services import (
@@ -13,6 +16,7 @@ from app.api.jobs.services import (
     list_user_jobs,
 )
 from app.db.models import Job, JobStatus, JobType, User
+from app.worker.celery_app import celery_app
 
 
 class TestJobServices:
@@ -59,9 +63,15 @@ class TestJobServices:
         assert exc_info.value.status_code == status.HTTP_404_NOT_FOUND
 
     async def test_get_job_progress(
-        self, sample_job: Job, sample_user: User, test_db_session: AsyncSession
+        self,
+        sample_job: Job,
+        sample_user: User,
+        test_db_session: AsyncSession,
+        mock_redis: MagicMock,
     ) -> None:
-        result = await get_job_progress(test_db_session, sample_job.id, sample_user)
+        result = await get_job_progress(
+            test_db_session, mock_redis, sample_job.id, sample_user
+        )
 
         assert result["job_id"] == str(sample_job.id)
         assert result["status"] == sample_job.status
@@ -69,11 +79,39 @@ class TestJobServices:
         assert result["total"] == 2
         assert result["progress_percentage"] == 0.0
 
+    async def test_get_job_progress_from_counters(
+        self,
+        sample_job: Job,
+        sample_user: User,
+        test_db_session: AsyncSession,
+        mock_redis: MagicMock,
+    ) -> None:
+        mock_redis.hgetall.return_value = {
+            "user_id": str(sample_user.id),
+            "status": "running",
+            "processed": "1",
+            "total": "2",
+        }
+
+        result = await get_job_progress(
+            test_db_session, mock_redis, sample_job.id, sample_user
+        )
+
+        assert result["status"] == JobStatus.RUNNING
+        assert result["processed"] == 1
+        assert result["progress_percentage"] == 50.0
+
     async def test_get_job_results_not_completed(
-        self, sample_job: Job, sample_user: User, test_db_session: AsyncSession
+        self,
+        sample_job: Job,
+        sample_user: User,
+        test_db_session: AsyncSession,
+        mock_redis: MagicMock,
     ) -> None:
         with pytest.raises(HTTPException) as exc_info:
-            await get_job_results(test_db_session, sample_job.id, sample_user)
+            await get_job_results(
+                test_db_session, mock_redis, sample_job.id, sample_user
+            )
 
         assert exc_info.value.status_code == status.HTTP_400_BAD_REQUEST
         assert "not completed" in exc_info.value.detail
@@ -83,11 +121,14 @@ class TestJobServices:
         sample_job: Job,
         sample_user: User,
         test_db_session: AsyncSession,
+        mock_redis: MagicMock,
     ) -> None:
         sample_job.status = JobStatus.COMPLETED
         await test_db_session.commit()
 
-        result = await get_job_results(test_db_session, sample_job.id, sample_user)
+        result = await get_job_results(
+            test_db_session, mock_redis, sample_job.id, sample_user
+        )
 
         assert result.job_id == sample_job.id
         assert result.status == JobStatus.COMPLETED
@@ -99,28 +140,77 @@ class TestJobServices:
         sample_job: Job,
         sample_user: User,
         test_db_session: AsyncSession,
+        mock_redis: MagicMock,
     ) -> None:
-        result = await cancel_job(test_db_session, sample_job.id, sample_user)
+        mock_redis.smembers.return_value = {"task-1", "task-2"}
 
-        assert result["status"] == "cancelled"
+        with patch.object(celery_app.control, "revoke") as revoke:
+            result = await cancel_job(
+                test_db_session, mock_redis, sample_job.id, sample_user
+            )
+
+        assert result.status == "cancelled"
+        assert result.revoked_tasks == 2
+        assert result.scrape_seconds_saved == 120.0
+        assert sorted(revoke.call_args.args[0]) == ["task-1", "task-2"]
+        mock_redis.set.assert_awaited_once_with(
+            f"job_cancel:{sample_job.id}", "1", ex=86400
+        )
+        mock_redis.delete.assert_awaited_once_with(
+            f"job_progress:{sample_job.id}:counters"
+        )
+        # Open progress streams see the job end
+        pipe = mock_redis.pipeline.return_value.__aenter__.return_value
+        channel, payload = pipe.publish.call_args.args
+        assert channel == f"job_progress:{sample_job.id}:events"
+        assert json.loads(payload)["progress"]["status"] == "cancelled"
 
         # Verify job status was updated
         await test_db_session.refresh(sample_job)
         assert sample_job.status == JobStatus.CANCELLED
+        assert sample_job.scrape_seconds_saved == 120.0
 
     async def test_cancel_job_already_completed(
         self,
         sample_job: Job,
         sample_user: User,
         test_db_session: AsyncSession,
+        mock_redis: MagicMock,
     ) -> None:
         sample_job.status = JobStatus.COMPLETED
         await test_db_session.commit()
 
         with pytest.raises(HTTPException) as exc_info:
-            await cancel_job(test_db_session, sample_job.id, sample_user)
+            await cancel_job(test_db_session, mock_redis, sample_job.id, sample_user)
+
+        assert exc_info.value.status_code == status.HTTP_400_BAD_REQUEST
+
+    async def test_cancel_job_completed_meanwhile(
+        self,
+        sample_job: Job,
+        sample_user: User,
+        test_db_session: AsyncSession,
+        mock_redis: MagicMock,
+    ) -> None:
+        async def complete_job(*_: object) -> float:
+            await test_db_session.execute(
+                update(Job)
+                .where(Job.id == sample_job.id)
+                .values(status=JobStatus.COMPLETED)
+            )
+            return 0.0
+
+        with (
+            patch("app.api.jobs.services.estimate_scrape_seconds", complete_job),
+            pytest.raises(HTTPException) as exc_info,
+        ):
+            await cancel_job(test_db_session, mock_redis, sample_job.id, sample_user)
 
         assert exc_info.value.status_code == status.HTTP_400_BAD_REQUEST
+        mock_redis.set.assert_not_awaited()
+
+        await test_db_session.refresh(sample_job)
+        assert sample_job.status == JobStatus.COMPLETED
 
     async def test_list_user_jobs(
         self, sample_user: User, test_db_session: AsyncSession
@@ -145,6 +235,50 @@ class TestJobServices:
         assert result.page == 1
         assert result.per_page == 10
 
+    async def test_list_user_jobs_cursor_pagination(
+        self, sample_user: User, test_db_session: AsyncSession
+    ) -> None:
+        for i in range(5):
+            job = Job(
+                job_type=JobType.INDIVIDUAL,
+                status=JobStatus.PENDING,
+                user_id=sample_user.id,
+                urls=[f"https://example.com/game{i}"],
+                total_urls=1,
+            )
+            test_db_session.add(job)
+
+        await test_db_session.commit()
+
+        first_page = await list_user_jobs(
+            test_db_session, sample_user, per_page=2, include_total=False
+        )
+        assert len(first_page.jobs) == 2
+        assert first_page.total is None
+        assert first_page.next_cursor is not None
+
+        seen_ids = [job["job_id"] for job in first_page.jobs]
+        cursor: str | None = first_page.next_cursor
+
+        while cursor:
+            next_page = await list_user_jobs(
+                test_db_session, sample_user, per_page=2, cursor=cursor
+            )
+            assert next_page.total == 5
+            seen_ids.extend(job["job_id"] for job in next_page.jobs)
+            cursor = next_page.next_cursor
+
+        assert len(seen_ids) == 5
+        assert len(set(seen_ids)) == 5
+
+    async def test_list_user_jobs_invalid_cursor(
+        self, sample_user: User, test_db_session: AsyncSession
+    ) -> None:
+        with pytest.raises(HTTPException) as exc_info:
+            await list_user_jobs(test_db_session, sample_user, cursor="not-a-cursor")
+
+        assert exc_info.value.status_code == status.HTTP_400_BAD_REQUEST
+
     async def test_enable_sharing_success(
         self,
         sample_job: Job,
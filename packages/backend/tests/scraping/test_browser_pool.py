@@ -0,0 +1,152 @@
+from contextlib import nullcontext
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.scraping.browser_pool import BrowserPool
+
+
+def make_browser() -> MagicMock:
+    browser = MagicMock()
+    browser.is_connected.return_value = True
+    browser.new_page = AsyncMock(return_value=MagicMock(close=AsyncMock()))
+    browser.close = AsyncMock()
+    return browser
+
+
+def make_pool(
+    browsers: list[MagicMock], max_pages: int = 10, limiter: Any = None
+) -> BrowserPool:
+    pool = BrowserPool(
+        "wss://proxy",
+        max_size=1,
+        max_pages_per_session=max_pages,
+        idle_timeout_seconds=60,
+        limiter=limiter,
+    )
+    playwright: Any = MagicMock()
+    playwright.chromium.connect_over_cdp = AsyncMock(side_effect=browsers)
+    pool._playwright = playwright
+    return pool
+
+
+class TestBrowserPool:
+    @pytest.mark.unit
+    async def test_reuses_session_across_pages(self) -> None:
+        browser = make_browser()
+        pool = make_pool([browser])
+
+        for _ in range(3):
+            async with pool.page():
+                pass
+
+        assert pool.sessions_opened == 1
+        assert browser.new_page.await_count == 3
+        browser.close.assert_not_awaited()
+
+    @pytest.mark.unit
+    async def test_recycles_after_max_pages(self) -> None:
+        first, second = make_browser(), make_browser()
+        pool = make_pool([first, second], max_pages=2)
+
+        for _ in range(3):
+            async with pool.page():
+                pass
+
+        assert pool.sessions_opened == 2
+        first.close.assert_awaited_once()
+
+    @pytest.mark.unit
+    async def test_recycles_after_error(self) -> None:
+        first, second = make_browser(), make_browser()
+        pool = make_pool([first, second])
+
+        with pytest.raises(RuntimeError):
+            async with pool.page():
+                raise RuntimeError("navigation failed")
+
+        async with pool.page():
+            pass
+
+        first.close.assert_awaited_once()
+        assert second.new_page.await_count == 1
+
+    @pytest.mark.unit
+    async def test_replaces_disconnected_session(self) -> None:
+        first, second = make_browser(), make_browser()
+        pool = make_pool([first, second])
+
+        async with pool.page():
+            pass
+
+        first.is_connected.return_value = False
+
+        async with pool.page():
+            pass
+
+        assert pool.sessions_opened == 2
+        assert first.new_page.await_count == 1
+
+    @pytest.mark.unit
+    async def test_sessions_hold_proxy_slots_while_idle(self) -> None:
+        limiter = MagicMock(lease_seconds=60)
+        limiter.acquire = AsyncMock(return_value="lease")
+        limiter.acquire_request = AsyncMock()
+        limiter.extend = AsyncMock(return_value=True)
+        limiter.release = AsyncMock()
+        limiter.hold = MagicMock(return_value=nullcontext())
+        browser = make_browser()
+        pool = make_pool([browser], limiter=limiter)
+
+        for _ in range(2):
+            async with pool.page():
+                pass
+
+        limiter.acquire.assert_awaited_once()
+        limiter.acquire_request.assert_awaited_once()
+        limiter.release.assert_not_awaited()
+
+        # An idle session past the timeout is closed and its slot freed
+        pool._idle[0].idle_since -= 61
+        await pool.reap_idle()
+
+        browser.close.assert_awaited_once()
+        limiter.release.assert_awaited_once_with("lease")
+
+    @pytest.mark.unit
+    async def test_replaces_session_whose_slot_lapsed(self) -> None:
+        limiter = MagicMock(lease_seconds=60)
+        limiter.acquire = AsyncMock(side_effect=["first", "second"])
+        limiter.acquire_request = AsyncMock()
+        limiter.extend = AsyncMock(side_effect=[True, False, True])
+        limiter.release = AsyncMock()
+        limiter.hold = MagicMock(return_value=nullcontext())
+        first, second = make_browser(), make_browser()
+        pool = make_pool([first, second], limiter=limiter)
+
+        for _ in range(2):
+            async with pool.page():
+                pass
+
+        first.close.assert_awaited_once()
+        limiter.release.assert_awaited_once_with("first")
+        assert pool.sessions_opened == 2
+
+    @pytest.mark.unit
+    async def test_closes_session_whose_slot_lapsed_during_use(self) -> None:
+        limiter = MagicMock(lease_seconds=60)
+        limiter.acquire = AsyncMock(return_value="lease")
+        limiter.extend = AsyncMock(return_value=False)
+        limiter.release = AsyncMock()
+        limiter.hold = MagicMock(return_value=nullcontext())
+        browser = make_browser()
+        pool = make_pool([browser], limiter=limiter)
+
+        async with pool.page():
+            pass
+
+        # Not pooled, since nothing would count it against the proxy limit
+        browser.close.assert_awaited_once()
+        limiter.release.assert_awaited_once_with("lease")
+        assert not pool._idle
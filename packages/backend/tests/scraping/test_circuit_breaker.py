@@ -0,0 +1,109 @@
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.scraping.circuit_breaker import (
+    CircuitBreaker,
+    CircuitOpenError,
+    CircuitState,
+)
+from app.scraping.extractor import ReplayExtractionError, ScrapeCancelledError
+from app.scraping.retry import retry_delay_seconds
+
+
+def make_breaker(
+    eval_results: list[Any], status: list[Any] | None = None
+) -> tuple[CircuitBreaker, Any]:
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(return_value=status or [[None, None], 0, 0])
+    pipeline = MagicMock()
+    pipeline.__aenter__ = AsyncMock(return_value=pipe)
+    pipeline.__aexit__ = AsyncMock(return_value=None)
+
+    redis = MagicMock()
+    redis.eval = AsyncMock(side_effect=eval_results)
+    redis.pipeline.return_value = pipeline
+    redis.time = AsyncMock(return_value=(1_000, 0))
+    breaker = CircuitBreaker(
+        redis,
+        endpoint="proxy",
+        window_seconds=60,
+        min_calls=5,
+        failure_ratio=0.5,
+        cooldown_seconds=30,
+        probe_timeout_seconds=120,
+    )
+    return breaker, redis
+
+
+def recorded_outcome(redis: Any) -> str:
+    return str(redis.eval.await_args.args[5])
+
+
+class TestCircuitBreaker:
+    @pytest.mark.unit
+    async def test_records_success_and_failure(self) -> None:
+        breaker, redis = make_breaker([0, "closed", 0, "opened"])
+
+        async with breaker.call():
+            pass
+
+        assert recorded_outcome(redis) == "0"
+
+        with pytest.raises(ReplayExtractionError):
+            async with breaker.call():
+                raise ReplayExtractionError("no JSON")
+
+        assert recorded_outcome(redis) == "1"
+
+    @pytest.mark.unit
+    async def test_outcome_is_recorded_under_admitted_call_id(self) -> None:
+        breaker, redis = make_breaker([0, "closed"])
+
+        async with breaker.call():
+            pass
+
+        admit, record = redis.eval.await_args_list
+        # A half-open breaker only takes the outcome of the call it admitted
+        assert admit.args[-1] == record.args[6]
+
+    @pytest.mark.unit
+    async def test_cancellation_is_not_a_failure(self) -> None:
+        breaker, redis = make_breaker([0])
+
+        with pytest.raises(ScrapeCancelledError):
+            async with breaker.call():
+                raise ScrapeCancelledError("cancelled")
+
+        assert redis.eval.await_count == 1
+
+    @pytest.mark.unit
+    async def test_open_circuit_refuses_calls(self) -> None:
+        breaker, _ = make_breaker([12_500])
+
+        with pytest.raises(CircuitOpenError) as exc_info:
+            async with breaker.call():
+                pytest.fail("call ran while the circuit was open")
+
+        assert exc_info.value.retry_after_seconds == 12.5
+
+    @pytest.mark.unit
+    async def test_status_reports_time_until_probe(self) -> None:
+        breaker, _ = make_breaker([], status=[["open", "1004000"], 10, 7])
+
+        status = await breaker.status()
+
+        assert status.state == CircuitState.OPEN
+        assert status.recent_failures == 7
+        assert status.retry_after_seconds == 4.0
+
+
+class TestRetryDelay:
+    @pytest.mark.unit
+    def test_backoff_grows_up_to_cap(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr("app.scraping.retry.random.uniform", lambda _, high: high)
+
+        delays = [retry_delay_seconds(attempt) for attempt in range(7)]
+
+        assert delays == [10, 20, 40, 80, 160, 300, 300]
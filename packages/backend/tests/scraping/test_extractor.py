@@ -0,0 +1,137 @@
+import asyncio
+import inspect
+import json
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from app.scraping.extractor import (
+    ReplayExtractionError,
+    ReplayExtractor,
+    ScrapeCancelledError,
+    _parse_replay_json,
+)
+
+REPLAY = {"conceal": False, "plays": []}
+
+
+def make_page(on_goto: Callable[[dict[str, Any]], Any]) -> MagicMock:
+    handlers: dict[str, Any] = {}
+    page = MagicMock()
+    page.on.side_effect = lambda event, handler: handlers.__setitem__(event, handler)
+    page.route = AsyncMock()
+
+    async def goto(**kwargs: Any) -> None:
+        result = on_goto(handlers)
+
+        if inspect.isawaitable(result):
+            await result
+
+    page.goto = AsyncMock(side_effect=goto)
+    return page
+
+
+def make_extractor(page: MagicMock) -> ReplayExtractor:
+    pool = MagicMock()
+
+    @asynccontextmanager
+    async def lend_page() -> AsyncIterator[MagicMock]:
+        yield page
+
+    pool.page = lend_page
+    return ReplayExtractor(pool)
+
+
+class TestReplayExtractor:
+    @pytest.mark.unit
+    async def test_resolves_from_console_message(self) -> None:
+        def on_goto(handlers: dict[str, Any]) -> None:
+            handlers["console"](MagicMock(text="loading"))
+            handlers["console"](MagicMock(text=json.dumps(REPLAY)))
+
+        scrape = await make_extractor(make_page(on_goto)).extract_replay("url")
+
+        assert scrape.data == REPLAY
+        assert scrape.metrics.time_to_json_seconds >= 0
+
+    @pytest.mark.unit
+    async def test_resolves_from_network_response(self) -> None:
+        async def on_goto(handlers: dict[str, Any]) -> None:
+            response = MagicMock()
+            response.request.resource_type = "xhr"
+            response.text = AsyncMock(return_value=json.dumps(REPLAY))
+            await handlers["response"](response)
+
+            # Chunked, so sized by what was received rather than content-length
+            response.request.sizes = AsyncMock(return_value={"responseBodySize": 512})
+            await handlers["requestfinished"](response.request)
+
+        scrape = await make_extractor(make_page(on_goto)).extract_replay("url")
+
+        assert scrape.data == REPLAY
+        assert scrape.metrics.bytes_received == 512
+
+    @pytest.mark.unit
+    async def test_blocks_non_essential_resources(self) -> None:
+        page = make_page(
+            lambda handlers: handlers["console"](MagicMock(text=json.dumps(REPLAY)))
+        )
+        scrape = await make_extractor(page).extract_replay("url")
+        block = page.route.await_args.args[1]
+
+        for resource_type in ("image", "font", "document"):
+            route = MagicMock(abort=AsyncMock(), continue_=AsyncMock())
+            route.request.resource_type = resource_type
+            await block(route)
+
+        assert scrape.metrics.requests_blocked == 2
+
+    @pytest.mark.unit
+    async def test_times_out_without_replay_json(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(
+            "app.scraping.extractor.settings.SCRAPE_PAGE_TIMEOUT_MS", 10
+        )
+
+        with pytest.raises(ReplayExtractionError):
+            await make_extractor(make_page(lambda handlers: None)).extract_replay("url")
+
+    @pytest.mark.unit
+    async def test_wraps_navigation_timeout(self) -> None:
+        def on_goto(handlers: dict[str, Any]) -> None:
+            raise PlaywrightTimeoutError("Timeout 120000ms exceeded")
+
+        with pytest.raises(ReplayExtractionError):
+            await make_extractor(make_page(on_goto)).extract_replay("url")
+
+    @pytest.mark.unit
+    async def test_aborts_while_waiting_when_cancelled(self) -> None:
+        cancelled = asyncio.Event()
+        page = make_page(lambda handlers: cancelled.set())
+
+        with pytest.raises(ScrapeCancelledError):
+            await make_extractor(page).extract_replay("url", cancelled)
+
+        page.screenshot.assert_not_called()
+
+    @pytest.mark.unit
+    async def test_skips_navigation_when_already_cancelled(self) -> None:
+        cancelled = asyncio.Event()
+        cancelled.set()
+        page = make_page(lambda handlers: None)
+
+        with pytest.raises(ScrapeCancelledError):
+            await make_extractor(page).extract_replay("url", cancelled)
+
+        page.goto.assert_not_awaited()
+
+    @pytest.mark.unit
+    def test_parse_replay_json_ignores_concealed(self) -> None:
+        assert _parse_replay_json(json.dumps({"conceal": True})) is None
+        assert _parse_replay_json('{"conceal": false') is None
+        assert _parse_replay_json(json.dumps(REPLAY)) == REPLAY
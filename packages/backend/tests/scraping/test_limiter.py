@@ -0,0 +1,64 @@
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.scraping.limiter import ProxyCapacityError, ProxyLimiter
+
+
+def make_limiter(
+    eval_results: list[int], wait_timeout: float = 5.0
+) -> tuple[ProxyLimiter, Any]:
+    redis = MagicMock()
+    redis.eval = AsyncMock(side_effect=eval_results)
+    redis.zrem = AsyncMock()
+    redis.time = AsyncMock(return_value=(1_000, 500_000))
+    redis.zcount = AsyncMock(return_value=3)
+    limiter = ProxyLimiter(
+        redis,
+        max_sessions=4,
+        requests_per_minute=60,
+        lease_seconds=60,
+        wait_timeout_seconds=wait_timeout,
+    )
+    return limiter, redis
+
+
+class TestProxyLimiter:
+    @pytest.mark.unit
+    async def test_slot_releases_lease(self) -> None:
+        limiter, redis = make_limiter([0])
+
+        async with limiter.slot():
+            token = redis.eval.await_args.args[4]
+
+        redis.zrem.assert_awaited_once_with("brightdata:leases", token)
+
+    @pytest.mark.unit
+    async def test_waits_for_rate_token(self) -> None:
+        limiter, redis = make_limiter([5, 0])
+
+        async with limiter.slot():
+            pass
+
+        assert redis.eval.await_count == 2
+
+    @pytest.mark.unit
+    async def test_raises_when_no_slot_frees_up(self) -> None:
+        limiter, redis = make_limiter([-1], wait_timeout=0.1)
+
+        with pytest.raises(ProxyCapacityError):
+            async with limiter.slot():
+                pass
+
+        redis.zrem.assert_not_awaited()
+
+    @pytest.mark.unit
+    async def test_occupancy_counts_unexpired_leases(self) -> None:
+        limiter, redis = make_limiter([])
+
+        occupancy = await limiter.occupancy()
+
+        assert occupancy.active_sessions == 3
+        assert occupancy.max_sessions == 4
+        redis.zcount.assert_awaited_once_with("brightdata:leases", 1_000_500, "+inf")
@@ -0,0 +1,34 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.scraping.replays import (
+    canonical_replay_url,
+    get_replay_id,
+    get_scraped_s3_keys,
+    record_scraped_replay,
+)
+
+
+class TestReplayUrls:
+    @pytest.mark.unit
+    def test_get_replay_id(self) -> None:
+        assert get_replay_id("https://www.duelingbook.com/replay?id=123") == 123
+        assert get_replay_id("https://duelingbook.com/replay?foo=1&id=123") == 123
+        assert get_replay_id("https://duelingbook.com/replay?id=abc") is None
+        assert get_replay_id("https://example.com/game1") is None
+
+    @pytest.mark.unit
+    def test_canonical_replay_url(self) -> None:
+        assert get_replay_id(canonical_replay_url(42)) == 42
+
+
+class TestRecordScrapedReplay:
+    @pytest.mark.unit
+    async def test_keeps_existing_entry(self, test_db_session: AsyncSession) -> None:
+        await record_scraped_replay(test_db_session, 7, "replays/7.json")
+        await record_scraped_replay(test_db_session, 7, "replays/other.json")
+
+        url = canonical_replay_url(7)
+        s3_keys = await get_scraped_s3_keys(test_db_session, [url])
+
+        assert s3_keys == {url: "replays/7.json"}
@@ -0,0 +1,81 @@
+import asyncio
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.scraping.single_flight import scrape_replay_once
+
+
+def make_redis(
+    results: list[str | None], leases: list[bool], messages: list[str | None]
+) -> Any:
+    pubsub = MagicMock()
+    pubsub.subscribe = AsyncMock()
+    pubsub.unsubscribe = AsyncMock()
+    pubsub.aclose = AsyncMock()
+    pubsub.get_message = AsyncMock(
+        side_effect=[None if data is None else {"data": data} for data in messages]
+    )
+
+    redis = MagicMock()
+    redis.pubsub.return_value = pubsub
+    redis.get = AsyncMock(side_effect=results)
+    redis.set = AsyncMock(side_effect=[*leases, True])
+    redis.publish = AsyncMock()
+    redis.eval = AsyncMock(return_value=1)
+    return redis
+
+
+class TestScrapeReplayOnce:
+    @pytest.mark.unit
+    async def test_lease_holder_scrapes_and_publishes(self) -> None:
+        redis = make_redis(results=[None], leases=[True], messages=[])
+        scrape = AsyncMock(return_value="replays/1.json")
+
+        s3_key = await scrape_replay_once(redis, 1, scrape, asyncio.Event())
+
+        assert s3_key == "replays/1.json"
+        scrape.assert_awaited_once()
+        redis.publish.assert_awaited_once_with("replay_scrape:1:done", "replays/1.json")
+        redis.eval.assert_awaited_once()
+
+    @pytest.mark.unit
+    async def test_waiter_shares_published_result(self) -> None:
+        redis = make_redis(
+            results=[None, None],
+            leases=[False, False],
+            messages=[None, "replays/1.json"],
+        )
+        scrape = AsyncMock()
+
+        s3_key = await scrape_replay_once(redis, 1, scrape, asyncio.Event())
+
+        assert s3_key == "replays/1.json"
+        scrape.assert_not_awaited()
+
+    @pytest.mark.unit
+    async def test_waiter_takes_over_after_failure(self) -> None:
+        redis = make_redis(results=[None, None], leases=[False, True], messages=[""])
+        scrape = AsyncMock(return_value="replays/1.json")
+
+        s3_key = await scrape_replay_once(redis, 1, scrape, asyncio.Event())
+
+        assert s3_key == "replays/1.json"
+        scrape.assert_awaited_once()
+
+    @pytest.mark.unit
+    async def test_failed_scrape_wakes_waiters(self) -> None:
+        redis = make_redis(results=[None], leases=[True], messages=[])
+        scrape = AsyncMock(side_effect=RuntimeError("proxy down"))
+        calls = MagicMock()
+        calls.attach_mock(redis.eval, "release")
+        calls.attach_mock(redis.publish, "publish")
+
+        with pytest.raises(RuntimeError):
+            await scrape_replay_once(redis, 1, scrape, asyncio.Event())
+
+        redis.publish.assert_awaited_once_with("replay_scrape:1:done", "")
+        # The lease is free by the time waiters wake up to take it over
+        assert [call[0] for call in calls.mock_calls] == ["release", "publish"]
+        redis.pubsub.return_value.unsubscribe.assert_awaited_once()
@@ -0,0 +1,86 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from app.storage.disk_cache import DiskCache
+
+
+class TestDiskCache:
+    @pytest.mark.unit
+    def test_round_trip_and_stats(self, tmp_path: Path) -> None:
+        cache = DiskCache(str(tmp_path), max_bytes=1024)
+
+        assert cache.get("replays/1.json") is None
+        cache.put("replays/1.json", b'{"a": 1}')
+
+        assert cache.get("replays/1.json") == b'{"a": 1}'
+        assert cache.stats.hits == 1
+        assert cache.stats.misses == 1
+        assert cache.stats.hit_rate == 0.5
+
+    @pytest.mark.unit
+    def test_evicts_least_recently_used(self, tmp_path: Path) -> None:
+        cache = DiskCache(str(tmp_path), max_bytes=350)
+
+        for index, key in enumerate(["a", "b", "c"]):
+            cache.put(key, b"x" * 100)
+            # Distinct mtimes, oldest first
+            os.utime(cache._path(key), (index, index))
+
+        cache.get("a")
+        cache.put("d", b"x" * 100)
+
+        assert cache.get("b") is None
+        assert all(cache.get(key) for key in ["a", "c", "d"])
+        assert cache.stats.evictions == 1
+        assert cache.disk_usage() == 300
+
+    @pytest.mark.unit
+    def test_budget_is_shared_between_processes(self, tmp_path: Path) -> None:
+        caches = [DiskCache(str(tmp_path), max_bytes=350) for _ in range(2)]
+
+        # The second process's writes must count against the first one's budget
+        for index, owner in enumerate([0, 1, 0, 0]):
+            caches[owner].put(str(index), b"x" * 100)
+
+        assert caches[0].disk_usage() <= 350
+
+    @pytest.mark.unit
+    def test_hit_survives_eviction_after_read(
+        self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    ) -> None:
+        cache = DiskCache(str(tmp_path), max_bytes=1024)
+        cache.put("a", b"x")
+
+        def utime(_: Path) -> None:
+            raise FileNotFoundError
+
+        monkeypatch.setattr("app.storage.disk_cache.os.utime", utime)
+
+        assert cache.get("a") == b"x"
+        assert cache.stats.hits == 1
+
+    @pytest.mark.unit
+    def test_skips_objects_over_budget(self, tmp_path: Path) -> None:
+        cache = DiskCache(str(tmp_path), max_bytes=10)
+
+        cache.put("big", b"x" * 11)
+
+        assert cache.get("big") is None
+        assert cache.disk_usage() == 0
+
+    @pytest.mark.unit
+    def test_startup_removes_stale_temp_files(self, tmp_path: Path) -> None:
+        (tmp_path / "ab").mkdir()
+        stale = tmp_path / "ab" / ".tmp-stale"
+        fresh = tmp_path / "ab" / ".tmp-fresh"
+        stale.write_bytes(b"x" * 100)
+        fresh.write_bytes(b"x" * 100)
+        os.utime(stale, (0, 0))
+
+        DiskCache(str(tmp_path), max_bytes=1024)
+
+        assert not stale.exists()
+        # Possibly still being written by another process
+        assert fresh.exists()
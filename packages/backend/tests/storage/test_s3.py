@@ -0,0 +1,167 @@
+import asyncio
+import gzip
+import json
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from botocore.exceptions import ClientError
+
+from app.storage.disk_cache import DiskCache
+from app.storage.s3 import S3Service
+
+
+def make_service(client: MagicMock) -> S3Service:
+    service = S3Service()
+    client_context = MagicMock()
+    client_context.__aenter__ = AsyncMock(return_value=client)
+    client_context.__aexit__ = AsyncMock(return_value=None)
+    service._session = MagicMock()
+    service._session.client.return_value = client_context
+    return service
+
+
+class TestS3Service:
+    @pytest.mark.unit
+    async def test_put_json_compressed(self) -> None:
+        client = MagicMock()
+        client.put_object = AsyncMock()
+
+        await make_service(client).put_json(
+            "results/1.json.gz", {"a": 1}, compress=True
+        )
+
+        kwargs = client.put_object.call_args.kwargs
+        assert kwargs["ContentEncoding"] == "gzip"
+        assert kwargs["Metadata"] == {"encoding": "gzip"}
+        assert json.loads(gzip.decompress(kwargs["Body"])) == {"a": 1}
+
+    @pytest.mark.unit
+    async def test_get_json_decompresses(self) -> None:
+        body = MagicMock()
+        body.read = AsyncMock(return_value=gzip.compress(b'{"a": 1}'))
+        client = MagicMock()
+        client.get_object = AsyncMock(
+            return_value={"Body": body, "ContentEncoding": "gzip"}
+        )
+
+        assert await make_service(client).get_json("results/1.json.gz") == {"a": 1}
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize(
+        ("stored", "tags"),
+        [
+            (b'{"a": 1}', {}),
+            (gzip.compress(b'{"a": 1}'), {"Metadata": {"encoding": "gzip"}}),
+        ],
+    )
+    async def test_get_json_reads_plain_and_tagged_objects(
+        self, stored: bytes, tags: dict[str, dict[str, str]]
+    ) -> None:
+        body = MagicMock()
+        body.read = AsyncMock(return_value=stored)
+        client = MagicMock()
+        client.get_object = AsyncMock(return_value={"Body": body, **tags})
+
+        assert await make_service(client).get_json("replays/1.json") == {"a": 1}
+
+    @pytest.mark.unit
+    async def test_get_many_bounds_concurrency(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(
+            "app.storage.s3.settings.AWS_S3_MAX_CONCURRENT_DOWNLOADS", 2
+        )
+        active = 0
+        peak = 0
+
+        async def get_object(Bucket: str, Key: str) -> dict[str, MagicMock]:
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+            body = MagicMock()
+            body.read = AsyncMock(return_value=json.dumps({"key": Key}).encode())
+            return {"Body": body}
+
+        client = MagicMock()
+        client.get_object = get_object
+        keys = [f"replays/{i}.json" for i in range(5)]
+
+        fetched = {key: data async for key, data in make_service(client).get_many(keys)}
+
+        assert fetched == {key: json.dumps({"key": key}).encode() for key in keys}
+        assert peak == 2
+
+    @pytest.mark.unit
+    async def test_get_bytes_missing_object(self) -> None:
+        client = MagicMock()
+        client.get_object = AsyncMock(
+            side_effect=ClientError({"Error": {"Code": "NoSuchKey"}}, "GetObject")
+        )
+
+        assert await make_service(client).get_bytes("replays/1.plays.parquet") is None
+
+    @pytest.mark.unit
+    async def test_get_json_reads_through_disk_cache(self, tmp_path: Path) -> None:
+        body = MagicMock()
+        body.read = AsyncMock(return_value=b'{"a": 1}')
+        client = MagicMock()
+        client.get_object = AsyncMock(return_value={"Body": body})
+        service = make_service(client)
+        service.disk_cache = DiskCache(str(tmp_path), max_bytes=1024)
+
+        assert await service.get_json("replays/1.json") == {"a": 1}
+        assert await service.get_json("replays/1.json") == {"a": 1}
+
+        client.get_object.assert_awaited_once()
+        assert service.disk_cache.stats.hits == 1
+
+    @pytest.mark.unit
+    async def test_disk_cache_keeps_objects_compressed(self, tmp_path: Path) -> None:
+        stored = gzip.compress(b'{"a": 1}')
+        body = MagicMock()
+        body.read = AsyncMock(return_value=stored)
+        client = MagicMock()
+        client.get_object = AsyncMock(
+            return_value={"Body": body, "ContentEncoding": "gzip"}
+        )
+        service = make_service(client)
+        service.disk_cache = DiskCache(str(tmp_path), max_bytes=1024)
+
+        assert await service.get_json("results/1.json.gz") == {"a": 1}
+        assert await service.get_json("results/1.json.gz") == {"a": 1}
+
+        client.get_object.assert_awaited_once()
+        assert service.disk_cache.disk_usage() == len(stored) + 1
+
+    @pytest.mark.unit
+    async def test_get_many_waits_for_slow_consumer(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(
+            "app.storage.s3.settings.AWS_S3_MAX_CONCURRENT_DOWNLOADS", 2
+        )
+        started: list[str] = []
+
+        async def get_object(Bucket: str, Key: str) -> dict[str, MagicMock]:
+            started.append(Key)
+            body = MagicMock()
+            body.read = AsyncMock(return_value=b"{}")
+            return {"Body": body}
+
+        client = MagicMock()
+        client.get_object = get_object
+        keys = [f"replays/{i}.json" for i in range(5)]
+        bodies = make_service(client).get_many(keys)
+
+        await anext(bodies)
+        await asyncio.sleep(0.01)
+
+        # One body is with the consumer and one waits; nothing else downloads
+        assert len(started) == 2
+
+        remaining = [key async for key, _ in bodies]
+        assert len(remaining) == 4
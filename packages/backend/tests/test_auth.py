@@ -5,7 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.jwt_handler import JWTHandler, jwt_handler
 from app.auth.models import UserContext, AuthError
-from app.auth.dependencies import get_user_context, get_current_user
+from app.auth.dependencies import get_user_context, get_current_user, user_cache
 from app.db.models import User
 
 
@@ -116,6 +116,70 @@ class TestJWTHandler:
             # Verify only one network call was made
             mock_client.return_value.__aenter__.return_value.get.assert_called_once()
 
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_get_jwks_single_flight(
+        self, mock_jwks: dict[str, list[dict[str, str]]]
+    ) -> None:
+        """Test concurrent callers share one JWKS fetch on the shared client."""
+        import asyncio
+
+        handler = JWTHandler()
+        mock_response = MagicMock()
+        mock_response.json.return_value = mock_jwks
+        mock_response.raise_for_status.return_value = None
+
+        async def slow_get(*args: object, **kwargs: object) -> MagicMock:
+            await asyncio.sleep(0.01)
+            return mock_response
+
+        handler._client = MagicMock()
+        handler._client.get = AsyncMock(side_effect=slow_get)
+
+        results = await asyncio.gather(*(handler.get_jwks() for _ in range(5)))
+
+        assert all(result == mock_jwks for result in results)
+        handler._client.get.assert_called_once()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_get_jwks_forced_refresh_rate_limited(
+        self, mock_jwks: dict[str, list[dict[str, str]]]
+    ) -> None:
+        """Test unknown-kid refreshes cannot trigger repeated fetches."""
+        handler = JWTHandler()
+        mock_response = MagicMock()
+        mock_response.json.return_value = mock_jwks
+        mock_response.raise_for_status.return_value = None
+        handler._client = MagicMock()
+        handler._client.get = AsyncMock(return_value=mock_response)
+
+        await handler.get_jwks()
+        for _ in range(3):
+            await handler.get_jwks(force_refresh=True)
+
+        handler._client.get.assert_called_once()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_get_jwks_backs_off_after_failed_refresh(
+        self, mock_jwks: dict[str, list[dict[str, str]]]
+    ) -> None:
+        """Test a failed refresh serves cached keys without refetching."""
+        import httpx
+
+        handler = JWTHandler()
+        handler._jwks_cache = mock_jwks
+        handler._client = MagicMock()
+        handler._client.get = AsyncMock(side_effect=httpx.HTTPError("Clerk down"))
+
+        for _ in range(3):
+            assert await handler.get_jwks() == mock_jwks
+            assert await handler.get_jwks(force_refresh=True) == mock_jwks
+
+        handler._client.get.assert_called_once()
+        assert handler._is_backing_off()
+
     @pytest.mark.unit
     def test_extract_user_info(
         self, valid_jwt_claims: dict[str, str | int | bool]
@@ -148,6 +212,29 @@ class TestJWTHandler:
 
                     assert result == valid_jwt_claims
 
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_verify_token_caches_claims(
+        self,
+        mock_jwks: dict[str, list[dict[str, str]]],
+        valid_jwt_claims: dict[str, str | int | bool],
+    ) -> None:
+        """Test repeated tokens are served from the verified-claims cache."""
+        handler = JWTHandler()
+        test_token = "test.jwt.token"
+
+        with patch.object(handler, "get_jwks", return_value=mock_jwks):
+            with patch(
+                "jose.jwt.get_unverified_header", return_value={"kid": "test-key-id"}
+            ):
+                with patch("jose.jwt.decode", return_value=valid_jwt_claims) as decode:
+                    first = await handler.verify_token(test_token)
+                    second = await handler.verify_token(test_token)
+
+        assert first == second == valid_jwt_claims
+        decode.assert_called_once()
+        assert handler.claims_cache_stats()["hits"] == 1
+
     @pytest.mark.unit
     @pytest.mark.asyncio
     async def test_verify_token_empty(self) -> None:
@@ -329,40 +416,37 @@ class TestAuthDependencies:
     @pytest.mark.asyncio
     async def test_get_current_user_new(self, test_db_session: AsyncSession) -> None:
         """Test creating new user when doesn't exist."""
-        # Create user context for non-existent user
         user_context = UserContext(clerk_user_id="new_user_456")
 
-        # Mock the database operations to avoid server defaults
-        with patch.object(test_db_session, "add") as mock_add:
-            with patch.object(test_db_session, "commit") as mock_commit:
-                with patch.object(test_db_session, "refresh") as mock_refresh:
-                    import uuid
-                    from datetime import datetime
-
-                    # Create a mock user that would be returned
-                    mock_user = User(
-                        id=uuid.uuid4(),
-                        clerk_user_id="new_user_456",
-                        created_at=datetime.now(),
-                        updated_at=datetime.now(),
-                    )
-
-                    # Mock refresh to populate the user
-                    def mock_refresh_side_effect(user: User) -> None:
-                        user.id = mock_user.id
-                        user.created_at = mock_user.created_at
-                        user.updated_at = mock_user.updated_at
-
-                    mock_refresh.side_effect = mock_refresh_side_effect
-
-                    # Get current user (should create new one)
-                    result = await get_current_user(user_context, test_db_session)
-
-                    assert result.clerk_user_id == "new_user_456"
-                    assert result.id is not None
-                    assert user_context.user_id == str(result.id)
-
-                    # Verify mocks were called
-                    mock_add.assert_called_once()
-                    mock_commit.assert_called_once()
-                    mock_refresh.assert_called_once()
+        result = await get_current_user(user_context, test_db_session)
+
+        assert result.clerk_user_id == "new_user_456"
+        assert result.id is not None
+        assert result.created_at is not None
+        assert user_context.user_id == str(result.id)
+
+        # A second first-sight insert for the same user must not conflict
+        user_cache.clear()
+        repeat = await get_current_user(
+            UserContext(clerk_user_id="new_user_456"), test_db_session
+        )
+
+        assert repeat.id == result.id
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_get_current_user_cached(self, test_db_session: AsyncSession) -> None:
+        """Test cached users are resolved without querying the database."""
+        first = await get_current_user(
+            UserContext(clerk_user_id="cached_user"), test_db_session
+        )
+
+        with patch.object(test_db_session, "execute") as mock_execute:
+            second = await get_current_user(
+                UserContext(clerk_user_id="cached_user"), test_db_session
+            )
+
+        mock_execute.assert_not_called()
+        assert second.id == first.id
+        assert second.created_at == first.created_at
+        assert second in test_db_session
@@ -0,0 +1,33 @@
+from unittest.mock import patch
+
+import pytest
+
+from app.auth.cache import TTLCache
+
+
+class TestTTLCache:
+    """Unit tests for the bounded TTL cache."""
+
+    @pytest.mark.unit
+    def test_evicts_least_recently_used(self) -> None:
+        cache: TTLCache[str, int] = TTLCache(max_size=2, ttl_seconds=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+    @pytest.mark.unit
+    def test_entries_expire(self) -> None:
+        cache: TTLCache[str, int] = TTLCache(max_size=2, ttl_seconds=60)
+
+        with patch("app.auth.cache.time.monotonic", return_value=100.0):
+            cache.set("a", 1)
+
+        with patch("app.auth.cache.time.monotonic", return_value=161.0):
+            assert cache.get("a") is None
+
+        assert len(cache) == 0
@@ -0,0 +1,76 @@
+from typing import Any
+
+import pytest
+
+
+@pytest.fixture
+def sample_replay() -> dict[str, Any]:
+    """Two-game replay: alice wins game 1, bob wins game 2."""
+    return {
+        "date": "2025-01-01 12:00:00",
+        "conceal": False,
+        "player1": {"username": "alice"},
+        "player2": {"username": "bob"},
+        "plays": [
+            {
+                "seconds": 1,
+                "play": "Go first",
+                "owner": None,
+                "log": {"username": "alice", "public_log": "Chose to go first"},
+            },
+            {
+                "seconds": 2,
+                "play": "Draw card",
+                "owner": "alice",
+                "log": [
+                    {
+                        "username": "alice",
+                        "public_log": "Drew card",
+                        "private_log": 'Drew "Ash Blossom"',
+                    }
+                ],
+            },
+            {
+                "seconds": 3,
+                "play": "Duel message",
+                "owner": "bob",
+                "log": {"username": "bob", "public_log": 'Said "hello"'},
+            },
+            {
+                "seconds": 4,
+                "play": "Admit defeat",
+                "owner": "bob",
+                "log": {"username": "bob", "public_log": "Admitted defeat"},
+            },
+            {
+                "seconds": 5,
+                "play": "Go first",
+                "owner": None,
+                "log": {"username": "bob", "public_log": "Chose to go first"},
+            },
+            {
+                "seconds": 6,
+                "play": "Add card",
+                "owner": "bob",
+                "log": {
+                    "username": "bob",
+                    "public_log": 'Added "Maxx C" from Deck to hand',
+                },
+            },
+            {
+                "seconds": 7,
+                "play": "Return card",
+                "owner": "bob",
+                "log": {
+                    "username": "bob",
+                    "public_log": 'Returned "Maxx C" to top of deck',
+                },
+            },
+            {
+                "seconds": 8,
+                "play": "Lose duel",
+                "owner": "alice",
+                "log": {"username": "alice", "public_log": "Lost Duel"},
+            },
+        ],
+    }
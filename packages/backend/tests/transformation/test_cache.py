@@ -0,0 +1,85 @@
+import asyncio
+from typing import Any
+
+import pytest
+
+from app.transformation.cache import get_or_compute, results_cache_key
+
+
+class FakeRedis:
+    """Just enough of the Redis API for the cache's get/set-NX/eval calls."""
+
+    def __init__(self) -> None:
+        self.values: dict[str, str] = {}
+        self.renewals = 0
+
+    async def get(self, key: str) -> str | None:
+        return self.values.get(key)
+
+    async def set(self, key: str, value: str, nx: bool = False, **_: Any) -> bool:
+        if nx and key in self.values:
+            return False
+        self.values[key] = value
+        return True
+
+    async def eval(
+        self, script: str, numkeys: int, key: str, token: str, *_: str
+    ) -> int:
+        if self.values.get(key) != token:
+            return 0
+        if "pexpire" in script:
+            self.renewals += 1
+        else:
+            del self.values[key]
+        return 1
+
+
+class TestResultsCache:
+    @pytest.mark.unit
+    def test_results_cache_key(self) -> None:
+        key = results_cache_key(["b.json", "a.json"], "1")
+
+        assert key == results_cache_key(["a.json", "b.json", "a.json"], "1")
+        assert key != results_cache_key(["a.json", "b.json"], "2")
+
+    @pytest.mark.unit
+    async def test_get_or_compute_single_flight(self) -> None:
+        redis: Any = FakeRedis()
+        calls = 0
+
+        async def compute() -> dict[str, Any]:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return {"summary": {"total_games": 3}}
+
+        results = await asyncio.gather(
+            *(get_or_compute(redis, "results:abc", compute) for _ in range(5))
+        )
+
+        assert calls == 1
+        assert all(result == {"summary": {"total_games": 3}} for result in results)
+        assert "results:abc:lock" not in redis.values
+
+    @pytest.mark.unit
+    async def test_get_or_compute_renews_lock_for_slow_compute(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        # Renew every 10ms, so waiters outlive several lock periods
+        monkeypatch.setattr("app.transformation.cache._LOCK_TTL_MS", 30)
+        monkeypatch.setattr("app.transformation.cache._POLL_INTERVAL_SECONDS", 0.01)
+        redis: Any = FakeRedis()
+        calls = 0
+
+        async def compute() -> dict[str, Any]:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.1)
+            return {"summary": {"total_games": 3}}
+
+        await asyncio.gather(
+            *(get_or_compute(redis, "results:abc", compute) for _ in range(3))
+        )
+
+        assert calls == 1
+        assert redis.renewals > 0
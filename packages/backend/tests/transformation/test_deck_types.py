@@ -0,0 +1,81 @@
+import sys
+from typing import Any
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from app.transformation.deck_types import (
+    DeckTypeClassifier,
+    DeckTypeModelError,
+    load_deck_type_classifier,
+)
+from app.transformation.service import TransformationService
+
+
+@pytest.fixture
+def classifier() -> DeckTypeClassifier:
+    vectorizer = MagicMock()
+    vectorizer.transform.side_effect = lambda cards_strs: cards_strs
+
+    model = MagicMock()
+    model.classes_ = np.array([0, 1])
+    model.predict_proba.side_effect = lambda cards_strs: np.array(
+        [[0.2, 0.8] if "Maxx C" in cards else [0.9, 0.1] for cards in cards_strs]
+    )
+
+    label_encoder = MagicMock()
+    label_encoder.inverse_transform.side_effect = lambda labels: np.array(
+        ["Snake-Eye" if label else "Unknown" for label in labels]
+    )
+
+    return DeckTypeClassifier(label_encoder, vectorizer, model)
+
+
+class TestDeckTypeClassifier:
+    @pytest.mark.unit
+    def test_predict_many(self, classifier: DeckTypeClassifier) -> None:
+        predictions = classifier.predict_many(
+            [
+                [{"card_name": "Maxx C", "card_amount": 2}],
+                [{"card_name": "Ash Blossom", "card_amount": 1}],
+            ]
+        )
+
+        assert predictions == [("Snake-Eye", 0.8), ("Unknown", 0.9)]
+        classifier.vectorizer.transform.assert_called_once_with(
+            ["Maxx C|Maxx C", "Ash Blossom"]
+        )
+
+    @pytest.mark.unit
+    def test_service_batches_whole_job(
+        self, classifier: DeckTypeClassifier, sample_replay: dict[str, Any]
+    ) -> None:
+        results = TransformationService(classifier).transform_individual_results(
+            [sample_replay, sample_replay]
+        )
+
+        games = results["detailed_results"]["games"]
+        assert len(games) == 4
+        assert [game["player2_deck_type"] for game in games] == [
+            "Unknown",
+            "Snake-Eye",
+            "Unknown",
+            "Snake-Eye",
+        ]
+        classifier.model.predict_proba.assert_called_once()
+
+    @pytest.mark.unit
+    def test_missing_model_stack_is_a_config_error(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        for name in ["LABEL_ENCODER", "VECTORIZER", "MODEL"]:
+            monkeypatch.setattr(
+                f"app.transformation.deck_types.settings.DECK_TYPE_{name}_PATH",
+                f"/models/{name.lower()}.joblib",
+            )
+        # A None entry makes the import fail as if joblib were not installed
+        monkeypatch.setitem(sys.modules, "joblib", None)
+
+        with pytest.raises(DeckTypeModelError, match="joblib"):
+            load_deck_type_classifier()
@@ -0,0 +1,80 @@
+import json
+from typing import Any
+
+import pandas as pd
+import pytest
+
+from app.transformation.parser import (
+    add_play_features,
+    create_plays_df,
+    create_replay_plays_df,
+    parse_replay,
+    stream_replay_plays_df,
+)
+
+
+class TestReplayParser:
+    @pytest.mark.unit
+    def test_add_play_features(self, sample_replay: dict[str, Any]) -> None:
+        plays_df = add_play_features(create_plays_df(sample_replay))
+
+        assert plays_df["card_name"].iloc[1] == "Ash Blossom"
+        assert plays_df["card_name"].iloc[2:4].isna().all()
+        assert plays_df["deck_change"].tolist() == [0, 1, 0, 0, 0, 1, -1, 0]
+        assert plays_df["game_number"].tolist() == [1, 1, 1, 1, 2, 2, 2, 2]
+
+    @pytest.mark.unit
+    def test_parse_replay(self, sample_replay: dict[str, Any]) -> None:
+        games_df = parse_replay(sample_replay)
+
+        assert games_df is not None
+        games = games_df.to_dict("records")
+        assert [game["game_winner"] for game in games] == ["alice", "bob"]
+        assert [game["went_first"] for game in games] == ["alice", "bob"]
+        assert games[0]["player1_cards"] == [
+            {"card_name": "Ash Blossom", "card_amount": 1}
+        ]
+        assert games[1]["player2_cards"] == [{"card_name": "Maxx C", "card_amount": 1}]
+
+    @pytest.mark.unit
+    def test_parse_replay_invalid(self) -> None:
+        assert parse_replay({"date": "2025-01-01"}) is None
+
+    @pytest.mark.unit
+    def test_stream_matches_loaded_replay(self, sample_replay: dict[str, Any]) -> None:
+        body = json.dumps(sample_replay, indent=2).encode()
+
+        streamed = stream_replay_plays_df(body)
+        loaded = create_replay_plays_df(sample_replay)
+
+        assert streamed is not None and loaded is not None
+        pd.testing.assert_frame_equal(streamed, loaded)
+        assert streamed.attrs == loaded.attrs
+
+    @pytest.mark.unit
+    def test_stream_fills_keys_missing_from_earlier_rows(self) -> None:
+        replay = {
+            "plays": [
+                {"seconds": 1, "play": "a", "log": {"username": "x"}},
+                {
+                    "seconds": 2,
+                    "play": "b",
+                    "log": {"username": "y", "extra": {"n": 1}},
+                },
+            ],
+            "player1": {"username": "x"},
+            "player2": {"username": "y"},
+        }
+
+        streamed = stream_replay_plays_df(json.dumps(replay))
+
+        assert streamed is not None
+        pd.testing.assert_frame_equal(streamed, create_replay_plays_df(replay))
+
+    @pytest.mark.unit
+    def test_stream_invalid(self) -> None:
+        assert stream_replay_plays_df(b'{"date": "2025-01-01"}') is None
+        assert stream_replay_plays_df(b"[]") is None
+
+        with pytest.raises(json.JSONDecodeError):
+            stream_replay_plays_df(b'{"plays": [],}')
@@ -0,0 +1,69 @@
+import json
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import pandas as pd
+import pytest
+
+from app.transformation.parser import parse_plays_df, parse_replay
+from app.transformation.plays_cache import load_replay_plays, plays_cache_key
+
+
+class TestPlaysCache:
+    @pytest.mark.unit
+    def test_key_is_tagged_with_parser_version(self) -> None:
+        assert plays_cache_key("replays/1.json", "3") == "replays/1.plays-v3.parquet"
+
+    @pytest.mark.unit
+    async def test_miss_parses_and_stores_table(
+        self, monkeypatch: pytest.MonkeyPatch, sample_replay: dict[str, Any]
+    ) -> None:
+        monkeypatch.setattr(
+            "app.transformation.plays_cache.settings.PLAYS_CACHE_ENABLED", True
+        )
+        monkeypatch.setattr(
+            "app.transformation.plays_cache._to_parquet", lambda _: b"table"
+        )
+
+        objects = {"replays/1.json": json.dumps(sample_replay).encode()}
+
+        with patch("app.transformation.plays_cache.s3_service") as mock_s3:
+            mock_s3.get_bytes = AsyncMock(side_effect=objects.get)
+            mock_s3.put_bytes = AsyncMock()
+
+            (plays_df,) = await load_replay_plays(["replays/1.json"])
+
+        assert plays_df is not None
+        assert plays_df.attrs["player1"] == "alice"
+        key, body, _ = mock_s3.put_bytes.call_args.args
+        assert (key, body) == (plays_cache_key("replays/1.json"), b"table")
+
+    @pytest.mark.unit
+    async def test_hit_round_trips_through_parquet(
+        self, monkeypatch: pytest.MonkeyPatch, sample_replay: dict[str, Any]
+    ) -> None:
+        monkeypatch.setattr(
+            "app.transformation.plays_cache.settings.PLAYS_CACHE_ENABLED", True
+        )
+        stored = {"replays/1.json": json.dumps(sample_replay).encode()}
+        reads: list[str] = []
+
+        async def put_bytes(key: str, body: bytes, content_type: str) -> None:
+            stored[key] = body
+
+        async def get_bytes(key: str) -> bytes | None:
+            reads.append(key)
+            return stored.get(key)
+
+        with patch("app.transformation.plays_cache.s3_service") as mock_s3:
+            mock_s3.get_bytes = get_bytes
+            mock_s3.put_bytes = put_bytes
+
+            await load_replay_plays(["replays/1.json"])
+            (plays_df,) = await load_replay_plays(["replays/1.json"])
+
+        assert reads.count("replays/1.json") == 1
+        assert plays_df is not None
+        pd.testing.assert_frame_equal(
+            parse_plays_df(plays_df), parse_replay(sample_replay)
+        )
@@ -0,0 +1,94 @@
+import json
+from collections.abc import AsyncIterator
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import Job, JobStatus, JobType, ScrapedData, User
+from app.transformation.results import (
+    get_job_results_payload,
+    materialize_job_results,
+)
+
+
+class TestJobResults:
+    @pytest.fixture
+    async def completed_job(self, test_db_session: AsyncSession) -> Job:
+        user = User(clerk_user_id="user_123")
+        test_db_session.add(user)
+        await test_db_session.commit()
+
+        job = Job(
+            job_type=JobType.INDIVIDUAL,
+            status=JobStatus.COMPLETED,
+            user_id=user.id,
+            urls=["https://duelingbook.com/replay?id=1"],
+            total_urls=1,
+            processed_urls=1,
+        )
+        test_db_session.add_all(
+            [
+                job,
+                ScrapedData(
+                    url="https://duelingbook.com/replay?id=1",
+                    replay_id=1,
+                    s3_key="replays/1.json",
+                ),
+            ]
+        )
+        await test_db_session.commit()
+        return job
+
+    async def test_materialize_job_results(
+        self,
+        completed_job: Job,
+        test_db_session: AsyncSession,
+        mock_redis: MagicMock,
+        sample_replay: dict[str, Any],
+    ) -> None:
+        async def get_many(keys: list[str]) -> AsyncIterator[tuple[str, bytes]]:
+            for key in keys:
+                yield key, json.dumps(sample_replay).encode()
+
+        with (
+            patch("app.transformation.results.s3_service") as mock_s3,
+            patch("app.transformation.plays_cache.s3_service", mock_s3),
+        ):
+            mock_s3.get_many = MagicMock(side_effect=get_many)
+            mock_s3.put_json = AsyncMock()
+
+            key = await materialize_job_results(
+                test_db_session, mock_redis, completed_job
+            )
+
+        assert key == f"results/{completed_job.id}.json.gz"
+        assert completed_job.results_s3_key == key
+        mock_s3.get_many.assert_called_once_with(["replays/1.json"])
+        stored_key, payload = mock_s3.put_json.call_args.args
+        assert stored_key == key
+        assert payload["summary"]["total_games"] == 2
+        assert mock_s3.put_json.call_args.kwargs == {"compress": True}
+        # Early readers of the completed job wait on the same cache entry
+        assert mock_redis.set.await_args.args[0].startswith("results:")
+
+    async def test_get_job_results_payload_reads_artifact(
+        self,
+        completed_job: Job,
+        test_db_session: AsyncSession,
+        mock_redis: MagicMock,
+    ) -> None:
+        completed_job.results_s3_key = "results/job.json.gz"
+        artifact = {"summary": {}, "detailed_results": {}, "generated_at": "now"}
+
+        with patch("app.transformation.results.s3_service") as mock_s3:
+            mock_s3.get_json = AsyncMock(return_value=artifact)
+
+            payload = await get_job_results_payload(
+                test_db_session, mock_redis, completed_job
+            )
+
+        assert payload == artifact
+        mock_s3.get_json.assert_awaited_once_with("results/job.json.gz")
+        mock_redis.get.assert_not_called()
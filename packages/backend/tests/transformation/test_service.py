@@ -0,0 +1,26 @@
+from typing import Any
+
+import pytest
+
+from app.transformation.service import TransformationService
+
+
+class TestTransformationService:
+    @pytest.mark.unit
+    def test_transform_individual_results(self, sample_replay: dict[str, Any]) -> None:
+        results = TransformationService().transform_individual_results(
+            [sample_replay, {"invalid": True}]
+        )
+
+        assert results["summary"]["total_replays"] == 2
+        assert results["summary"]["parsed_replays"] == 1
+        assert results["summary"]["total_games"] == 2
+        assert results["summary"]["players"]["alice"] == {
+            "games": 2,
+            "wins": 1,
+            "losses": 1,
+            "draws": 0,
+        }
+        assert results["detailed_results"]["games"][0]["played_at"].startswith(
+            "2025-01-01"
+        )
@@ -0,0 +1,57 @@
+import asyncio
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.worker.cancellation import (
+    estimate_scrape_seconds,
+    register_job_tasks,
+    watch_job_cancellation,
+)
+
+
+def make_redis(is_cancelled: list[int]) -> MagicMock:
+    pipe = MagicMock()
+    pipe.execute = AsyncMock()
+    pipeline = MagicMock()
+    pipeline.__aenter__ = AsyncMock(return_value=pipe)
+    pipeline.__aexit__ = AsyncMock(return_value=None)
+
+    redis = MagicMock()
+    redis.pipeline.return_value = pipeline
+    redis.exists = AsyncMock(side_effect=is_cancelled)
+    redis.get = AsyncMock(return_value=None)
+    return redis
+
+
+class TestJobCancellation:
+    @pytest.mark.unit
+    async def test_register_reports_earlier_cancel(self) -> None:
+        redis = make_redis([0, 1])
+
+        assert await register_job_tasks(redis, uuid.uuid4(), ["a"])
+        assert not await register_job_tasks(redis, uuid.uuid4(), ["b"])
+
+    @pytest.mark.unit
+    async def test_watch_sets_event_when_flagged(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(
+            "app.worker.cancellation.settings.SCRAPE_CANCEL_POLL_SECONDS", 0
+        )
+        redis = make_redis([0, 0, 1])
+
+        async with watch_job_cancellation(redis, uuid.uuid4()) as cancelled:
+            await asyncio.wait_for(cancelled.wait(), timeout=1)
+
+        assert redis.exists.await_count == 3
+
+    @pytest.mark.unit
+    async def test_estimate_uses_average_duration(self) -> None:
+        redis = make_redis([])
+
+        assert await estimate_scrape_seconds(redis, 3) == 180.0
+
+        redis.get.return_value = "42.5"
+        assert await estimate_scrape_seconds(redis, 2) == 85.0
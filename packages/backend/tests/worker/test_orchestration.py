@@ -0,0 +1,121 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import Job, JobStatus, JobType, ScrapedData, User
+from app.worker.orchestration import (
+    complete_job,
+    count_processed_urls,
+    flush_processed_urls,
+    start_job,
+)
+
+
+class TestJobOrchestration:
+    @pytest.fixture
+    async def pending_job(self, test_db_session: AsyncSession) -> Job:
+        user = User(clerk_user_id="user_123")
+        test_db_session.add(user)
+        test_db_session.add(
+            ScrapedData(
+                url="https://www.duelingbook.com/replay?id=1",
+                replay_id=1,
+                s3_key="replays/1.json",
+            )
+        )
+        await test_db_session.flush()
+
+        job = Job(
+            job_type=JobType.INDIVIDUAL,
+            user_id=user.id,
+            urls=[
+                "https://www.duelingbook.com/replay?id=1",
+                "https://www.duelingbook.com/replay?id=2",
+                "https://www.duelingbook.com/replay?id=3",
+            ],
+            total_urls=3,
+        )
+        test_db_session.add(job)
+        await test_db_session.commit()
+        return job
+
+    @pytest.mark.unit
+    async def test_start_job_claims_once(
+        self, pending_job: Job, test_db_session: AsyncSession
+    ) -> None:
+        started = await start_job(test_db_session, pending_job.id)
+
+        assert started is not None
+        assert started.pending_urls == [
+            "https://www.duelingbook.com/replay?id=2",
+            "https://www.duelingbook.com/replay?id=3",
+        ]
+        assert started.processed_urls == 1
+        assert await start_job(test_db_session, pending_job.id) is None
+
+        await test_db_session.refresh(pending_job)
+        assert pending_job.status == JobStatus.RUNNING
+        assert pending_job.processed_urls == 1
+
+    @pytest.mark.unit
+    async def test_complete_job_once(
+        self, pending_job: Job, test_db_session: AsyncSession
+    ) -> None:
+        await start_job(test_db_session, pending_job.id)
+
+        assert await complete_job(test_db_session, pending_job.id, 3)
+        assert not await complete_job(test_db_session, pending_job.id, 3)
+
+        await test_db_session.refresh(pending_job)
+        assert pending_job.status == JobStatus.COMPLETED
+        assert pending_job.processed_urls == 3
+        assert pending_job.completed_at is not None
+
+    @pytest.mark.unit
+    async def test_flush_only_moves_running_counts_forward(
+        self, pending_job: Job, test_db_session: AsyncSession
+    ) -> None:
+        await start_job(test_db_session, pending_job.id)
+
+        await flush_processed_urls(test_db_session, {pending_job.id: 2})
+        await flush_processed_urls(test_db_session, {pending_job.id: 1})
+
+        await test_db_session.refresh(pending_job)
+        assert pending_job.processed_urls == 2
+
+        pending_job.status = JobStatus.CANCELLED
+        await test_db_session.commit()
+        await flush_processed_urls(test_db_session, {pending_job.id: 3})
+
+        await test_db_session.refresh(pending_job)
+        assert pending_job.processed_urls == 2
+
+    @pytest.mark.unit
+    async def test_cancelled_job_is_not_started(
+        self, pending_job: Job, test_db_session: AsyncSession
+    ) -> None:
+        pending_job.status = JobStatus.CANCELLED
+        await test_db_session.commit()
+
+        assert await start_job(test_db_session, pending_job.id) is None
+
+    @pytest.mark.unit
+    async def test_count_processed_urls_completes_at_total(
+        self, pending_job: Job, test_db_session: AsyncSession
+    ) -> None:
+        await start_job(test_db_session, pending_job.id)
+
+        update = await count_processed_urls(test_db_session, pending_job.id, 1)
+
+        assert update is not None
+        assert update.progress.processed == 2
+        assert not update.is_completer
+
+        update = await count_processed_urls(test_db_session, pending_job.id, 1)
+
+        assert update is not None
+        assert update.is_completer
+        assert await count_processed_urls(test_db_session, pending_job.id, 1) is None
+
+        await test_db_session.refresh(pending_job)
+        assert pending_job.status == JobStatus.COMPLETED
+        assert pending_job.completed_at is not None
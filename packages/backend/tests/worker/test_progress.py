@@ -0,0 +1,181 @@
+import json
+import uuid
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.api.jobs.models import JobProgressResponse
+from app.db.models import JobStatus
+from app.worker.progress import (
+    JobCountersMissingError,
+    increment_job_counters,
+    pop_dirty_job_counts,
+    publish_job_progress,
+    stream_progress_events,
+)
+
+
+def make_progress(
+    job_id: uuid.UUID, processed: int, job_status: JobStatus = JobStatus.RUNNING
+) -> JobProgressResponse:
+    return JobProgressResponse(
+        job_id=job_id,
+        status=job_status,
+        processed=processed,
+        total=2,
+        progress_percentage=processed / 2 * 100,
+    )
+
+
+def make_message(seq: int, progress: JobProgressResponse) -> dict[str, str]:
+    return {
+        "data": json.dumps({"seq": seq, "progress": progress.model_dump(mode="json")})
+    }
+
+
+def make_redis(snapshot: str | None, messages: list[dict[str, str] | None]) -> Any:
+    pubsub = MagicMock()
+    pubsub.subscribe = AsyncMock()
+    pubsub.unsubscribe = AsyncMock()
+    pubsub.aclose = AsyncMock()
+    pubsub.get_message = AsyncMock(side_effect=messages)
+
+    redis = MagicMock()
+    redis.pubsub.return_value = pubsub
+    redis.get = AsyncMock(return_value=snapshot)
+    return redis
+
+
+class TestJobProgressStream:
+    @pytest.fixture
+    def job_id(self) -> uuid.UUID:
+        return uuid.uuid4()
+
+    async def test_publish_job_progress(self, job_id: uuid.UUID) -> None:
+        pipe = MagicMock()
+        pipe.execute = AsyncMock()
+        pipeline = MagicMock()
+        pipeline.__aenter__ = AsyncMock(return_value=pipe)
+        pipeline.__aexit__ = AsyncMock(return_value=None)
+
+        redis = MagicMock()
+        redis.incr = AsyncMock(return_value=3)
+        redis.pipeline.return_value = pipeline
+
+        seq = await publish_job_progress(redis, make_progress(job_id, 1))
+
+        assert seq == 3
+        channel, payload = pipe.publish.call_args.args
+        assert channel == f"job_progress:{job_id}:events"
+        assert json.loads(payload)["seq"] == 3
+
+    async def test_stream_until_terminal_status(self, job_id: uuid.UUID) -> None:
+        redis = make_redis(
+            snapshot=None,
+            messages=[
+                None,
+                make_message(1, make_progress(job_id, 1)),
+                make_message(2, make_progress(job_id, 2, JobStatus.COMPLETED)),
+            ],
+        )
+
+        frames = [
+            frame
+            async for frame in stream_progress_events(redis, make_progress(job_id, 0))
+        ]
+
+        assert frames[0].startswith("retry:")
+        assert frames[1].startswith("id: 0\n")
+        assert frames[2] == ": heartbeat\n\n"
+        assert frames[3].startswith("id: 1\n")
+        assert frames[4].startswith("id: 2\n")
+        assert len(frames) == 5
+        redis.pubsub.return_value.unsubscribe.assert_awaited_once()
+
+    async def test_stream_resumes_after_last_event_id(self, job_id: uuid.UUID) -> None:
+        snapshot = make_message(4, make_progress(job_id, 1))["data"]
+        redis = make_redis(
+            snapshot=snapshot,
+            messages=[
+                make_message(4, make_progress(job_id, 1)),
+                make_message(5, make_progress(job_id, 2, JobStatus.COMPLETED)),
+            ],
+        )
+
+        frames = [
+            frame
+            async for frame in stream_progress_events(
+                redis, make_progress(job_id, 0), last_event_id=4
+            )
+        ]
+
+        assert len(frames) == 2
+        assert frames[1].startswith("id: 5\n")
+
+    async def test_stream_ends_on_finished_job_with_running_snapshot(
+        self, job_id: uuid.UUID
+    ) -> None:
+        snapshot = make_message(4, make_progress(job_id, 1))["data"]
+        redis = make_redis(snapshot=snapshot, messages=[])
+
+        frames = [
+            frame
+            async for frame in stream_progress_events(
+                redis,
+                make_progress(job_id, 1, JobStatus.CANCELLED),
+                last_event_id=4,
+            )
+        ]
+
+        # Sent again despite its ID, since the client only saw it running
+        assert len(frames) == 2
+        assert '"status":"cancelled"' in frames[1]
+
+
+class TestJobCounters:
+    @pytest.mark.unit
+    async def test_increment_reports_completer(self) -> None:
+        job_id = uuid.uuid4()
+        redis = MagicMock()
+        redis.eval = AsyncMock(
+            side_effect=[[1, 2, "running", 0], [2, 2, "completed", 1]]
+        )
+
+        first = await increment_job_counters(redis, job_id)
+        last = await increment_job_counters(redis, job_id)
+
+        assert first is not None and not first.is_completer
+        assert first.progress.progress_percentage == 50.0
+        assert last is not None and last.is_completer
+        assert last.progress.status == JobStatus.COMPLETED
+
+    @pytest.mark.unit
+    async def test_increment_ignores_jobs_no_longer_running(self) -> None:
+        redis = MagicMock()
+        redis.eval = AsyncMock(return_value=None)
+
+        assert await increment_job_counters(redis, uuid.uuid4()) is None
+
+    @pytest.mark.unit
+    async def test_increment_raises_when_counters_are_gone(self) -> None:
+        redis = MagicMock()
+        redis.eval = AsyncMock(return_value=0)
+
+        with pytest.raises(JobCountersMissingError):
+            await increment_job_counters(redis, uuid.uuid4())
+
+    @pytest.mark.unit
+    async def test_pop_dirty_job_counts(self) -> None:
+        running, cleared = uuid.uuid4(), uuid.uuid4()
+        pipe = MagicMock()
+        pipe.execute = AsyncMock(return_value=["7", None])
+        pipeline = MagicMock()
+        pipeline.__aenter__ = AsyncMock(return_value=pipe)
+        pipeline.__aexit__ = AsyncMock(return_value=None)
+
+        redis = MagicMock()
+        redis.spop = AsyncMock(return_value=[str(running), str(cleared)])
+        redis.pipeline.return_value = pipeline
+
+        assert await pop_dirty_job_counts(redis, 100) == {running: 7}
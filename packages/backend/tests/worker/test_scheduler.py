@@ -0,0 +1,93 @@
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.db.models import JobType
+from app.worker.scheduler import (
+    ScrapeItem,
+    enqueue_scrapes,
+    get_queue_wait_stats,
+    pop_fair_scrapes,
+    release_unstarted,
+)
+
+
+def make_item(job_type: JobType = JobType.INDIVIDUAL) -> ScrapeItem:
+    return ScrapeItem(
+        task_id=str(uuid.uuid4()),
+        replay_url="https://www.duelingbook.com/replay?id=1",
+        job_id=uuid.uuid4(),
+        user_id=uuid.uuid4(),
+        job_type=job_type,
+        enqueued_at=100.0,
+    )
+
+
+def make_redis(pipeline_results: list[list[str]] | None = None) -> MagicMock:
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(return_value=pipeline_results or [])
+    pipeline = MagicMock()
+    pipeline.__aenter__ = AsyncMock(return_value=pipe)
+    pipeline.__aexit__ = AsyncMock(return_value=None)
+
+    redis = MagicMock()
+    redis.pipeline.return_value = pipeline
+    redis.eval = AsyncMock(return_value=[])
+    redis.zrevrange = AsyncMock(return_value=[])
+    return redis
+
+
+class TestFairScheduler:
+    @pytest.mark.unit
+    async def test_enqueue_batches_large_jobs(self) -> None:
+        redis = make_redis()
+        item = make_item(JobType.GFWL)
+
+        await enqueue_scrapes(redis, [item] * 1200)
+
+        assert redis.eval.await_count == 3
+        args = redis.eval.await_args_list[0].args
+        assert args[2:4] == ("scrape_queue:gfwl", str(item.user_id))
+        assert len(args[4:]) == 500
+
+    @pytest.mark.unit
+    async def test_pop_serves_individual_jobs_first(self) -> None:
+        item = make_item()
+        redis = make_redis()
+        redis.eval.return_value = [item.to_json()]
+
+        assert await pop_fair_scrapes(redis, 10, 900, 1) == [item]
+
+        args = redis.eval.await_args.args
+        assert args[-2:] == ("scrape_queue:individual", "scrape_queue:gfwl")
+
+    @pytest.mark.unit
+    async def test_wait_stats_by_job_type_and_user(self) -> None:
+        redis = make_redis([[str(wait) for wait in range(1, 21)], [], ["4.5"]])
+        redis.zrevrange.return_value = ["user-1"]
+
+        by_job_type, by_user = await get_queue_wait_stats(redis)
+
+        assert set(by_job_type) == {"individual"}
+        assert by_job_type["individual"].samples == 20
+        assert by_job_type["individual"].p50_seconds == 11.0
+        assert by_job_type["individual"].p95_seconds == 20.0
+        assert by_user["user-1"].p50_seconds == 4.5
+
+    @pytest.mark.unit
+    async def test_release_unstarted_keeps_running_slots(self) -> None:
+        redis = make_redis()
+        redis.eval.return_value = 1
+
+        assert await release_unstarted(redis, ["a", "b"]) == 1
+        assert await release_unstarted(redis, []) == 0
+
+        args = redis.eval.await_args.args
+        assert args[1:] == (
+            2,
+            "scrape_queue:in_flight",
+            "scrape_queue:started",
+            "a",
+            "b",
+        )